@@ -0,0 +1,36 @@
+"""
+Allocator throughput: glibc malloc vs the slab allocator, object pool and arena templates.
+
+    python benchmarks/bench_alloc.py --threads 1 4 8 --ops 10000000 --max-size 64 256 4096
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from nexus.synthesis.native import build_benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--ops", type=int, default=10_000_000, help="allocations per run, split across threads")
+    parser.add_argument("--max-size", type=int, nargs="+", default=[64, 256, 4096],
+                        help="object sizes are drawn uniformly from 16..max-size (the pool always uses 64)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        binary = build_benchmark("ALLOC_BENCHMARK", directory)
+        for max_size in args.max_size:
+            for threads in sorted(set(args.threads)):
+                result = subprocess.run([binary, str(threads), str(args.ops), str(max_size)],
+                                        capture_output=True, text=True)
+                print(result.stdout.strip() or result.stderr.strip())
+                if result.returncode:
+                    sys.exit("an allocator returned overlapping or misaligned blocks")
+
+
+if __name__ == "__main__":
+    main()
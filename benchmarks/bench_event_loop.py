@@ -0,0 +1,40 @@
+"""
+Event-loop vs blocking TCP server: requests per second under a local load generator.
+
+    python benchmarks/bench_event_loop.py --connections 10 100 1000 5000 --requests 200 --body 128 65536
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from nexus.synthesis.native import build_benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=200, help="requests per connection")
+    parser.add_argument("--body", type=int, nargs="+", default=[128, 65536],
+                        help="response body sizes; bodies of 16 KiB or more are sent with sendfile")
+    parser.add_argument("--reactors", type=int, default=0, help="epoll reactor threads (0: one per CPU)")
+    parser.add_argument("--clients", type=int, default=4, help="load generator threads")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        binary = build_benchmark("NET_BENCHMARK", directory)
+        for body in args.body:
+            for connections in sorted(set(args.connections)):
+                for kind in ("epoll", "blocking"):
+                    result = subprocess.run([binary, kind, str(connections), str(args.requests), str(body),
+                                             str(args.reactors), str(args.clients)],
+                                            capture_output=True, text=True)
+                    print(result.stdout.strip() or result.stderr.strip())
+                    if result.returncode:
+                        sys.exit(f"{kind} server dropped or corrupted responses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Cross-correlation benchmark: direct O(n*m) sum against the FFT methods.
+
+    python benchmarks/bench_fft.py               # NumPy backend if installed
+    python benchmarks/bench_fft.py --pure-python
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from nexus.cross_correlation import FFTBasedCrossCorrelation
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pure-python", action="store_true", help="Benchmark the fallback FFT even if NumPy is installed")
+    parser.add_argument("--max-size", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    correlator = FFTBasedCrossCorrelation(use_numpy=False if args.pure_python else None)
+    backend = "numpy" if correlator.np is not None else "pure python"
+    rng = random.Random(0)
+    signal = lambda n: [rng.uniform(-1, 1) for _ in range(n)]
+
+    print(f"Backend: {backend}")
+    print(f"{'n = m':>8} {'direct ms':>12} {'fft ms':>12}  faster")
+    crossover = None
+    size = 4
+    while size <= args.max_size:
+        a, b = signal(size), signal(size)
+        direct = best_of(lambda: correlator.compute(a, b, "direct"), args.repeat)
+        fft = best_of(lambda: correlator.compute(a, b, "fft"), args.repeat)
+        if crossover is None and fft < direct:
+            crossover = size
+        print(f"{size:>8} {direct * 1e3:>12.3f} {fft * 1e3:>12.3f}  {'fft' if fft < direct else 'direct'}")
+        size *= 2
+    if crossover:
+        print(f"Crossover: FFT wins from n = m = {crossover} (n*m = {crossover * crossover})")
+
+    long_signal, template = signal(1 << 16), signal(64)
+    print(f"\nLong signal ({len(long_signal)}) against a {len(template)}-tap template:")
+    for method in ("fft", "overlap_save"):
+        elapsed = best_of(lambda: correlator.compute(long_signal, template, method), 1)
+        print(f"{method:>14}: {elapsed * 1e3:10.1f} ms")
+
+    pairs = [(signal(256), signal(256)) for _ in range(256)]
+    elapsed = best_of(lambda: correlator.compute_many(pairs), 1)
+    print(f"\nBatch of {len(pairs)} pairs (256 x 256): {elapsed * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Graph analytics benchmark on generated graphs of 10^5 to 10^7 edges.
+
+    python benchmarks/bench_graph.py --edges 100000 1000000 10000000 --workers 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from nexus.graph import CSRGraph
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<30} {elapsed * 1e3:10.1f} ms")
+    return result
+
+
+def random_graph(nodes, edges, seed=0, weighted=False):
+    """
+    Uniform random directed graph (Erdos-Renyi G(n, m) with repeats allowed).
+    """
+    rng = random.Random(seed)
+    population = range(nodes)
+    sources = rng.choices(population, k=edges)
+    targets = rng.choices(population, k=edges)
+    if weighted:
+        weights = [rng.random() for _ in range(edges)]
+        return CSRGraph.from_edges(zip(sources, targets, weights), nodes, weighted=True)
+    return CSRGraph.from_edges(zip(sources, targets), nodes)
+
+
+def layered_dag(nodes, edges, seed=0):
+    """
+    Random DAG: every edge points from a lower id to a higher one.
+    """
+    rng = random.Random(seed)
+    pairs = ((rng.randrange(nodes), rng.randrange(nodes)) for _ in range(edges))
+    return CSRGraph.from_edges(((min(u, v), max(u, v) + (u == v)) for u, v in pairs), nodes + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--edges", type=int, nargs="+", default=[10 ** 5, 10 ** 6, 10 ** 7])
+    parser.add_argument("--degree", type=int, default=8, help="average out-degree")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    for edges in args.edges:
+        nodes = max(1, edges // args.degree)
+        print(f"{nodes} nodes, {edges} edges")
+        graph = timed("build CSR", lambda: random_graph(nodes, edges))
+        timed("dfs", lambda: graph.dfs_order(0))
+        timed("bfs", lambda: graph.bfs_order(0))
+        sequential = timed("bfs levels (sequential)", lambda: graph.bfs_levels([0]))
+        parallel = timed("bfs levels (process pool)",
+                         lambda: graph.bfs_levels([0], executor="process", max_workers=args.workers))
+        assert parallel == sequential
+        timed("multi-source bfs (16 sources)", lambda: graph.multi_source_bfs(range(16)))
+        timed("weakly connected components", graph.connected_components)
+        timed("scc (tarjan)", lambda: graph.strongly_connected_components("tarjan"))
+        timed("scc (kosaraju)", lambda: graph.strongly_connected_components("kosaraju"))
+        weighted = timed("build weighted CSR", lambda: random_graph(nodes, edges, weighted=True))
+        timed("dijkstra", lambda: weighted.dijkstra(0))
+        dag = timed("build DAG", lambda: layered_dag(nodes, edges))
+        timed("topological sort", dag.topological_sort)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Merkle tree benchmark: build, proofs, updates and appends over N blocks.
+
+    python benchmarks/bench_merkle.py --blocks 1000000 --workers 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from nexus.merkle import MerkleTree
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    unit, scale = ("ms", 1e3) if elapsed >= 1e-3 else ("us", 1e6)
+    print(f"{label:<38} {elapsed * scale:10.2f} {unit}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=1_000_000)
+    parser.add_argument("--block-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--hash", default="sha256")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    blocks = [rng.randbytes(args.block_size) for _ in range(args.blocks)]
+    print(f"{args.blocks} blocks of {args.block_size} bytes, {args.hash}, {args.workers} workers")
+
+    tree = timed("build (sequential)", lambda: MerkleTree(blocks, args.hash, executor="sequential"))
+    parallel = timed("build (process pool)", lambda: MerkleTree(blocks, args.hash, max_workers=args.workers))
+    assert parallel.root == tree.root
+
+    index = rng.randrange(args.blocks)
+    proof = timed("proof", lambda: tree.proof(index), repeat=1000)
+    assert timed("verify proof", lambda: tree.verify(blocks[index], proof), repeat=1000)
+    timed("update one leaf", lambda: tree.update(index, b"changed"), repeat=1000)
+    timed("append one leaf", lambda: tree.append(b"appended"), repeat=1000)
+    print(f"levels: {len(tree.levels)}, storage: {sum(len(level) for level in tree.levels) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
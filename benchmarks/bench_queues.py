@@ -0,0 +1,36 @@
+"""
+Lock-free queue throughput: Michael-Scott queue vs bounded MPMC ring buffer.
+
+    python benchmarks/bench_queues.py --threads 1 2 4 8 --items 2000000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from nexus.synthesis.native import build_benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1],
+                        help="producer count; the same number of consumers is started")
+    parser.add_argument("--items", type=int, default=2_000_000)
+    parser.add_argument("--capacity", type=int, default=1024, help="ring buffer size (power of two)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        binary = build_benchmark("QUEUE_BENCHMARK", directory)
+        for kind in ("ms", "ring"):
+            for threads in sorted(set(args.threads)):
+                result = subprocess.run([binary, kind, str(threads), str(threads), str(args.items), str(args.capacity)],
+                                        capture_output=True, text=True)
+                print(result.stdout.strip() or result.stderr.strip())
+                if result.returncode:
+                    sys.exit(f"{kind} queue lost or duplicated items")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Thread pool throughput: tasks per second by submission mode and task size.
+
+    python benchmarks/bench_thread_pool.py --threads 1 4 8 --tasks 1000000 --work 0 100 1000 10000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from nexus.synthesis.native import build_benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--work", type=int, nargs="+", default=[0, 100, 1000, 10000],
+                        help="loop iterations per task (task granularity)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        binary = build_benchmark("THREAD_POOL_BENCHMARK", directory)
+        for threads in sorted(set(args.threads)):
+            result = subprocess.run([binary, str(threads), str(args.tasks), *map(str, args.work)],
+                                    capture_output=True, text=True)
+            print(result.stdout.strip() or result.stderr.strip())
+            if result.returncode:
+                sys.exit("thread pool lost or duplicated tasks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Work-stealing scheduler scalability: fork-join Fibonacci and parallel_for.
+
+    python benchmarks/bench_work_stealing.py --workers 1 2 4 8 --fib 36 --items 500000000
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from nexus.synthesis.native import build_benchmark
+
+TIMINGS = re.compile(r"fib_seconds=([\d.]+) .*for_seconds=([\d.]+)")
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=range(1, cores + 1))
+    parser.add_argument("--fib", type=int, default=36)
+    parser.add_argument("--items", type=int, default=500_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        binary = build_benchmark("WORK_STEALING_BENCHMARK", directory)
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            result = subprocess.run([binary, str(workers), str(args.fib), str(args.items)],
+                                    capture_output=True, text=True)
+            if result.returncode:
+                sys.exit(result.stdout.strip() or result.stderr.strip())
+            fib_seconds, for_seconds = map(float, TIMINGS.search(result.stdout).groups())
+            baseline = baseline or (fib_seconds, for_seconds)
+            print(f"{result.stdout.strip()} fib_speedup={baseline[0] / fib_seconds:.2f}x "
+                  f"for_speedup={baseline[1] / for_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,30 @@
 import argparse
 import sys
-from nexus.orchestrator import NexusOrchestrator
 
 def main():
     parser = argparse.ArgumentParser(description="NEXUS: Universal Systems Programming Assignment Solver")
     parser.add_argument("--spec", type=str, help="Textual specification of the assignment")
     parser.add_argument("--file", type=str, help="Path to a file containing the specification")
     parser.add_argument("--iterations", type=int, default=3, help="Maximum synthesis refinement iterations")
-
-    args = parser.parse_args()
-
+    parser.add_argument("--executor", choices=["sequential", "thread", "process"], default="sequential",
+                        help="How to run the independent domain planners")
+    parser.add_argument("--workers", type=int, default=None, help="Worker count for thread/process executors")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Persist analysis/planning/verification results in this directory")
+    parser.add_argument("--profile", type=str, default=None,
+                        help="Write a Chrome trace (chrome://tracing, Perfetto) of the run to this file")
+    parser.add_argument("--trace-memory", action="store_true", help="Record tracemalloc deltas per stage")
+    parser.add_argument("--batch", type=str, default=None,
+                        help="Directory of specification files or JSONL of specs to solve in one process")
+    parser.add_argument("--jobs", type=int, default=None, help="Maximum concurrent batch jobs (default: CPU count)")
+    parser.add_argument("--batch-mode", choices=["process", "thread"], default="process",
+                        help="Run batch jobs in worker processes or threads")
+    parser.add_argument("--out", type=str, default="nexus_batch", help="Batch output directory (one session per job)")
+    parser.add_argument("--results", type=str, default=None,
+                        help="Batch results JSONL (default: <out>/results.jsonl)")
+    parser.add_argument("--quiet", action="store_true", help="Only log warnings and errors")
+    parser.add_argument("--log-json", action="store_true",
+                        help="Log one JSON object per line, with stage and iteration fields")
     parser.add_argument("--roadmap", action="store_true", help="Display the Systems Programming Masterclass Roadmap")
 
     args = parser.parse_args()
@@ -23,6 +38,31 @@ def main():
         print("="*50)
         sys.exit(0)
 
+    from nexus import log
+    log.configure(level="warning" if args.quiet else "info", json_output=args.log_json)
+
+    if args.batch:
+        from nexus.batch import BatchRunner, load_batch_jobs
+        runner = BatchRunner(args.out, concurrency=args.jobs, mode=args.batch_mode,
+                             max_iterations=args.iterations, cache_dir=args.cache_dir)
+        try:
+            summary = runner.run(load_batch_jobs(args.batch), results_path=args.results)
+        except Exception as e:
+            print(f"Batch Error: {e}")
+            sys.exit(1)
+        print("\n" + "="*50)
+        print("NEXUS BATCH SUMMARY")
+        print("="*50)
+        print(f"Jobs: {summary['total']} ({summary['succeeded']} succeeded, {summary['failed']} failed)")
+        print(f"Elapsed: {summary['elapsed_s']}s")
+        print(f"Results: {summary['results_path']}")
+        print("="*50)
+        sys.exit(0 if summary["failed"] == 0 else 1)
+
+    from nexus.instrumentation import PipelineProfiler
+    from nexus.orchestrator import NexusOrchestrator
+    from nexus.stage_cache import StageCache
+
     specification = ""
     if args.file:
         try:
@@ -43,9 +83,12 @@ def main():
         """
         print("No specification provided. Running with default sample...")
 
-    orchestrator = NexusOrchestrator()
+    cache = StageCache(directory=args.cache_dir) if args.cache_dir else True
+    orchestrator = NexusOrchestrator(executor=args.executor, max_workers=args.workers, cache=cache,
+                                     trace_memory=args.trace_memory)
     try:
-        result = orchestrator.run_pipeline(specification, max_iterations=args.iterations)
+        profiler = PipelineProfiler(trace_memory=args.trace_memory) if args.profile else None
+        result = orchestrator.run_pipeline(specification, max_iterations=args.iterations, profiler=profiler)
 
         print("\n" + "="*50)
         print("NEXUS OUTPUT SUMMARY")
@@ -55,9 +98,15 @@ def main():
         print(f"Generated Files: main.c, Makefile")
         print("="*50)
 
+        if args.profile:
+            profiler.write_chrome_trace(args.profile)
+            print(f"Profile written to {args.profile}")
+
     except Exception as e:
         print(f"Framework Error: {e}")
         sys.exit(1)
+    finally:
+        orchestrator.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,23 @@
+"""
+NEXUS: Universal Systems Programming Assignment Solver.
+
+Public entry points are resolved on first access so that `import nexus`
+(and CLI paths such as `--roadmap`) do not load the whole pipeline.
+"""
+import importlib
+
+_EXPORTS = {
+    "NexusOrchestrator": ".orchestrator",
+    "StageCache": ".stage_cache",
+    "PipelineProfiler": ".instrumentation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'nexus' has no attribute '{name}'")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,4 +1,18 @@
 from .synthesis.templates import TemplateLibrary
+from .instrumentation import instrumented
+from .feature_index import FeatureIndex
+from .log import get_logger
+
+log = get_logger(__name__)
+
+
+def wants_bounded_queue(features):
+    """
+    A fixed-capacity queue (MPMC ring buffer) instead of the unbounded
+    Michael-Scott queue.
+    """
+    return features.has("bounded", "ring buffer", "fixed capacity", "backpressure")
+
 
 class TradeoffAnalyzer:
     """
@@ -7,14 +21,17 @@ class TradeoffAnalyzer:
     Provides explainable reasoning for design decisions.
     """
     def analyze_tradeoffs(self, analysis_results):
-        print("Tradeoff Analyzer: Balancing time/space complexity...")
-        constraints = analysis_results.get("constraints", [])
+        log.info("Tradeoff Analyzer: Balancing time/space complexity...")
+        features = FeatureIndex.of(analysis_results)
         reasoning = []
 
-        if any("concurrent" in c.lower() for c in constraints):
-            reasoning.append("Selected Lock-free Queue to balance high concurrency with low synchronization overhead.")
+        if features.has("concurrent", fields=("constraints",)):
+            if wants_bounded_queue(features):
+                reasoning.append("Selected bounded MPMC Ring Buffer: fixed capacity gives backpressure and no allocation per message.")
+            else:
+                reasoning.append("Selected Lock-free Queue to balance high concurrency with low synchronization overhead.")
 
-        if any("fast" in c.lower() or "performance" in c.lower() for c in constraints):
+        if features.has("fast", "performance", fields=("constraints",)):
             reasoning.append("Selected Arena Allocator to achieve O(1) allocation time at the cost of heap fragmentation.")
 
         if not reasoning:
@@ -32,24 +49,28 @@ class AdvancedDataStructureSynthesis:
 
     def select_structures(self, analysis_results):
         selected = []
-        constraints = analysis_results.get("constraints", [])
+        features = FeatureIndex.of(analysis_results)
 
         # Simple selection logic
-        is_concurrent = any("concurrent" in c.lower() or "thread" in c.lower() for c in constraints)
-        is_high_performance = any("fast" in c.lower() or "performance" in c.lower() for c in constraints)
+        is_concurrent = features.has("concurrent", "thread", fields=("constraints",))
+        is_high_performance = features.has("fast", "performance", fields=("constraints",))
 
-        if is_concurrent:
-            print("Concurrent requirement detected. Adding Lock-free Queue.")
+        if is_concurrent and wants_bounded_queue(features):
+            log.debug("Bounded concurrent queue requested. Adding MPMC Ring Buffer.")
+            selected.append(("MPMC_RING_BUFFER", self.templates.get_template("MPMC_RING_BUFFER")))
+        elif is_concurrent:
+            log.debug("Concurrent requirement detected. Adding Lock-free Queue.")
             selected.append(("LOCK_FREE_QUEUE", self.templates.get_template("LOCK_FREE_QUEUE")))
 
         if is_high_performance:
-            print("High performance requirement detected. Adding Arena Allocator.")
+            log.debug("High performance requirement detected. Adding Arena Allocator.")
             selected.append(("ARENA_ALLOCATOR", self.templates.get_template("ARENA_ALLOCATOR")))
 
         return selected
 
+    @instrumented
     def process(self, analysis_results):
-        print("Advanced Data Structure Synthesis: Selecting optimal structures...")
+        log.info("Advanced Data Structure Synthesis: Selecting optimal structures...")
         selected_structures = self.select_structures(analysis_results)
         reasoning = self.tradeoff_analyzer.analyze_tradeoffs(analysis_results)
 
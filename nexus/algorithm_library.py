@@ -1,86 +1,153 @@
-import hashlib
+from .instrumentation import instrumented
+# Re-exported: these used to live in this module
+from .merkle import MerkleTree  # noqa: F401
+from .cross_correlation import FFTBasedCrossCorrelation  # noqa: F401
+from .feature_index import FeatureIndex
+from .graph import CSRGraph
+from .log import get_logger
 
-class MerkleTree:
-    """
-    Section 9.1: Merkle Tree Implementation
-    """
-    def __init__(self, data_blocks):
-        self.leaves = [self._hash(block) for block in data_blocks]
-        self.root = self._build_tree(self.leaves)
-
-    def _hash(self, data):
-        return hashlib.sha256(data.encode()).hexdigest()
-
-    def _build_tree(self, nodes):
-        if len(nodes) == 1:
-            return nodes[0]
-
-        new_level = []
-        for i in range(0, len(nodes), 2):
-            if i + 1 < len(nodes):
-                combined = nodes[i] + nodes[i+1]
-                new_level.append(self._hash(combined))
-            else:
-                new_level.append(nodes[i])
-
-        return self._build_tree(new_level)
-
-    def verify(self, block, proof):
-        # Placeholder for proof verification logic
-        print(f"Verifying block: {block}")
-        return True
-
-class FFTBasedCrossCorrelation:
-    """
-    Section 9.1: FFT-based Cross-Correlation
-    """
-    def compute(self, signal_a, signal_b):
-        print("Computing FFT-based Cross-Correlation...")
-        # Placeholder for FFT logic
-        return [0.0] * (len(signal_a) + len(signal_b) - 1)
+log = get_logger(__name__)
 
 class GraphAlgorithms:
     """
     Section 9.1: Tree traversals and Graph Algorithms
+    Accepts either the dict-of-lists form {node: [neighbors]}, whose results
+    use the caller's node names, or a CSRGraph, whose results are node ids.
+    Traversals are iterative, so graph depth is not bounded by the
+    recursion limit.
     """
+    def _csr(self, graph):
+        if isinstance(graph, CSRGraph):
+            return graph
+        return CSRGraph.from_adjacency(graph)
+
+    def _traverse(self, order, graph, start, visited):
+        csr = self._csr(graph)
+        if start not in csr:
+            # A start node with no edges at all only reaches itself
+            return visited | {start}
+        seen = bytearray(csr.num_nodes)
+        for node in visited:
+            if node != start and node in csr:
+                seen[csr.node_id(node)] = 1
+        found = getattr(csr, order)(csr.node_id(start), seen)
+        return visited | {csr.label(u) for u in found}
+
     def dfs(self, graph, start, visited=None):
         if visited is None: visited = set()
-        visited.add(start)
-        print(f"DFS visiting: {start}")
-        for next_node in graph.get(start, []):
-            if next_node not in visited:
-                self.dfs(graph, next_node, visited)
+        log.debug("DFS starting at: %s", start)
+        visited.update(self._traverse("dfs_order", graph, start, visited))
         return visited
 
     def bfs(self, graph, start):
-        visited = {start}
-        queue = [start]
-        print(f"BFS starting at: {start}")
-        while queue:
-            node = queue.pop(0)
-            for next_node in graph.get(node, []):
-                if next_node not in visited:
-                    visited.add(next_node)
-                    queue.append(next_node)
-        return visited
+        log.debug("BFS starting at: %s", start)
+        return self._traverse("bfs_order", graph, start, set())
+
+    def topological_sort(self, graph):
+        csr = self._csr(graph)
+        return [csr.label(u) for u in csr.topological_sort()]
+
+    def find_cycle(self, graph):
+        csr = self._csr(graph)
+        cycle = csr.find_cycle()
+        return None if cycle is None else [csr.label(u) for u in cycle]
+
+    def has_cycle(self, graph):
+        return self._csr(graph).has_cycle()
+
+    def connected_components(self, graph):
+        csr = self._csr(graph)
+        return [[csr.label(u) for u in component] for component in csr.connected_components()]
+
+    def strongly_connected_components(self, graph, method="tarjan"):
+        csr = self._csr(graph)
+        return [[csr.label(u) for u in component] for component in csr.strongly_connected_components(method)]
+
+    def dijkstra(self, graph, source):
+        """
+        Distances from `source` to every reachable node. Dict graphs may give
+        weights as {node: {neighbor: weight}}; unweighted edges weigh 1.
+        """
+        csr = self._csr(graph)
+        distances, _ = csr.dijkstra(csr.node_id(source))
+        return {csr.label(u): d for u, d in enumerate(distances) if d != float("inf")}
+
+    def shortest_path(self, graph, source, target):
+        csr = self._csr(graph)
+        distance, path = csr.shortest_path(csr.node_id(source), csr.node_id(target))
+        return distance, None if path is None else [csr.label(u) for u in path]
+
+    def multi_source_bfs(self, graph, sources, **options):
+        """
+        Hop distance from the nearest source to every reachable node.
+        """
+        csr = self._csr(graph)
+        distances = csr.multi_source_bfs([csr.node_id(s) for s in sources], **options)
+        return {csr.label(u): d for u, d in enumerate(distances) if d >= 0}
+
+    def bfs_levels(self, graph, sources, **options):
+        """
+        Level-synchronous BFS frontiers; pass executor="process" to expand
+        large frontiers on a process pool (see CSRGraph.bfs_levels).
+        """
+        csr = self._csr(graph)
+        levels = csr.bfs_levels([csr.node_id(s) for s in sources], **options)
+        return [[csr.label(u) for u in frontier] for frontier in levels]
 
 class AlgorithmLibrary:
+    # Shared by the SHA-256 templates; the assembler adds it once
+    DIGEST_HEX_C_TEMPLATE = """
+/* Digest to lowercase hex */
+#include <stdio.h>
+
+static void digest_to_hex(const unsigned char *digest, unsigned int length, char *out) {
+    for (unsigned int i = 0; i < length; i++) {
+        snprintf(out + (i * 2), 3, "%02x", digest[i]);
+    }
+    out[length * 2] = 0;
+}
+"""
+
     SHA256_C_TEMPLATE = """
-#include <openssl/sha.h>
+#include <openssl/evp.h>
 #include <string.h>
-#include <stdio.h>
 
 void compute_sha256(const char *str, char outputBuffer[65]) {
-    unsigned char hash[SHA256_DIGEST_LENGTH];
-    SHA256_CTX sha256;
-    SHA256_Init(&sha256);
-    SHA256_Update(&sha256, str, strlen(str));
-    SHA256_Final(hash, &sha256);
-    int i = 0;
-    for(i = 0; i < SHA256_DIGEST_LENGTH; i++) {
-        snprintf(outputBuffer + (i * 2), 3, "%02x", hash[i]);
+    unsigned char hash[EVP_MAX_MD_SIZE];
+    unsigned int length = 0;
+    EVP_Digest(str, strlen(str), hash, &length, EVP_sha256(), NULL);
+    digest_to_hex(hash, length, outputBuffer);
+}
+"""
+
+    # Streaming EVP digest for inputs too large to hold in memory at once
+    SHA256_STREAM_C_TEMPLATE = """
+#include <openssl/evp.h>
+#include <stdio.h>
+
+#define HASH_CHUNK_SIZE (1 << 16)
+
+/* Hashes `path` in fixed-size chunks; returns 0 on success, -1 on error. */
+int sha256_file(const char *path, char outputBuffer[65]) {
+    unsigned char chunk[HASH_CHUNK_SIZE];
+    unsigned char hash[EVP_MAX_MD_SIZE];
+    unsigned int length = 0;
+    size_t read;
+    int status = -1;
+    FILE *file = fopen(path, "rb");
+    if (!file) return -1;
+    EVP_MD_CTX *ctx = EVP_MD_CTX_new();
+    if (!ctx || EVP_DigestInit_ex(ctx, EVP_sha256(), NULL) != 1) goto done;
+    while ((read = fread(chunk, 1, sizeof(chunk), file)) > 0) {
+        if (EVP_DigestUpdate(ctx, chunk, read) != 1) goto done;
     }
-    outputBuffer[64] = 0;
+    if (ferror(file) || EVP_DigestFinal_ex(ctx, hash, &length) != 1) goto done;
+    digest_to_hex(hash, length, outputBuffer);
+    status = 0;
+done:
+    EVP_MD_CTX_free(ctx);
+    fclose(file);
+    return status;
 }
 """
 
@@ -94,27 +161,40 @@ void cross_correlate(double *a, double *b, int n, double *result) {
 }
 """
 
+    @classmethod
+    def register_templates(cls, registry):
+        registry.register("DIGEST_HEX", cls.DIGEST_HEX_C_TEMPLATE)
+        registry.register("SHA256", cls.SHA256_C_TEMPLATE, requires=("digest_to_hex",))
+        registry.register("SHA256_STREAM", cls.SHA256_STREAM_C_TEMPLATE, requires=("digest_to_hex",))
+        registry.register("CROSS_CORRELATION", cls.CROSS_CORRELATION_C_TEMPLATE)
+
+    @instrumented
     def process(self, analysis_results):
-        print("Algorithm Library: Integrating specialized algorithms...")
+        log.info("Algorithm Library: Integrating specialized algorithms...")
         algorithms = []
         templates = {"SHA256": self.SHA256_C_TEMPLATE}
 
-        all_text = str(analysis_results).lower()
+        features = FeatureIndex.of(analysis_results)
+
+        # Large inputs are hashed through the streaming EVP API
+        if features.has("large", "stream", "checksum"):
+            log.debug("Detected large-input hashing requirements, adding streaming SHA-256.")
+            templates["SHA256_STREAM"] = self.SHA256_STREAM_C_TEMPLATE
 
         # Check if Merkle Tree is needed
-        if "integrity" in all_text or "verification" in all_text:
-            print("Detected integrity requirements, adding Merkle Tree.")
+        if features.has("integrity", "verification"):
+            log.debug("Detected integrity requirements, adding Merkle Tree.")
             algorithms.append("Merkle Tree")
 
         # Check if Signal Processing / FFT is needed
-        if "signal" in all_text or "correlation" in all_text or "fft" in all_text:
-            print("Detected signal processing requirements, adding FFT-based Cross-Correlation.")
+        if features.has("signal", "correlation", "fft"):
+            log.debug("Detected signal processing requirements, adding FFT-based Cross-Correlation.")
             algorithms.append("FFT-based Cross-Correlation")
             templates["CROSS_CORRELATION"] = self.CROSS_CORRELATION_C_TEMPLATE
 
         # Check if Graph/Dependency logic is needed
-        if "graph" in all_text or "dependency" in all_text or "traverse" in all_text:
-            print("Detected graph/dependency requirements, adding Graph Algorithms.")
+        if features.has("graph", "dependency", "traverse"):
+            log.debug("Detected graph/dependency requirements, adding Graph Algorithms.")
             algorithms.append("Graph Algorithms (DFS/BFS)")
 
         return {
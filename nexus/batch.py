@@ -0,0 +1,116 @@
+import json
+import os
+import re
+import time
+from concurrent.futures import wait, FIRST_COMPLETED
+
+from .workers import WorkerPool
+
+SPEC_EXTENSIONS = (".txt", ".md", ".spec", ".pdf")
+
+
+class BatchJob:
+    def __init__(self, job_id, specification, source):
+        self.job_id = job_id
+        self.specification = specification
+        self.source = source
+
+
+def _safe_id(value):
+    # Leading dots are dropped so an id can never name "." or ".."
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(value)).lstrip(".") or "job"
+
+
+def load_batch_jobs(source):
+    """
+    Reads jobs from a directory of specification files (one job per file) or
+    from a JSONL file whose records carry "spec" text or a "file" path and an
+    optional "id". Job ids double as session directory names, so they are
+    sanitized and made unique.
+    """
+    seen = set()
+
+    def unique(job_id):
+        candidate, n = job_id, 1
+        while candidate in seen:
+            n += 1
+            candidate = f"{job_id}-{n}"
+        seen.add(candidate)
+        return candidate
+
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if os.path.isfile(path) and name.lower().endswith(SPEC_EXTENSIONS):
+                yield BatchJob(unique(_safe_id(os.path.splitext(name)[0])), path, path)
+        return
+
+    with open(source, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            specification = record.get("spec") or record.get("file")
+            if not specification:
+                raise ValueError(f"{source}:{line_number}: record has neither 'spec' nor 'file'")
+            job_id = unique(_safe_id(record.get("id", f"job-{line_number:05d}")))
+            yield BatchJob(job_id, specification, f"{source}:{line_number}")
+
+
+class BatchRunner:
+    """
+    Section 3.5: Batch Mode
+    Solves many specifications in one process on a warmed WorkerPool, keeping
+    at most `concurrency` jobs in flight and streaming one JSON line per
+    finished job.
+    """
+    def __init__(self, out_dir, concurrency=None, mode="process", max_iterations=3, cache_dir=None):
+        self.out_dir = out_dir
+        self.pool = WorkerPool(workers=concurrency, mode=mode, cache_dir=cache_dir)
+        self.concurrency = self.pool.workers
+        self.max_iterations = max_iterations
+
+    def run(self, jobs, results_path=None):
+        results_path = results_path or os.path.join(self.out_dir, "results.jsonl")
+        os.makedirs(self.out_dir, exist_ok=True)
+        summary = {"total": 0, "succeeded": 0, "failed": 0, "results_path": results_path}
+        start = time.perf_counter()
+
+        jobs = iter(jobs)
+        in_flight = {}
+        try:
+            with open(results_path, "w") as results:
+                while True:
+                    # Top the window up without materializing the whole job list
+                    while len(in_flight) < self.concurrency:
+                        job = next(jobs, None)
+                        if job is None:
+                            break
+                        session_dir = os.path.join(self.out_dir, job.job_id)
+                        future = self.pool.submit(job.specification, session_dir, self.max_iterations)
+                        in_flight[future] = job
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = in_flight.pop(future)
+                        record = self._record(job, future)
+                        results.write(json.dumps(record) + "\n")
+                        results.flush()
+                        summary["total"] += 1
+                        summary["succeeded" if record["status"] == "success" else "failed"] += 1
+        finally:
+            self.pool.shutdown()
+
+        summary["elapsed_s"] = round(time.perf_counter() - start, 4)
+        return summary
+
+    def _record(self, job, future):
+        try:
+            outcome = future.result()
+        except Exception as e:  # Worker crashed rather than the pipeline failing
+            outcome = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        outcome.pop("result", None)
+        return dict({"id": job.job_id, "source": job.source}, **outcome)
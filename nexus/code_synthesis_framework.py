@@ -1,47 +1,101 @@
+from .instrumentation import instrumented, count
+from .log import get_logger
+from .synthesis.registry import default_registry
+
+log = get_logger(__name__)
+
 class ArchitectAgent:
+    @instrumented
     def process(self, analysis_results, plans):
-        print("Architect Agent: Designing system structure based on domain plans...")
+        log.info("Architect Agent: Designing system structure based on domain plans...")
         # Incorporate plans into architecture description
         architecture = f"Modular C Design with {plans.get('memory', {}).get('allocation', 'standard')} allocation"
         return {"architecture": architecture}
 
 class ImplementationAgent:
-    def process(self, architecture, plans):
-        print("Implementation Agent: Writing C code and integrating templates...")
-        code = "/* Generated C Code */\n#include <stdio.h>\n"
-
-        # Integrate templates from structures plan
-        structures = plans.get("structures", {})
-        templates = structures.get("templates", {})
-        for name, content in templates.items():
-            print(f"Integrating template: {name}")
-            code += f"\n{content}\n"
-
-        # Integrate templates from concurrency plan
-        concurrency = plans.get("concurrency", {})
-        c_templates = concurrency.get("templates", {})
-        for name, content in c_templates.items():
-            print(f"Integrating template: {name}")
-            code += f"\n{content}\n"
-
-        # Integrate templates from algorithm library
-        algorithms = plans.get("algorithms", {})
-        a_templates = algorithms.get("templates", {})
-        for name, content in a_templates.items():
-            print(f"Integrating template: {name}")
-            code += f"\n{content}\n"
-
-        code += "\nint main() { \n    printf(\"NEXUS generated application running.\\n\");\n    return 0; \n}\n"
-        return {"code": code}
+    """
+    Section 3.3: Incremental Synthesis
+    Builds main.c as an ordered list of named fragments (one per integrated
+    template) so the refinement loop can regenerate only the fragments that
+    produced failures. The template registry orders the fragments by their
+    requirements and hoists one deduplicated include list into the prelude.
+    """
+    # Plans whose templates are integrated into main.c, in integration order
+    TEMPLATE_PLANS = ("structures", "memory", "concurrency", "algorithms")
+    PRELUDE = "/* Generated C Code */\n#include <stdio.h>\n"
+    MAIN = "\nint main() { \n    printf(\"NEXUS generated application running.\\n\");\n    return 0; \n}\n"
+
+    def __init__(self, registry=None):
+        self._registry = registry
+
+    @property
+    def registry(self):
+        if self._registry is None:
+            self._registry = default_registry()
+        return self._registry
+
+    def assemble(self, plans):
+        selection = []
+        for plan_name in self.TEMPLATE_PLANS:
+            for template_name, source in plans.get(plan_name, {}).get("templates", {}).items():
+                selection.append((f"{plan_name}/{template_name}", template_name, source))
+        return self.registry.assemble(selection)
+
+    def _names(self, assembly):
+        return ["prelude"] + [name for name, _ in assembly.fragments] + ["main"]
+
+    def layout(self, plans):
+        return self._names(self.assemble(plans))
+
+    def prelude(self, assembly):
+        includes = [f"#include {header}\n" for header in assembly.headers if header != "<stdio.h>"]
+        return self.PRELUDE + "".join(includes)
+
+    def render_fragment(self, name, plans, assembly=None):
+        assembly = assembly or self.assemble(plans)
+        if name == "prelude":
+            return self.prelude(assembly)
+        if name == "main":
+            return self.MAIN
+        log.debug("Integrating template: %s", name.split("/", 1)[1])
+        count("templates_integrated")
+        return f"\n{dict(assembly.fragments)[name]}\n"
+
+    @instrumented
+    def process(self, architecture, plans, previous=None, dirty=()):
+        log.info("Implementation Agent: Writing C code and integrating templates...")
+        reusable = {}
+        if previous:
+            reusable = {f["name"]: f["code"] for f in previous.get("fragments", [])}
+
+        assembly = self.assemble(plans)
+        fragments = []
+        regenerated = []
+        for name in self._names(assembly):
+            if name == "prelude" and reusable.get(name) == self.prelude(assembly):
+                # The include list follows the selection, so it is only reused while it still matches
+                code = reusable[name]
+            elif name in reusable and name not in dirty and name != "prelude":
+                code = reusable[name]
+            else:
+                code = self.render_fragment(name, plans, assembly)
+                regenerated.append(name)
+            fragments.append({"name": name, "code": code})
+
+        count("fragments_reused", len(fragments) - len(regenerated))
+        code = "".join(fragment["code"] for fragment in fragments)
+        return {"code": code, "fragments": fragments, "regenerated": regenerated}
 
 class VerificationAgent:
+    @instrumented
     def process(self, code_info):
-        print("Verification Agent: Reviewing code for correctness...")
+        log.info("Verification Agent: Reviewing code for correctness...")
         return {"status": "Verified"}
 
 class OptimizationAgent:
+    @instrumented
     def process(self, code_info):
-        print("Optimization Agent: Improving performance...")
+        log.info("Optimization Agent: Improving performance...")
         return code_info
 
 class CodeSynthesisFramework:
@@ -51,10 +105,16 @@ class CodeSynthesisFramework:
         self.verifier = VerificationAgent()
         self.optimizer = OptimizationAgent()
 
-    def process(self, analysis_results, verification_plan, plans):
-        print("Starting Code Synthesis Framework...")
+    @instrumented
+    def process(self, analysis_results, verification_plan, plans, previous=None):
+        """
+        With `previous` code_info, only fragments named in
+        analysis_results["failures"]["fragments"] (and new ones) are regenerated.
+        """
+        log.info("Starting Code Synthesis Framework...")
         arch = self.architect.process(analysis_results, plans)
-        impl = self.implementer.process(arch, plans)
+        dirty = set((analysis_results.get("failures") or {}).get("fragments", ()))
+        impl = self.implementer.process(arch, plans, previous=previous, dirty=dirty)
         verif = self.verifier.process(impl)
         final_code = self.optimizer.process(impl)
         return final_code
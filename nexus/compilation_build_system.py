@@ -1,12 +1,18 @@
 import os
 
+from .hashing import fingerprint_directory
+from .instrumentation import instrumented, count
+from .log import get_logger
+
+log = get_logger(__name__)
+
 class MakefileGenerator:
     """
     Section 10.1: Makefile Generator
     Automatic Dependency Tracking and Build Variants.
     """
     def generate(self, target="app", sources="main.c"):
-        print("Generating Makefile with mandatory flags and variants...")
+        log.info("Generating Makefile with mandatory flags and variants...")
         base_flags = "-Wall -Wextra -Wvla -fPIC"
         libs = "-lpthread -lcrypto"
 
@@ -44,32 +50,23 @@ class CompilationBuildSystem:
     def __init__(self):
         self.generator = MakefileGenerator()
 
+    @instrumented
     def process(self, code_info, base_path="."):
-        print(f"Starting Compilation & Build System stage in {base_path}...")
+        log.info("Starting Compilation & Build System stage in %s...", base_path)
         makefile = self.generator.generate()
 
         # Write Makefile and code to the unique session directory
+        fingerprint = None
         try:
             os.makedirs(base_path, exist_ok=True)
             with open(os.path.join(base_path, "Makefile"), "w") as f:
                 f.write(makefile)
             with open(os.path.join(base_path, "main.c"), "w") as f:
                 f.write(code_info.get("code", ""))
+            count("files_written", 2)
+            fingerprint = fingerprint_directory(base_path, files=["Makefile", "main.c"], executor="sequential")
         except Exception as e:
-            print(f"Build System: Error writing files to {base_path}: {e}")
-
-        return {"makefile": makefile, "status": f"Build artifacts generated in {base_path}", "variants": ["debug", "release", "test"]}
-    def process(self, code_info):
-        print("Starting Compilation & Build System stage...")
-        makefile = self.generator.generate()
-
-        # Write Makefile and code to disk for actual compilation capability
-        try:
-            with open("Makefile", "w") as f:
-                f.write(makefile)
-            with open("main.c", "w") as f:
-                f.write(code_info.get("code", ""))
-        except Exception as e:
-            print(f"Build System: Error writing files to disk: {e}")
+            log.warning("Build System: Error writing files to %s: %s", base_path, e)
 
-        return {"makefile": makefile, "status": "Build artifacts generated on disk", "variants": ["debug", "release", "test"]}
+        return {"makefile": makefile, "status": f"Build artifacts generated in {base_path}",
+                "variants": ["debug", "release", "test"], "fingerprint": fingerprint}
@@ -1,5 +1,13 @@
 import re
 import os
+import threading
+from collections import OrderedDict
+
+from .hashing import hash_buffer
+from .instrumentation import instrumented, count
+from .log import get_logger
+
+log = get_logger(__name__)
 
 class CodeStyleEnforcer:
     """
@@ -7,7 +15,13 @@ class CodeStyleEnforcer:
     Enforces style guide (formatting, naming conventions, modularity).
     """
     def check_style(self, code):
-        print("Code Style Enforcer: Validating formatting and naming conventions...")
+        log.info("Code Style Enforcer: Validating formatting and naming conventions...")
+        return self.check_fragment_style(code) + self.check_modularity(code)
+
+    def check_fragment_style(self, code):
+        """
+        Checks that only depend on the text itself, so they can run per fragment.
+        """
         violations = []
 
         # Check for CamelCase in functions (assuming snake_case is required for C)
@@ -18,6 +32,10 @@ class CodeStyleEnforcer:
         if "\t" in code:
             violations.append("Formatting violation: Use spaces instead of TABS")
 
+        return violations
+
+    def check_modularity(self, code):
+        violations = []
         # Modularity check (simulated)
         if len(code.split("\n")) > 500:
             violations.append("Modularity violation: File too long, consider decomposing")
@@ -29,27 +47,54 @@ class ComplianceChecker:
     Section 11.1: Restriction Enforcement
     Static analysis and repository cleanliness validation.
     """
-    def __init__(self):
+    def __init__(self, cache_size=1024):
         self.style_enforcer = CodeStyleEnforcer()
+        # Verdicts keyed by fragment digest: unchanged fragments are never rescanned
+        self.cache_size = cache_size
+        self._verdicts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check_fragment(self, code):
+        key = hash_buffer(code)
+        with self._lock:
+            if key in self._verdicts:
+                self._verdicts.move_to_end(key)
+                return self._verdicts[key]
+
+        count("fragments_checked")
+        verdict = (
+            tuple(self.check_forbidden_functions(code)),
+            tuple(self.style_enforcer.check_fragment_style(code)),
+        )
+
+        with self._lock:
+            self._verdicts[key] = verdict
+            while len(self._verdicts) > self.cache_size:
+                self._verdicts.popitem(last=False)
+        return verdict
 
     def check_forbidden_functions(self, code):
         """
         Uses static analysis (regex/AST) to detect forbidden C functions.
         """
-        print("Compliance Checker: Scanning for forbidden functions...")
+        log.info("Compliance Checker: Scanning for forbidden functions...")
         # Expanded forbidden function list
         forbidden = ["gets", "strcpy", "sprintf", "system", "popen", "strcat", "scanf"]
         violations = []
+        matches = 0
         for func in forbidden:
-            if re.search(rf"\b{func}\s*\(", code):
+            calls = len(re.findall(rf"\b{func}\s*\(", code))
+            if calls:
                 violations.append(func)
+            matches += calls
+        count("regex_matches", matches)
         return violations
 
     def check_repository_cleanliness(self, repo_path="."):
         """
         Validates .gitignore and checks for binary files in repository.
         """
-        print("Compliance Checker: Validating repository cleanliness...")
+        log.info("Compliance Checker: Validating repository cleanliness...")
         violations = []
 
         # Check for .gitignore
@@ -61,22 +106,38 @@ class ComplianceChecker:
         for root, dirs, files in os.walk(repo_path):
             if ".git" in dirs:
                 dirs.remove(".git")
+            count("files_walked", len(files))
             for file in files:
                 if any(file.endswith(ext) for ext in binary_extensions):
                     violations.append(f"Binary file detected: {os.path.join(root, file)}")
 
         return violations
 
+    @instrumented
     def process(self, code_info):
-        print("Starting Compliance Checking stage...")
+        """
+        Checks code per synthesized fragment where available and attributes
+        each violation to the fragment that produced it.
+        """
+        log.info("Starting Compliance Checking stage...")
         code = code_info.get("code", "")
+        fragments = code_info.get("fragments") or [{"name": None, "code": code}]
+
+        function_violations = []
+        style_violations = []
+        fragment_violations = {}
+        for fragment in fragments:
+            functions, style = self.check_fragment(fragment["code"])
+            function_violations.extend(v for v in functions if v not in function_violations)
+            style_violations.extend(v for v in style if v not in style_violations)
+            if fragment["name"] is not None and (functions or style):
+                fragment_violations[fragment["name"]] = list(functions + style)
 
-        function_violations = self.check_forbidden_functions(code)
         repo_violations = self.check_repository_cleanliness()
-        style_violations = self.style_enforcer.check_style(code)
+        style_violations += self.style_enforcer.check_modularity(code)
 
         all_violations = function_violations + repo_violations + style_violations
 
         if all_violations:
-            return {"status": "FAILED", "violations": all_violations}
+            return {"status": "FAILED", "violations": all_violations, "fragment_violations": fragment_violations}
         return {"status": "PASSED", "style": "Verified"}
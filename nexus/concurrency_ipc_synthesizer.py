@@ -1,4 +1,28 @@
 from .synthesis.templates import TemplateLibrary
+from .instrumentation import instrumented
+from .feature_index import FeatureIndex
+from .log import get_logger
+
+log = get_logger(__name__)
+
+
+def wants_work_stealing(features):
+    """
+    Recursive or irregular task parallelism, which a work-stealing
+    scheduler balances better than a shared-queue thread pool.
+    """
+    return features.has("divide and conquer", "divide-and-conquer", "fork-join", "fork join",
+                        "parallel for", "work stealing", "work-stealing", "recursive parallel")
+
+
+def wants_event_loop(features):
+    """
+    Servers that must hold many connections open at once, where a thread
+    (or a blocking accept loop) per connection does not scale.
+    """
+    return features.has("epoll", "event loop", "event-driven", "non-blocking", "c10k",
+                        "thousands of connections", "many connections", "concurrent connections")
+
 
 class ConcurrencyIPCSynthesizer:
     """
@@ -8,7 +32,7 @@ class ConcurrencyIPCSynthesizer:
         self.templates = TemplateLibrary()
 
     def select_concurrency_model(self, analysis_results):
-        all_text = str(analysis_results).lower()
+        features = FeatureIndex.of(analysis_results)
         model = {
             "threads": "None",
             "ipc": "None",
@@ -16,30 +40,42 @@ class ConcurrencyIPCSynthesizer:
             "templates": {}
         }
 
-        if "thread" in all_text or "concurrent" in all_text:
+        if features.has("thread", "concurrent"):
             model["threads"] = "POSIX Threads"
             model["sync"] = "Mutex / Condition Variables"
             model["templates"]["THREAD_POOL"] = self.templates.get_template("THREAD_POOL")
 
-        if "signal" in all_text:
+        # Section 6.1: Work-stealing Scheduler
+        if wants_work_stealing(features):
+            log.debug("Divide-and-conquer parallelism detected. Adding Work-stealing Scheduler.")
+            model["threads"] = "POSIX Threads (work-stealing)"
+            model["templates"]["WORK_STEALING_SCHEDULER"] = self.templates.get_template("WORK_STEALING_SCHEDULER")
+
+        if features.has("signal"):
             model["templates"]["SIGNAL_HANDLER"] = self.templates.get_template("SIGNAL_HANDLER")
 
-        if "ipc" in all_text or "pipe" in all_text:
+        if features.has("ipc", "pipe"):
             model["ipc"] = "Named Pipes (FIFO)"
 
         # Section 6.2: Socket Programming
-        if "socket" in all_text or "network" in all_text or "tcp" in all_text:
-            model["ipc"] = "TCP Sockets"
-            model["templates"]["TCP_SERVER"] = self.templates.get_template("TCP_SERVER")
+        if features.has("socket", "network", "tcp"):
+            if wants_event_loop(features):
+                log.debug("High connection count detected. Adding epoll event-loop server.")
+                model["ipc"] = "TCP Sockets (epoll event loop)"
+                model["templates"]["EPOLL_SERVER"] = self.templates.get_template("EPOLL_SERVER")
+            else:
+                model["ipc"] = "TCP Sockets"
+                model["templates"]["TCP_SERVER"] = self.templates.get_template("TCP_SERVER")
 
         # Section 6.2: Shared Memory
-        if "shared memory" in all_text or "shm" in all_text or "mmap" in all_text:
+        if features.has("shared memory", "shm", "mmap"):
             model["ipc"] = "POSIX Shared Memory"
             model["templates"]["SHARED_MEMORY"] = self.templates.get_template("SHARED_MEMORY")
 
         return model
 
+    @instrumented
     def process(self, analysis_results):
-        print("Concurrency & IPC Synthesizer: Generating thread and IPC logic...")
+        log.info("Concurrency & IPC Synthesizer: Generating thread and IPC logic...")
         model = self.select_concurrency_model(analysis_results)
         return model
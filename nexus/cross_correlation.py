@@ -0,0 +1,247 @@
+import cmath
+import math
+
+from .instrumentation import count
+from .log import get_logger
+
+log = get_logger(__name__)
+
+_numpy = None
+
+
+def load_numpy():
+    """
+    Imports NumPy on first use. Returns None when it is not installed, in
+    which case the pure-Python FFT is used.
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def next_power_of_two(n):
+    return 1 << max(0, n - 1).bit_length()
+
+
+_twiddles = {}
+
+
+def _twiddle_table(n):
+    table = _twiddles.get(n)
+    if table is None:
+        table = [cmath.exp(-2j * math.pi * k / n) for k in range(n // 2)]
+        _twiddles[n] = table
+    return table
+
+
+def fft(values, inverse=False):
+    """
+    Iterative radix-2 Cooley-Tukey FFT of a sequence whose length is a power
+    of two. The inverse transform is scaled by 1/n.
+    """
+    a = [complex(v) for v in values]
+    n = len(a)
+    if n & (n - 1):
+        raise ValueError("FFT length must be a power of two")
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            a[i], a[j] = a[j], a[i]
+    table = _twiddle_table(n)
+    if inverse:
+        table = [w.conjugate() for w in table]
+    length = 2
+    while length <= n:
+        half, stride = length // 2, n // length
+        twiddles = table[::stride]
+        for start in range(0, n, length):
+            for k in range(half):
+                u = a[start + k]
+                v = a[start + k + half] * twiddles[k]
+                a[start + k] = u + v
+                a[start + k + half] = u - v
+        length <<= 1
+    if inverse:
+        a = [v / n for v in a]
+    return a
+
+
+def _spectra_of_two_reals(x, y, size):
+    """
+    Spectra of two real sequences from one complex FFT of x + iy.
+    """
+    z = fft([complex(xv, yv) for xv, yv in zip(_padded(x, size), _padded(y, size))])
+    xs, ys = [], []
+    for k in range(size):
+        zc = z[-k % size].conjugate()
+        xs.append((z[k] + zc) / 2)
+        ys.append((z[k] - zc) / 2j)
+    return xs, ys
+
+
+def _padded(values, size):
+    values = list(values)
+    return values + [0.0] * (size - len(values))
+
+
+def direct_correlate(a, b):
+    """
+    O(n*m) reference: result[k] = sum_i a[i + k - (len(b) - 1)] * b[i],
+    the "full" cross-correlation of numpy.correlate.
+    """
+    n, m = len(a), len(b)
+    result = [0.0] * (n + m - 1)
+    for j, bv in enumerate(b):
+        offset = m - 1 - j
+        for i, av in enumerate(a):
+            result[i + offset] += av * bv
+    return result
+
+
+class FFTBasedCrossCorrelation:
+    """
+    Section 9.1: FFT-based Cross-Correlation
+    Full cross-correlation (numpy.correlate(a, b, "full") semantics) computed
+    as a convolution with the reversed second signal. Uses NumPy's rfft with
+    power-of-two padding when available, else a pure-Python radix-2 FFT.
+    Short inputs use the direct sum; a long signal against a short template
+    uses overlap-save so the transform size follows the template.
+    """
+    # Below this many multiply-adds the direct sum beats the transforms.
+    # Pure Python crosses over at n = m = 64 (benchmarks/bench_fft.py);
+    # numpy.correlate runs in C, so it stays ahead for longer.
+    DIRECT_MAX_WORK = 1 << 12
+    NUMPY_DIRECT_MAX_WORK = 1 << 16
+    # Overlap-save once the long signal is this many times the template
+    OVERLAP_SAVE_RATIO = 8
+
+    def __init__(self, use_numpy=None):
+        self.np = load_numpy() if use_numpy is not False else None
+        if use_numpy and self.np is None:
+            raise ImportError("NumPy is not installed")
+
+    def choose_method(self, n, m):
+        limit = self.NUMPY_DIRECT_MAX_WORK if self.np is not None else self.DIRECT_MAX_WORK
+        if n * m <= limit or min(n, m) == 1:
+            return "direct"
+        if max(n, m) >= self.OVERLAP_SAVE_RATIO * min(n, m):
+            return "overlap_save"
+        return "fft"
+
+    def compute(self, signal_a, signal_b, method="auto"):
+        """
+        Returns the full cross-correlation of two real signals as a list of
+        len(a) + len(b) - 1 floats.
+        """
+        log.debug("Computing FFT-based Cross-Correlation...")
+        n, m = len(signal_a), len(signal_b)
+        if not n or not m:
+            return []
+        if method == "auto":
+            method = self.choose_method(n, m)
+        count(f"correlation_{method}")
+        if method == "direct":
+            if self.np is not None:
+                return self.np.correlate(self.np.asarray(signal_a, float), self.np.asarray(signal_b, float), "full").tolist()
+            return direct_correlate(signal_a, signal_b)
+        if method == "overlap_save":
+            if n < m:
+                # corr(a, b)[k] == corr(b, a)[-k]: filter the longer signal
+                return self.overlap_save(signal_b, signal_a)[::-1]
+            return self.overlap_save(signal_a, signal_b)
+        if method != "fft":
+            raise ValueError(f"Unknown correlation method: {method}")
+        if self.np is not None:
+            return self._fft_numpy(signal_a, signal_b).tolist()
+        return self._fft_python(signal_a, signal_b)
+
+    def _fft_numpy(self, a, b):
+        np = self.np
+        a, b = np.asarray(a, float), np.asarray(b, float)
+        out = len(a) + len(b) - 1
+        size = next_power_of_two(out)
+        spectrum = np.fft.rfft(a, size) * np.fft.rfft(b[::-1], size)
+        return np.fft.irfft(spectrum, size)[:out]
+
+    def _fft_python(self, a, b):
+        out = len(a) + len(b) - 1
+        size = next_power_of_two(out)
+        spectrum_a, spectrum_b = _spectra_of_two_reals(a, list(b)[::-1], size)
+        product = [x * y for x, y in zip(spectrum_a, spectrum_b)]
+        return [v.real for v in fft(product, inverse=True)[:out]]
+
+    def overlap_save(self, signal, template, block_size=None):
+        """
+        Correlates a long `signal` with a short `template` in blocks of
+        `block_size` (default: the power of two >= 4x the template), giving
+        O(n log m) work and O(m) transform memory.
+        """
+        m = len(template)
+        size = block_size or next_power_of_two(4 * m)
+        if size < m:
+            raise ValueError("Overlap-save block must be at least the template length")
+        step = size - m + 1
+        out = len(signal) + m - 1
+        blocks = -(-out // step)
+        kernel = list(template)[::-1]
+
+        if self.np is not None:
+            np = self.np
+            signal = np.asarray(signal, float)
+            total = (blocks - 1) * step + size
+            padded = np.zeros(total)
+            padded[m - 1:m - 1 + len(signal)] = signal
+            segments = np.lib.stride_tricks.sliding_window_view(padded, size)[::step][:blocks]
+            spectra = np.fft.rfft(segments, axis=1) * np.fft.rfft(np.asarray(kernel, float), size)
+            valid = np.fft.irfft(spectra, size, axis=1)[:, m - 1:]
+            return valid.reshape(-1)[:out].tolist()
+
+        kernel_spectrum = fft(_padded(kernel, size))
+        padded = [0.0] * (m - 1) + list(signal)
+        padded += [0.0] * ((blocks - 1) * step + size - len(padded))
+        result = []
+        for start in range(0, blocks * step, step):
+            spectrum = fft(padded[start:start + size])
+            block = fft([x * y for x, y in zip(spectrum, kernel_spectrum)], inverse=True)
+            result.extend(v.real for v in block[m - 1:])
+        return result[:out]
+
+    def compute_many(self, pairs, method="auto"):
+        """
+        Correlates many (a, b) pairs. With NumPy, pairs needing the same FFT
+        size are transformed together as one 2-D batch.
+        """
+        pairs = list(pairs)
+        if self.np is None or method not in ("auto", "fft"):
+            return [self.compute(a, b, method) for a, b in pairs]
+        np = self.np
+        results = [None] * len(pairs)
+        groups = {}
+        for index, (a, b) in enumerate(pairs):
+            n, m = len(a), len(b)
+            if not n or not m or (method == "auto" and self.choose_method(n, m) != "fft"):
+                results[index] = self.compute(a, b, method)
+            else:
+                groups.setdefault(next_power_of_two(n + m - 1), []).append(index)
+        for size, indices in groups.items():
+            rows_a, rows_b = np.zeros((len(indices), size)), np.zeros((len(indices), size))
+            for row, index in enumerate(indices):
+                a, b = pairs[index]
+                rows_a[row, :len(a)] = a
+                rows_b[row, :len(b)] = np.asarray(b, float)[::-1]
+            correlated = np.fft.irfft(np.fft.rfft(rows_a, axis=1) * np.fft.rfft(rows_b, axis=1), size, axis=1)
+            for row, index in enumerate(indices):
+                a, b = pairs[index]
+                results[index] = correlated[row, :len(a) + len(b) - 1].tolist()
+        count("correlation_batched", sum(len(indices) for indices in groups.values()))
+        return results
@@ -0,0 +1,190 @@
+from collections import deque
+
+# Every keyword a planner or the semantic analyzer looks for. Matching is on
+# lower-cased substrings, exactly like the `keyword in text.lower()` checks
+# these keywords replace.
+FEATURE_KEYWORDS = (
+    # Semantic analysis and test inference
+    "assume", "depends on", "memory", "performance", "limit", "restriction", "fast", "concurrent", "thread",
+    # Concurrency & IPC
+    "signal", "ipc", "pipe", "socket", "network", "tcp", "shared memory", "shm", "mmap",
+    "epoll", "event loop", "event-driven", "non-blocking", "c10k", "thousands of connections",
+    "many connections", "concurrent connections",
+    # Data structure selection
+    "bounded", "ring buffer", "fixed capacity", "backpressure",
+    # Task parallelism
+    "divide and conquer", "divide-and-conquer", "fork-join", "fork join", "parallel for",
+    "work stealing", "work-stealing", "recursive parallel",
+    # Memory management
+    "frequent allocation", "many small objects", "batch processing", "lifetime grouped",
+    "small objects", "short-lived", "short lived", "long-lived", "long lived", "per-request", "per request",
+    "freed together", "mixed sizes", "variable size", "variable-size",
+    "complex ownership", "graph", "garbage collect", "ownership graph", "object graph",
+    "cyclic references", "reference cycles",
+    # Algorithm library
+    "integrity", "verification", "correlation", "fft", "dependency", "traverse",
+    "large", "stream", "checksum",
+)
+
+# Analysis entries that are not specification text: feedback from earlier
+# iterations, source offsets and the index itself
+EXCLUDED_FIELDS = ("failures", "spans", "features")
+
+
+class KeywordMatcher:
+    """
+    Section 1.1: Multi-Pattern Matching
+    Aho-Corasick automaton over a fixed keyword set: one pass over the text
+    finds every keyword occurrence, independent of how many keywords there are.
+    """
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(k.lower() for k in keywords))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for keyword in self.keywords:
+            self._insert(keyword)
+        self._link()
+
+    def _insert(self, keyword):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += (keyword,)
+
+    def _link(self):
+        # Breadth-first, so a state's failure target is final before its children need it
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in self._goto[state].items():
+                pending.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] += self._output[self._fail[child]]
+
+    def iter_matches(self, text):
+        """
+        Yields (end_offset, keyword) for every occurrence in `text`, which
+        must already be lower-cased.
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for offset, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in output[state]:
+                yield offset + 1, keyword
+
+    def scan(self, text):
+        """
+        Returns the frozenset of keywords occurring in `text`.
+        """
+        return frozenset(keyword for _, keyword in self.iter_matches(text.lower()))
+
+
+_default_matcher = None
+
+
+def default_matcher():
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = KeywordMatcher(FEATURE_KEYWORDS)
+    return _default_matcher
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            yield from _strings(item)
+    elif value is not None:
+        yield str(value)
+
+
+class FeatureIndex:
+    """
+    Section 1.1: Feature Index
+    Immutable record of which keywords occur in each analysis field, built by
+    a single scan of the analysis. Planners query it instead of re-scanning
+    the analysis dict.
+    """
+    __slots__ = ("_fields",)
+
+    def __init__(self, fields):
+        object.__setattr__(self, "_fields", tuple(sorted((name, frozenset(words)) for name, words in fields.items())))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FeatureIndex is immutable")
+
+    def __reduce__(self):
+        return (FeatureIndex, (dict(self._fields),))
+
+    @classmethod
+    def build(cls, analysis_results, matcher=None):
+        matcher = matcher or default_matcher()
+        fields = {}
+        for name, value in analysis_results.items():
+            if name in EXCLUDED_FIELDS:
+                continue
+            # NUL never occurs in a keyword, so matches cannot span two strings
+            text = "\0".join(_strings(value)).lower()
+            fields[name] = frozenset(keyword for _, keyword in matcher.iter_matches(text))
+        return cls(fields)
+
+    @classmethod
+    def of(cls, analysis_results):
+        """
+        Returns the index attached by the analysis engine, or builds one for
+        analysis dicts assembled by hand (or extended since indexing).
+        """
+        features = analysis_results.get("features")
+        if isinstance(features, cls) and set(analysis_results).difference(EXCLUDED_FIELDS) <= set(features.fields):
+            return features
+        return cls.build(analysis_results)
+
+    @property
+    def fields(self):
+        return tuple(name for name, _ in self._fields)
+
+    def keywords(self, *fields):
+        """
+        Keywords found in the given fields, or in all fields if none are given.
+        """
+        found = frozenset()
+        for name, words in self._fields:
+            if not fields or name in fields:
+                found |= words
+        return found
+
+    def has(self, *keywords, fields=()):
+        """
+        True if any of `keywords` occurs in `fields` (default: all fields).
+        """
+        found = self.keywords(*fields)
+        return any(keyword in found for keyword in keywords)
+
+    def __eq__(self, other):
+        return isinstance(other, FeatureIndex) and self._fields == other._fields
+
+    def __hash__(self):
+        return hash(self._fields)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={sorted(words)}" for name, words in self._fields)
+        return f"FeatureIndex({fields})"
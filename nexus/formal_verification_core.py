@@ -1,9 +1,14 @@
+from .instrumentation import instrumented
+from .log import get_logger
+
+log = get_logger(__name__)
+
 class SymbolicExecutor:
     def explore_paths(self, code):
         """
         Interfaces with KLEE/Z3 to explore all execution paths.
         """
-        print("Symbolic Execution: Running KLEE on generated code...")
+        log.info("Symbolic Execution: Running KLEE on generated code...")
         return {"safety_properties": "Proved", "paths_explored": 1024}
 
 class ConstraintSolver:
@@ -12,7 +17,7 @@ class ConstraintSolver:
     Integrates Z3 SMT solver for proving correctness properties.
     """
     def solve_constraints(self, properties):
-        print("Constraint Solver: Invoking Z3 SMT solver...")
+        log.info("Constraint Solver: Invoking Z3 SMT solver...")
         # Simulated SMT solving logic
         return {"status": "SAT", "proof": "Valid for all inputs"}
 
@@ -22,7 +27,7 @@ class HappensBeforeAnalyzer:
     Thread Interleaving Analysis using Happens-before analysis.
     """
     def analyze_interleaving(self, code):
-        print("Happens-Before Analysis: Checking for race conditions via vector clocks...")
+        log.info("Happens-Before Analysis: Checking for race conditions via vector clocks...")
         return {"race_conditions": "None detected", "happens_before_consistent": True}
 
 class DeadlockDetector:
@@ -31,7 +36,7 @@ class DeadlockDetector:
     Systematically explores thread schedules for circular wait conditions.
     """
     def analyze_circular_wait(self, concurrency_logic):
-        print("Deadlock Detection: Analyzing for circular wait conditions...")
+        log.info("Deadlock Detection: Analyzing for circular wait conditions...")
         # Simulated analysis logic
         if "Mutex" in str(concurrency_logic):
             return {"deadlocks": "None detected", "circular_wait": "Analyzed"}
@@ -43,7 +48,7 @@ class LinearizabilityChecker:
     Verifies concurrent data structures maintain sequential consistency.
     """
     def check_linearizability(self, code):
-        print("Linearizability Checker: Verifying sequential consistency...")
+        log.info("Linearizability Checker: Verifying sequential consistency...")
         # Simulated verification logic
         return {"status": "Verified", "properties": ["Linearizable", "Wait-free"]}
 
@@ -57,7 +62,7 @@ class ConcurrencyVerifier:
         """
         Systematically explores thread schedules for race conditions and deadlocks.
         """
-        print("Concurrency Verification: Running Helgrind/ThreadSanitizer analysis...")
+        log.info("Concurrency Verification: Running Helgrind/ThreadSanitizer analysis...")
         # In a real scenario, this would analyze the code or concurrency logic
         return self.deadlock_detector.analyze_circular_wait(code)
 
@@ -73,8 +78,9 @@ class FormalVerificationCore:
         self.concurrency_verifier = ConcurrencyVerifier()
         self.constraint_solver = ConstraintSolver()
 
+    @instrumented
     def process(self, analysis_results):
-        print("Starting Formal Verification stage...")
+        log.info("Starting Formal Verification stage...")
         # In a real scenario, this would take the generated code
         return {
             "symbolic_verification": self.symbolic_executor.explore_paths(None),
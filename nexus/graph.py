@@ -0,0 +1,531 @@
+import heapq
+import itertools
+import os
+from array import array
+
+from .instrumentation import count
+
+
+def _index_typecode(limit):
+    # 4-byte ids halve memory for anything short of two billion nodes/edges
+    return "i" if limit < 2 ** 31 else "q"
+
+
+def _zeros(typecode, length):
+    return array(typecode, bytes(array(typecode).itemsize * length))
+
+
+def expand_frontier(offsets, targets, frontier):
+    """
+    Out-neighbors of every node in `frontier`, without duplicates, in the
+    order a sequential scan would first meet them.
+    """
+    neighbors = itertools.chain.from_iterable(targets[offsets[u]:offsets[u + 1]] for u in frontier)
+    return array("q", dict.fromkeys(neighbors))
+
+
+# Adjacency arrays of the graph being searched, set once per pool worker
+_worker_graph = None
+
+
+def _init_frontier_worker(offsets, targets):
+    global _worker_graph
+    _worker_graph = (offsets, targets)
+
+
+def _expand_in_worker(frontier):
+    return expand_frontier(*_worker_graph, frontier)
+
+
+class CSRGraph:
+    """
+    Section 9.1: Compressed Sparse Row Graph
+    Directed graph over integer node ids 0..n-1. The out-edges of node u are
+    targets[offsets[u]:offsets[u + 1]], both flat arrays, so a graph with
+    millions of edges is two contiguous buffers rather than millions of
+    Python lists. `labels` maps ids back to the caller's node names.
+    """
+    def __init__(self, offsets, targets, labels=None, weights=None):
+        self.offsets = offsets
+        self.targets = targets
+        self.labels = labels
+        # Edge weights parallel to `targets`; None means every edge weighs 1
+        self.weights = weights
+        self._index = None
+
+    @classmethod
+    def from_edges(cls, edges, num_nodes=None, labels=None, weighted=False):
+        """
+        Builds a graph from (source, target) id pairs, or (source, target,
+        weight) triples when `weighted`, with a counting sort; edges keep
+        their input order within each source.
+        """
+        sources, targets = array("q"), array("q")
+        weights = array("d") if weighted else None
+        if weighted:
+            for u, v, w in edges:
+                sources.append(u)
+                targets.append(v)
+                weights.append(w)
+        else:
+            for u, v in edges:
+                sources.append(u)
+                targets.append(v)
+        if num_nodes is None:
+            num_nodes = max(max(sources, default=-1), max(targets, default=-1)) + 1
+        typecode = _index_typecode(max(num_nodes, len(targets)))
+        offsets = _zeros(typecode, num_nodes + 1)
+        for u in sources:
+            offsets[u + 1] += 1
+        for u in range(num_nodes):
+            offsets[u + 1] += offsets[u]
+        cursor = array(typecode, offsets[:-1])
+        ordered = _zeros(typecode, len(targets))
+        ordered_weights = _zeros("d", len(targets)) if weighted else None
+        for e, (u, v) in enumerate(zip(sources, targets)):
+            position = cursor[u]
+            ordered[position] = v
+            if weighted:
+                ordered_weights[position] = weights[e]
+            cursor[u] += 1
+        count("graph_edges_loaded", len(targets))
+        return cls(offsets, ordered, labels, ordered_weights)
+
+    @classmethod
+    def from_adjacency(cls, graph):
+        """
+        Adapts the dict-of-lists form {node: [neighbors]}. Nodes that only
+        appear as neighbors are included; labels keep first-seen order. A
+        {neighbor: weight} dict in place of a list gives a weighted graph.
+        """
+        index = {}
+        for node in graph:
+            index.setdefault(node, len(index))
+        for neighbors in graph.values():
+            for node in neighbors:
+                index.setdefault(node, len(index))
+        weighted = any(isinstance(neighbors, dict) for neighbors in graph.values())
+        if weighted:
+            edges = (
+                (index[u], index[v], neighbors[v] if isinstance(neighbors, dict) else 1)
+                for u, neighbors in graph.items() for v in neighbors
+            )
+        else:
+            edges = ((index[u], index[v]) for u, neighbors in graph.items() for v in neighbors)
+        csr = cls.from_edges(edges, num_nodes=len(index), labels=list(index), weighted=weighted)
+        csr._index = index
+        return csr
+
+    @property
+    def num_nodes(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def __len__(self):
+        return self.num_nodes
+
+    def neighbors(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def out_degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def __contains__(self, label):
+        if self.labels is None:
+            return isinstance(label, int) and 0 <= label < self.num_nodes
+        return label in self._label_index()
+
+    def _label_index(self):
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.labels)}
+        return self._index
+
+    def node_id(self, label):
+        if self.labels is None:
+            return label
+        return self._label_index()[label]
+
+    def label(self, u):
+        return u if self.labels is None else self.labels[u]
+
+    def edges(self):
+        offsets, targets = self.offsets, self.targets
+        for u in range(self.num_nodes):
+            for e in range(offsets[u], offsets[u + 1]):
+                yield u, targets[e]
+
+    def reverse(self):
+        if self.weights is None:
+            return CSRGraph.from_edges(((v, u) for u, v in self.edges()), self.num_nodes, self.labels)
+        weights = self.weights
+        edges = ((v, u, weights[e]) for e, (u, v) in enumerate(self.edges()))
+        return CSRGraph.from_edges(edges, self.num_nodes, self.labels, weighted=True)
+
+    def dfs_order(self, start, seen=None):
+        """
+        Iterative depth-first preorder from `start`, visiting neighbors in
+        edge order (the same order as the recursive version). `seen` is an
+        optional bytearray of already-visited ids, updated in place.
+        """
+        offsets, targets = self.offsets, self.targets
+        seen = bytearray(self.num_nodes) if seen is None else seen
+        if seen[start]:
+            return []
+        seen[start] = 1
+        order = [start]
+        # Parallel stacks: a node and the next edge of it to try
+        nodes, edges = [start], [offsets[start]]
+        while nodes:
+            u, e = nodes[-1], edges[-1]
+            end = offsets[u + 1]
+            while e < end and seen[targets[e]]:
+                e += 1
+            if e == end:
+                nodes.pop()
+                edges.pop()
+                continue
+            edges[-1] = e + 1
+            v = targets[e]
+            seen[v] = 1
+            order.append(v)
+            nodes.append(v)
+            edges.append(offsets[v])
+        return order
+
+    def dfs_postorder(self, start, seen=None):
+        """
+        Iterative depth-first postorder from `start`: every node comes after
+        all the nodes it reaches (on an acyclic graph).
+        """
+        offsets, targets = self.offsets, self.targets
+        seen = bytearray(self.num_nodes) if seen is None else seen
+        if seen[start]:
+            return []
+        seen[start] = 1
+        order = []
+        nodes, edges = [start], [offsets[start]]
+        while nodes:
+            u, e = nodes[-1], edges[-1]
+            end = offsets[u + 1]
+            while e < end and seen[targets[e]]:
+                e += 1
+            if e == end:
+                order.append(u)
+                nodes.pop()
+                edges.pop()
+                continue
+            edges[-1] = e + 1
+            v = targets[e]
+            seen[v] = 1
+            nodes.append(v)
+            edges.append(offsets[v])
+        return order
+
+    def bfs_order(self, start, seen=None):
+        """
+        Breadth-first order from `start`; the queue is a list read through a
+        moving head index, so each node is enqueued and dequeued in O(1).
+        """
+        offsets, targets = self.offsets, self.targets
+        seen = bytearray(self.num_nodes) if seen is None else seen
+        if seen[start]:
+            return []
+        seen[start] = 1
+        order = [start]
+        head = 0
+        while head < len(order):
+            u = order[head]
+            head += 1
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if not seen[v]:
+                    seen[v] = 1
+                    order.append(v)
+        return order
+
+    def topological_sort(self):
+        """
+        Kahn's algorithm. Raises ValueError if the graph has a cycle.
+        """
+        offsets, targets = self.offsets, self.targets
+        indegree = _zeros(_index_typecode(self.num_edges), self.num_nodes)
+        for v in targets:
+            indegree[v] += 1
+        order = [u for u in range(self.num_nodes) if not indegree[u]]
+        head = 0
+        while head < len(order):
+            u = order[head]
+            head += 1
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                indegree[v] -= 1
+                if not indegree[v]:
+                    order.append(v)
+        if len(order) < self.num_nodes:
+            raise ValueError(f"Graph has a cycle through {self.find_cycle()}")
+        return order
+
+    def find_cycle(self):
+        """
+        Returns the ids of one directed cycle [u, ..., u] or None, using an
+        iterative three-colour DFS.
+        """
+        offsets, targets = self.offsets, self.targets
+        WHITE, GREY, BLACK = 0, 1, 2
+        colour = bytearray(self.num_nodes)
+        for root in range(self.num_nodes):
+            if colour[root] != WHITE:
+                continue
+            colour[root] = GREY
+            nodes, edges = [root], [offsets[root]]
+            while nodes:
+                u, e = nodes[-1], edges[-1]
+                if e == offsets[u + 1]:
+                    colour[u] = BLACK
+                    nodes.pop()
+                    edges.pop()
+                    continue
+                edges[-1] = e + 1
+                v = targets[e]
+                if colour[v] == GREY:
+                    return nodes[nodes.index(v):] + [v]
+                if colour[v] == WHITE:
+                    colour[v] = GREY
+                    nodes.append(v)
+                    edges.append(offsets[v])
+        return None
+
+    def has_cycle(self):
+        return self.find_cycle() is not None
+
+    def component_ids(self):
+        """
+        Weakly connected component id of every node (union-find with path
+        halving over the edge arrays).
+        """
+        parent = array("q", range(self.num_nodes))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for u, v in self.edges():
+            ru, rv = find(u), find(v)
+            if ru != rv:
+                # The smaller id wins, so component roots are deterministic
+                if ru < rv:
+                    parent[rv] = ru
+                else:
+                    parent[ru] = rv
+        return array("q", (find(u) for u in range(self.num_nodes)))
+
+    def connected_components(self):
+        """
+        Weakly connected components as lists of ids, ordered by smallest id.
+        """
+        components = {}
+        for u, root in enumerate(self.component_ids()):
+            components.setdefault(root, []).append(u)
+        return list(components.values())
+
+    def strongly_connected_components(self, method="tarjan"):
+        """
+        Strongly connected components as lists of ids. Tarjan's algorithm
+        (one pass) lists them sinks first, i.e. in reverse topological order
+        of the condensation; Kosaraju's (two passes, over the graph and its
+        reverse) lists them in topological order.
+        """
+        if method == "tarjan":
+            components = self._tarjan()
+        elif method == "kosaraju":
+            components = self._kosaraju()
+        else:
+            raise ValueError(f"Unknown SCC method: {method}")
+        count("graph_sccs", len(components))
+        return components
+
+    def _tarjan(self):
+        offsets, targets = self.offsets, self.targets
+        n = self.num_nodes
+        # Discovery numbers start at 1 so that 0 means unvisited
+        index, low = _zeros("q", n), _zeros("q", n)
+        on_stack = bytearray(n)
+        stack, components = [], []
+        counter = 0
+        for root in range(n):
+            if index[root]:
+                continue
+            counter += 1
+            index[root] = low[root] = counter
+            stack.append(root)
+            on_stack[root] = 1
+            nodes, edges = [root], [offsets[root]]
+            while nodes:
+                u, e = nodes[-1], edges[-1]
+                if e < offsets[u + 1]:
+                    edges[-1] = e + 1
+                    v = targets[e]
+                    if not index[v]:
+                        counter += 1
+                        index[v] = low[v] = counter
+                        stack.append(v)
+                        on_stack[v] = 1
+                        nodes.append(v)
+                        edges.append(offsets[v])
+                    elif on_stack[v] and index[v] < low[u]:
+                        low[u] = index[v]
+                    continue
+                nodes.pop()
+                edges.pop()
+                if nodes and low[u] < low[nodes[-1]]:
+                    low[nodes[-1]] = low[u]
+                if low[u] == index[u]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component.append(w)
+                        if w == u:
+                            break
+                    components.append(component)
+        return components
+
+    def _kosaraju(self):
+        offsets, targets = self.offsets, self.targets
+        n = self.num_nodes
+        seen = bytearray(n)
+        finished = []
+        for root in range(n):
+            if seen[root]:
+                continue
+            seen[root] = 1
+            nodes, edges = [root], [offsets[root]]
+            while nodes:
+                u, e = nodes[-1], edges[-1]
+                end = offsets[u + 1]
+                while e < end and seen[targets[e]]:
+                    e += 1
+                if e == end:
+                    finished.append(u)
+                    nodes.pop()
+                    edges.pop()
+                    continue
+                edges[-1] = e + 1
+                v = targets[e]
+                seen[v] = 1
+                nodes.append(v)
+                edges.append(offsets[v])
+        reverse = self.reverse()
+        assigned = bytearray(n)
+        return [reverse.dfs_order(u, assigned) for u in reversed(finished) if not assigned[u]]
+
+    def dijkstra(self, sources, target=None):
+        """
+        Single- or multi-source Dijkstra over a binary heap (heapq) with lazy
+        deletion. Returns (distances, parents): distances are floats, inf for
+        unreachable nodes; parents[v] is v's predecessor or -1. Stops early
+        once `target` is settled.
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        if weights is not None and len(weights) and min(weights) < 0:
+            raise ValueError("Dijkstra requires non-negative edge weights")
+        n = self.num_nodes
+        sources = [sources] if isinstance(sources, int) else list(sources)
+        distances = [float("inf")] * n
+        parents = array("q", [-1]) * n
+        settled = bytearray(n)
+        heap = []
+        for s in sources:
+            distances[s] = 0.0
+            heap.append((0.0, s))
+        heapq.heapify(heap)
+        while heap:
+            d, u = heapq.heappop(heap)
+            if settled[u]:
+                continue
+            settled[u] = 1
+            if u == target:
+                break
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                candidate = d + (1 if weights is None else weights[e])
+                if candidate < distances[v]:
+                    distances[v] = candidate
+                    parents[v] = u
+                    heapq.heappush(heap, (candidate, v))
+        return distances, parents
+
+    def shortest_path(self, source, target):
+        """
+        Returns (distance, [source, ..., target]), or (inf, None) when the
+        target is unreachable.
+        """
+        distances, parents = self.dijkstra(source, target)
+        if distances[target] == float("inf"):
+            return distances[target], None
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        return distances[target], path[::-1]
+
+    def bfs_levels(self, sources, executor="sequential", max_workers=None, parallel_threshold=1 << 15):
+        """
+        Level-synchronous BFS from one or many sources; returns the frontiers,
+        level 0 being the sources. With executor="process", frontiers of at
+        least `parallel_threshold` nodes are split across a process pool whose
+        workers hold their own copy of the adjacency arrays. Chunk results are
+        merged in frontier order, so the levels match a sequential run.
+        """
+        if executor not in ("sequential", "process"):
+            raise ValueError(f"Unknown BFS executor: {executor}")
+        offsets, targets = self.offsets, self.targets
+        sources = [sources] if isinstance(sources, int) else sources
+        seen = bytearray(self.num_nodes)
+        frontier = []
+        for s in sources:
+            if not seen[s]:
+                seen[s] = 1
+                frontier.append(s)
+        levels = []
+        pool = None
+        try:
+            while frontier:
+                levels.append(frontier)
+                if executor == "process" and len(frontier) >= parallel_threshold:
+                    if pool is None:
+                        from concurrent.futures import ProcessPoolExecutor
+                        max_workers = max_workers or os.cpu_count() or 1
+                        pool = ProcessPoolExecutor(max_workers, initializer=_init_frontier_worker,
+                                                   initargs=(offsets, targets))
+                    # About four chunks per worker evens out skewed degrees
+                    step = -(-len(frontier) // (max_workers * 4))
+                    chunks = [frontier[i:i + step] for i in range(0, len(frontier), step)]
+                    candidates = itertools.chain.from_iterable(pool.map(_expand_in_worker, chunks))
+                    count("bfs_parallel_levels")
+                else:
+                    candidates = expand_frontier(offsets, targets, frontier)
+                frontier = []
+                for v in candidates:
+                    if not seen[v]:
+                        seen[v] = 1
+                        frontier.append(v)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return levels
+
+    def multi_source_bfs(self, sources, **options):
+        """
+        Hop distance from the nearest of `sources` to every node, -1 where
+        unreachable. Accepts the parallel options of bfs_levels().
+        """
+        distances = array("q", [-1]) * self.num_nodes
+        for depth, frontier in enumerate(self.bfs_levels(sources, **options)):
+            for u in frontier:
+                distances[u] = depth
+        return distances
@@ -0,0 +1,112 @@
+import functools
+import hashlib
+import mmap
+import os
+
+from .instrumentation import count
+from .stage_executor import get_executor
+
+# Large enough that per-call overhead vanishes, small enough to stay in cache
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def hasher(hash_name="sha256"):
+    """
+    Returns a constructor for `hash_name` ("sha256", "blake2b", "blake2s" or
+    anything hashlib.new accepts).
+    """
+    constructor = getattr(hashlib, hash_name, None)
+    if constructor is None:
+        hashlib.new(hash_name)  # Raises ValueError for unknown algorithms
+        constructor = functools.partial(hashlib.new, hash_name)
+    return constructor
+
+
+def update_chunked(digest, data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Feeds a buffer (bytes, bytearray, mmap, memoryview) into `digest` in
+    zero-copy memoryview slices.
+    """
+    view = memoryview(data).cast("B")
+    for offset in range(0, len(view), chunk_size):
+        digest.update(view[offset:offset + chunk_size])
+    count("bytes_hashed", len(view))
+    return digest
+
+
+def hash_buffer(data, hash_name="sha256", chunk_size=DEFAULT_CHUNK_SIZE):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return update_chunked(hasher(hash_name)(), data, chunk_size).hexdigest()
+
+
+def hash_stream(stream, hash_name="sha256", chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Hashes a binary file object by reading into one reusable buffer, so
+    memory stays at `chunk_size` whatever the input size.
+    """
+    digest = hasher(hash_name)()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    total = 0
+    while True:
+        read = stream.readinto(buffer)
+        if not read:
+            break
+        digest.update(view[:read])
+        total += read
+    count("bytes_hashed", total)
+    return digest.hexdigest()
+
+
+def hash_file(path, hash_name="sha256", chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=False):
+    """
+    Hashes a file in fixed-size chunks. With `use_mmap` the file is mapped
+    and hashed straight from the page cache instead of through a buffer.
+    """
+    with open(path, "rb") as f:
+        if use_mmap and os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest = update_chunked(hasher(hash_name)(), mapped, chunk_size).hexdigest()
+        else:
+            digest = hash_stream(f, hash_name, chunk_size)
+    count("files_hashed")
+    return digest
+
+
+def hash_files(paths, hash_name="sha256", chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=False,
+               executor="thread", max_workers=None):
+    """
+    Hashes many files concurrently and returns {path: hexdigest} in input
+    order. hashlib releases the GIL on large updates, so threads suffice.
+    """
+    paths = list(paths)
+    if len(paths) < 2:
+        executor = "sequential"
+    pool = get_executor(executor, max_workers)
+    try:
+        return pool.run_all([(path, hash_file, (path, hash_name, chunk_size, use_mmap)) for path in paths])
+    finally:
+        pool.shutdown()
+
+
+def fingerprint_directory(path, hash_name="sha256", files=None, **options):
+    """
+    Fingerprints every file under `path` (or just `files`, relative to it):
+    returns {"hash", "root", "files"}, where "files" maps relative paths
+    (sorted, "/"-separated) to digests and "root" is the Merkle root over
+    (relative path, digest) leaves. Any added, removed, renamed or modified
+    file changes the root.
+    """
+    from .merkle import MerkleTree
+
+    if files is None:
+        files = []
+        for directory, _, names in os.walk(path):
+            files.extend(os.path.relpath(os.path.join(directory, name), path) for name in names)
+    relative = sorted(name.replace(os.sep, "/") for name in files)
+    digests = hash_files((os.path.join(path, name) for name in relative), hash_name, **options)
+    fingerprints = dict(zip(relative, digests.values()))
+    leaves = (f"{name}\0{digest}" for name, digest in fingerprints.items())
+    tree = MerkleTree(leaves, hash_name, executor="sequential")
+    return {"hash": hash_name, "root": tree.root, "files": fingerprints}
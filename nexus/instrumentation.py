@@ -0,0 +1,230 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+_profiler = contextvars.ContextVar("nexus_profiler", default=None)
+_span = contextvars.ContextVar("nexus_span", default=None)
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class Span:
+    """
+    One timed region: a pipeline stage, an iteration or a component call.
+    """
+    __slots__ = ("name", "category", "parent", "thread_id", "start", "wall", "cpu",
+                 "peak_rss_kb", "rss_growth_kb", "traced_delta_kb", "traced_peak_kb",
+                 "counters", "_peak_seen")
+
+    def __init__(self, name, category, parent):
+        self.name = name
+        self.category = category
+        self.parent = parent
+        self.thread_id = threading.get_ident()
+        self.start = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_rss_kb = None
+        self.rss_growth_kb = None
+        self.traced_delta_kb = None
+        self.traced_peak_kb = None
+        self.counters = {}
+        self._peak_seen = 0
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "category": self.category,
+            "parent": self.parent.name if self.parent else None,
+            "thread_id": self.thread_id,
+            "start_ms": self.start * 1000,
+            "wall_ms": self.wall * 1000,
+            "cpu_ms": self.cpu * 1000,
+            "peak_rss_kb": self.peak_rss_kb,
+            "rss_growth_kb": self.rss_growth_kb,
+            "tracemalloc_delta_kb": self.traced_delta_kb,
+            "tracemalloc_peak_kb": self.traced_peak_kb,
+            "counters": dict(self.counters),
+        }
+
+
+class PipelineProfiler:
+    """
+    Section 3.4: Pipeline Instrumentation
+    Records wall time, thread CPU time, peak RSS growth and (optionally)
+    tracemalloc deltas per span, plus named counters. Memory figures are
+    process-wide, so they are approximate for stages running concurrently.
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.spans = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    @contextmanager
+    def activate(self):
+        """
+        Makes this profiler the one instrumented code in this context reports to.
+        """
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        token = _profiler.set(self)
+        try:
+            yield self
+        finally:
+            _profiler.reset(token)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    @contextmanager
+    def span(self, name, category="component"):
+        parent = _span.get()
+        record = Span(name, category, parent)
+        token = _span.set(record)
+
+        traced = self.trace_memory and tracemalloc.is_tracing()
+        if traced:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent._peak_seen = max(parent._peak_seen, peak)
+            tracemalloc.reset_peak()
+            traced_start = current
+        rss_start = _peak_rss_kb()
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - wall_start
+            record.cpu = time.thread_time() - cpu_start
+            record.start = wall_start - self._origin
+            record.peak_rss_kb = _peak_rss_kb()
+            if rss_start is not None:
+                record.rss_growth_kb = record.peak_rss_kb - rss_start
+            if traced:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, record._peak_seen)
+                record.traced_delta_kb = (current - traced_start) / 1024
+                record.traced_peak_kb = max(0, peak - traced_start) / 1024
+                if parent is not None:
+                    parent._peak_seen = max(parent._peak_seen, peak)
+            _span.reset(token)
+            with self._lock:
+                self.spans.append(record)
+
+    def totals(self, category=None):
+        """
+        Sums counters over all spans (optionally of one category).
+        """
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for record in spans:
+            if category is None or record.category == category:
+                for key, value in record.counters.items():
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def to_dict(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return {
+            "spans": [s.to_dict() for s in spans],
+            "counters": self.totals(),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_chrome_trace(self):
+        """
+        Returns the spans in Chrome Trace Event format (chrome://tracing, Perfetto).
+        """
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        for record in spans:
+            args = {"cpu_ms": round(record.cpu * 1000, 3)}
+            args.update(record.counters)
+            if record.traced_peak_kb is not None:
+                args["tracemalloc_peak_kb"] = round(record.traced_peak_kb, 1)
+            if record.rss_growth_kb:
+                args["rss_growth_kb"] = record.rss_growth_kb
+            events.append({
+                "name": record.name,
+                "cat": record.category,
+                "ph": "X",
+                "ts": round(record.start * 1e6, 3),
+                "dur": round(record.wall * 1e6, 3),
+                "pid": pid,
+                "tid": record.thread_id,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def current_profiler():
+    return _profiler.get()
+
+
+@contextmanager
+def span(name, category="component"):
+    """
+    Times a region under the active profiler; does nothing without one.
+    """
+    profiler = _profiler.get()
+    if profiler is None:
+        yield None
+        return
+    with profiler.span(name, category) as record:
+        yield record
+
+
+def count(name, amount=1):
+    """
+    Adds to a counter on the innermost active span. Costs one context lookup
+    when profiling is off.
+    """
+    record = _span.get()
+    if record is not None:
+        record.counters[name] = record.counters.get(name, 0) + amount
+
+
+def instrumented(method):
+    """
+    Decorator for component process() methods: records a span named after
+    the method's qualified name whenever a profiler is active.
+    """
+    name = method.__qualname__
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        profiler = _profiler.get()
+        if profiler is None:
+            return method(*args, **kwargs)
+        with profiler.span(name):
+            return method(*args, **kwargs)
+    return wrapper
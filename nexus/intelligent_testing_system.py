@@ -1,10 +1,19 @@
+import threading
+from collections import OrderedDict
+
+from .hashing import hash_buffer
+from .instrumentation import instrumented, count
+from .log import get_logger
+
+log = get_logger(__name__)
+
 class TestDriverGenerator:
     """
     Section 4: Intelligent Testing System
     Generates C test drivers for property-based and coverage testing.
     """
     def generate_driver(self, code_info):
-        print("Test Driver Generator: Creating C test driver...")
+        log.info("Test Driver Generator: Creating C test driver...")
         driver_code = """
 #include <stdio.h>
 #include <assert.h>
@@ -30,7 +39,7 @@ class FuzzTargetGenerator:
     Generates fuzz targets for libFuzzer/AFL++.
     """
     def generate_fuzz_target(self, code_info):
-        print("Fuzz Target Generator: Creating libFuzzer target...")
+        log.info("Fuzz Target Generator: Creating libFuzzer target...")
         fuzz_code = """
 #include <stdint.h>
 #include <stddef.h>
@@ -50,7 +59,7 @@ class DeterministicSeedManager:
     Deterministic seeded tests for reproducibility.
     """
     def get_seed(self):
-        print("Seed Manager: Providing deterministic seed...")
+        log.info("Seed Manager: Providing deterministic seed...")
         return 0xDEADBEEF
 
 class MetamorphicTester:
@@ -59,7 +68,7 @@ class MetamorphicTester:
     Validates outputs satisfy algebraic properties.
     """
     def check_properties(self, inputs, outputs):
-        print("Metamorphic Testing: Validating algebraic properties...")
+        log.info("Metamorphic Testing: Validating algebraic properties...")
         # Simulated logic
         return {"status": "PASSED", "properties_verified": ["Consistency", "Invariance"]}
 
@@ -69,7 +78,7 @@ class MutationTester:
     Validates test suite quality by introducing artificial bugs.
     """
     def run_mutation_tests(self, code):
-        print("Mutation Testing: Injecting artificial bugs into synthesized code...")
+        log.info("Mutation Testing: Injecting artificial bugs into synthesized code...")
         return {"mutation_score": "98%", "mutants_killed": 145, "mutants_survived": 3}
 
 class PropertyBasedTester:
@@ -77,7 +86,7 @@ class PropertyBasedTester:
         """
         Integrates Hypothesis to generate edge-case test vectors.
         """
-        print("Property-Based Testing: Running Hypothesis framework...")
+        log.info("Property-Based Testing: Running Hypothesis framework...")
         return {"edge_cases_covered": 5000, "status": "Generated"}
 
 class CoverageDrivenTester:
@@ -85,11 +94,11 @@ class CoverageDrivenTester:
         """
         Ensures 100% branch coverage and runs mutation testing.
         """
-        print("Coverage-Driven Testing: Running mutation tests and Valgrind...")
+        log.info("Coverage-Driven Testing: Running mutation tests and Valgrind...")
         return {"branch_coverage": "100%", "memory_leaks": "None"}
 
 class IntelligentTestingSystem:
-    def __init__(self):
+    def __init__(self, cache_size=1024):
         self.property_tester = PropertyBasedTester()
         self.coverage_tester = CoverageDrivenTester()
         self.driver_generator = TestDriverGenerator()
@@ -97,16 +106,64 @@ class IntelligentTestingSystem:
         self.metamorphic_tester = MetamorphicTester()
         self.mutation_tester = MutationTester()
         self.seed_manager = DeterministicSeedManager()
+        # Results keyed by fragment digest: unchanged fragments are not re-tested
+        self.cache_size = cache_size
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
 
-    def process(self, code_info):
-        print("Starting Intelligent Testing System...")
+    def test_fragment(self, code):
+        key = hash_buffer(code)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        count("fragments_tested")
+        result = (self.property_tester.generate_tests(code), self.coverage_tester.run_tests(code))
+
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        return result
+
+    def test_fragments(self, code_info):
+        """
+        Section 3.3: Runs the property and coverage tests for each synthesized
+        fragment and aggregates them, recording which fragments leak memory.
+        Mutation testing scores the whole unit once.
+        """
         code = code_info.get("code", "")
+        fragments = code_info.get("fragments") or [{"name": None, "code": code}]
+
+        edge_cases = 0
+        coverage = []
+        failing = []
+        for fragment in fragments:
+            properties, coverage_result = self.test_fragment(fragment["code"])
+            edge_cases += properties["edge_cases_covered"]
+            coverage.append(int(coverage_result["branch_coverage"].rstrip("%")))
+            if coverage_result["memory_leaks"] != "None" and fragment["name"] is not None:
+                failing.append(fragment["name"])
+
         return {
-            "property_tests": self.property_tester.generate_tests(code),
-            "coverage_results": self.coverage_tester.run_tests(code),
+            "property_tests": {"edge_cases_covered": edge_cases, "status": "Generated"},
+            "coverage_results": {
+                "branch_coverage": f"{min(coverage)}%",
+                "memory_leaks": f"Detected in {', '.join(failing)}" if failing else "None"
+            },
+            "mutation_testing": self.mutation_tester.run_mutation_tests(code),
+            "failing_fragments": failing
+        }
+
+    @instrumented
+    def process(self, code_info):
+        log.info("Starting Intelligent Testing System...")
+        results = self.test_fragments(code_info)
+        results.update({
             "test_driver": self.driver_generator.generate_driver(code_info),
             "fuzz_target": self.fuzz_generator.generate_fuzz_target(code_info),
             "metamorphic_results": self.metamorphic_tester.check_properties(None, None),
-            "mutation_testing": self.mutation_tester.run_mutation_tests(code),
             "reproducibility_seed": self.seed_manager.get_seed()
-        }
+        })
+        return results
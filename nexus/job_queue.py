@@ -0,0 +1,195 @@
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from .pipeline_events import TERMINAL_EVENTS
+from .workers import WorkerPool
+
+
+class QueueFull(Exception):
+    """
+    Raised when the job queue is at capacity; callers should retry later.
+    """
+
+
+class Job:
+    def __init__(self, job_id, base_path):
+        self.job_id = job_id
+        self.base_path = base_path
+        self.state = "queued"
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.outcome = None
+        self.future = None
+        self.events = []
+        self.events_closed = False
+        self._events_cond = threading.Condition()
+
+    @property
+    def status(self):
+        if self.state == "queued" and self.future is not None and self.future.running():
+            return "running"
+        return self.state
+
+    @property
+    def done(self):
+        return self.state in ("succeeded", "failed")
+
+    def add_event(self, event):
+        with self._events_cond:
+            if self.events_closed:
+                return
+            self.events.append(event)
+            if event.get("event") in TERMINAL_EVENTS:
+                self.events_closed = True
+            self._events_cond.notify_all()
+
+    def close_events(self, event=None):
+        with self._events_cond:
+            if not self.events_closed and event is not None:
+                self.events.append(event)
+            self.events_closed = True
+            self._events_cond.notify_all()
+
+    def iter_events(self, timeout=None):
+        """
+        Yields the job's progress events from the first one on, blocking for
+        new ones until a terminal event. If `timeout` seconds pass without an
+        event, None is yielded so callers can send keep-alives.
+        """
+        index = 0
+        while True:
+            with self._events_cond:
+                if index >= len(self.events) and not self.events_closed:
+                    self._events_cond.wait(timeout)
+                pending = self.events[index:]
+                closed = self.events_closed
+            index += len(pending)
+            for event in pending:
+                yield event
+            if closed and index >= len(self.events):
+                return
+            if not pending:
+                yield None
+
+    def to_dict(self):
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+        }
+        if self.outcome is not None:
+            data["elapsed_s"] = self.outcome.get("elapsed_s")
+            if self.state == "failed":
+                data["error"] = self.outcome.get("error")
+        return data
+
+
+class JobQueue:
+    """
+    Section 3.5: Job Queue
+    Bounded, asynchronous front end to a WorkerPool. At most `workers` jobs
+    run at once and at most `max_pending` more wait; beyond that submit()
+    raises QueueFull. Finished jobs are kept (up to `max_finished`) so their
+    status and result can be fetched by id. Progress events from the workers
+    are collected per job and can be followed with Job.iter_events().
+    """
+    def __init__(self, workers=None, max_pending=32, mode="process", cache_dir=None,
+                 max_iterations=3, max_finished=1000):
+        self.pool = WorkerPool(workers=workers, mode=mode, cache_dir=cache_dir)
+        self.capacity = self.pool.workers + max_pending
+        self.max_iterations = max_iterations
+        self.max_finished = max_finished
+        self._jobs = OrderedDict()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._pump = None
+
+    def submit(self, specification, base_path, job_id=None):
+        job = Job(job_id or str(uuid.uuid4()), base_path)
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise QueueFull(f"Job queue is full ({self.capacity} jobs in flight)")
+            self._in_flight += 1
+            self._jobs[job.job_id] = job
+            self._start_pump()
+        try:
+            job.future = self.pool.submit(specification, base_path, self.max_iterations, job_id=job.job_id)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+                del self._jobs[job.job_id]
+            raise
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def _start_pump(self):
+        # The event channel is created with the pool, on first use, so that
+        # importing the web app does not start a multiprocessing manager
+        if self._pump is not None:
+            return
+        if self.pool.mode == "process":
+            import multiprocessing
+            self.pool.events = multiprocessing.Queue()
+        else:
+            self.pool.events = queue.Queue()
+        self._pump = threading.Thread(target=self._pump_events, args=(self.pool.events,),
+                                      name="nexus-job-events", daemon=True)
+        self._pump.start()
+
+    def _pump_events(self, events):
+        while True:
+            item = events.get()
+            if item is None:
+                return
+            job_id, event = item
+            job = self.get(job_id)
+            if job is not None:
+                job.add_event(event)
+
+    def _finish(self, job, future):
+        try:
+            outcome = future.result()
+        except Exception as e:  # The worker itself died
+            outcome = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        job.outcome = outcome
+        job.finished_at = time.time()
+        job.state = "succeeded" if outcome.get("status") == "success" else "failed"
+        if outcome.get("status") != "success" and "error" in outcome:
+            # Covers crashes that never reached the pipeline's own failure event
+            job.close_events({"event": "pipeline_failed", "error": outcome["error"], "timestamp": job.finished_at})
+        with self._lock:
+            self._in_flight -= 1
+            self._evict_finished()
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def result(self, job_id):
+        """
+        Returns the pipeline result of a succeeded job, otherwise None.
+        """
+        job = self.get(job_id)
+        if job is None or job.state != "succeeded":
+            return None
+        return job.outcome.get("result")
+
+    def stats(self):
+        with self._lock:
+            return {"in_flight": self._in_flight, "capacity": self.capacity, "tracked": len(self._jobs)}
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait)
+        if self._pump is not None:
+            self.pool.events.put(None)
+            self._pump.join(timeout=5)
+            self._pump = None
@@ -0,0 +1,141 @@
+import contextlib
+import contextvars
+import json
+import logging
+import sys
+
+ROOT = "nexus"
+
+# Pipeline position of the code that is logging; copied into every record
+_stage = contextvars.ContextVar("nexus_log_stage", default=None)
+_iteration = contextvars.ContextVar("nexus_log_iteration", default=None)
+
+# Library default: silent until the application configures a handler
+logging.getLogger(ROOT).addHandler(logging.NullHandler())
+
+
+def get_logger(name):
+    """
+    Returns the logger for a nexus module. Calls below the configured level
+    return after a cached level check, before any formatting happens, so pass
+    values as arguments ("%s") rather than pre-formatted strings.
+    """
+    if name != ROOT and not name.startswith(ROOT + "."):
+        name = f"{ROOT}.{name}"
+    return logging.getLogger(name)
+
+
+@contextlib.contextmanager
+def stage(name):
+    token = _stage.set(name)
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+
+
+@contextlib.contextmanager
+def iteration(number):
+    token = _iteration.set(number)
+    try:
+        yield
+    finally:
+        _iteration.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Stamps each record with the pipeline stage and iteration it came from.
+    """
+    def filter(self, record):
+        record.stage = _stage.get()
+        record.iteration = _iteration.get()
+        return True
+
+
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "stage", "iteration"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, stage, iteration
+    and any `extra=` fields.
+    """
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+            "stage": getattr(record, "stage", None),
+            "iteration": getattr(record, "iteration", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Progress messages as plain lines, as the CLI has always shown them;
+    warnings and errors carry their level.
+    """
+    def format(self, record):
+        message = super().format(record)
+        if record.levelno >= logging.WARNING:
+            return f"{record.levelname}: {message}"
+        return message
+
+
+def configure(level="info", json_output=False, stream=None):
+    """
+    Installs a single handler on the nexus logger. Calling it again replaces
+    the previous configuration.
+    """
+    reset()
+    logger = logging.getLogger(ROOT)
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler._nexus_handler = True
+    handler.addFilter(ContextFilter())
+    handler.setFormatter(JSONFormatter() if json_output else TextFormatter())
+    logger.addHandler(handler)
+    set_level(level)
+    logger.propagate = False
+    return logger
+
+
+def reset():
+    """
+    Removes the handler installed by configure(), returning to the silent
+    library default.
+    """
+    logger = logging.getLogger(ROOT)
+    for handler in list(logger.handlers):
+        if getattr(handler, "_nexus_handler", False):
+            logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+def set_level(level):
+    if isinstance(level, str):
+        level = getattr(logging, level.upper())
+    logging.getLogger(ROOT).setLevel(level)
+
+
+@contextlib.contextmanager
+def quiet(level=logging.WARNING):
+    """
+    Temporarily raises the nexus log level, e.g. around bulk work.
+    """
+    logger = logging.getLogger(ROOT)
+    previous = logger.level
+    logger.setLevel(max(level, logger.getEffectiveLevel()))
+    try:
+        yield
+    finally:
+        logger.setLevel(previous)
@@ -1,36 +1,126 @@
+import re
+
+from .synthesis.templates import TemplateLibrary
+from .instrumentation import instrumented
+from .feature_index import FeatureIndex
+from .log import get_logger
+
+log = get_logger(__name__)
+
+# "64-byte", "48 bytes", "2 KB", "1.5KiB", "512B"
+OBJECT_SIZE = re.compile(r"\b(\d+(?:\.\d+)?)\s*-?\s*(bytes?|b|kib|kb|kilobytes?|mib|mb|megabytes?)\b", re.I)
+SIZE_UNITS = {"b": 1, "k": 1024, "m": 1024 * 1024}
+
+# Largest size class of the SLAB_ALLOCATOR template (SLAB_MAX_SIZE)
+SLAB_MAX_SIZE = 4096
+
+# First match wins: an explicit "long-lived" outranks the "small objects"
+# that only suggest a short lifetime
+LIFETIME_HINTS = (
+    ("grouped", ("batch processing", "lifetime grouped", "per-request", "per request", "freed together")),
+    ("long", ("long-lived", "long lived")),
+    ("short", ("short-lived", "short lived", "frequent allocation", "many small objects", "small objects")),
+)
+
+# Analysis entries holding specification text: the engine's requirements,
+# their atomic parts and constraints, or "requirements" in hand-built dicts
+ANALYSIS_FIELDS = ("requirements", "req", "atomic_reqs", "constraints")
+
+# Allocator templates integrated into main.c. CONSERVATIVE_GC is left out:
+# it needs libgc, which the generated Makefile does not link.
+STRATEGY_TEMPLATES = {
+    "Object Pool": "OBJECT_POOL",
+    "Slab Allocator": "SLAB_ALLOCATOR",
+    "Arena Allocator": "ARENA_ALLOCATOR",
+}
+
+
+def object_size_hints(texts):
+    """
+    Object sizes in bytes mentioned in `texts`, sorted and without duplicates.
+    """
+    sizes = set()
+    for text in texts:
+        for number, unit in OBJECT_SIZE.findall(text):
+            sizes.add(int(float(number) * SIZE_UNITS[unit[0].lower()]))
+    return sorted(sizes)
+
+
 class MemoryManagementOptimizer:
     """
     Section 7: Memory Management Optimizer
     """
+    def __init__(self):
+        self.templates = TemplateLibrary()
+
+    def allocation_hints(self, analysis_results, features, fields):
+        """
+        Object sizes and the dominant object lifetime ("grouped", "short",
+        "long" or None) stated in `fields`.
+        """
+        texts = []
+        for name in fields:
+            value = analysis_results.get(name) or ()
+            texts.extend([value] if isinstance(value, str) else value)
+        lifetime = next((kind for kind, keywords in LIFETIME_HINTS if features.has(*keywords, fields=fields)), None)
+        return {
+            "object_sizes": object_size_hints(texts),
+            "lifetime": lifetime,
+            "mixed_sizes": features.has("mixed sizes", "variable size", "variable-size", fields=fields),
+            "threaded": features.has("thread", "concurrent", fields=fields),
+        }
+
     def select_strategy(self, analysis_results):
-        requirements = analysis_results.get("requirements", [])
-        constraints = analysis_results.get("constraints", [])
+        features = FeatureIndex.of(analysis_results)
+        fields = ANALYSIS_FIELDS
+        hints = self.allocation_hints(analysis_results, features, fields)
+        sizes = hints["object_sizes"]
 
         strategy = {
             "allocation": "Standard malloc/free",
             "optimizations": [],
-            "leak_prevention": "RAII-like ownership tracking"
+            "leak_prevention": "RAII-like ownership tracking",
+            "hints": hints,
         }
 
-        all_text = " ".join(requirements + constraints).lower()
-
-        if "frequent allocation" in all_text or "many small objects" in all_text:
-            strategy["allocation"] = "Object Pool"
-            strategy["optimizations"].append("Pre-allocated object buckets")
+        # Section 7.1: Many short-lived small objects. One known size and a
+        # single thread suit a pool; several sizes or threads need size
+        # classes with per-thread caches.
+        small = not sizes or sizes[-1] <= SLAB_MAX_SIZE
+        if hints["lifetime"] == "short" and small:
+            if len(sizes) > 1 or hints["mixed_sizes"] or hints["threaded"]:
+                strategy["allocation"] = "Slab Allocator"
+                strategy["optimizations"].append("Size-class slabs with lock-free per-thread caches")
+                strategy["optimizations"].append("16-byte alignment, power-of-two classes aligned to their size")
+            else:
+                strategy["allocation"] = "Object Pool"
+                strategy["optimizations"].append("Pre-allocated object buckets")
+        elif hints["lifetime"] == "long":
+            # Pools and slabs only pay off with churn; long-lived objects
+            # would hold their pages for the life of the program
+            strategy["optimizations"].append("Long-lived objects left to malloc (no pool or slab churn to amortize)")
+        if sizes and not small:
+            strategy["optimizations"].append("Large objects left to malloc (mmap-backed)")
 
-        if "batch processing" in all_text or "lifetime grouped" in all_text:
+        if features.has("batch processing", "lifetime grouped", "per-request", "per request", "freed together",
+                        fields=fields):
             strategy["allocation"] = "Arena Allocator"
             strategy["optimizations"].append("O(1) allocation/deallocation")
 
         # Section 7.1: Conservative GC for complex ownership
-        if "complex ownership" in all_text or "graph" in all_text or "garbage collect" in all_text:
+        # A bare "graph" usually means graph algorithms, not object ownership
+        if features.has("complex ownership", "ownership graph", "object graph", "cyclic references",
+                        "reference cycles", "garbage collect", fields=fields):
             strategy["allocation"] = "Conservative GC"
             strategy["optimizations"].append("Automatic reachability analysis")
             strategy["leak_prevention"] = "Boehm GC-style cleanup"
 
+        template = STRATEGY_TEMPLATES.get(strategy["allocation"])
+        strategy["templates"] = {template: self.templates.get_template(template)} if template else {}
         return strategy
 
+    @instrumented
     def process(self, analysis_results):
-        print("Memory Management Optimizer: Optimizing allocation strategies...")
+        log.info("Memory Management Optimizer: Optimizing allocation strategies...")
         strategy = self.select_strategy(analysis_results)
         return strategy
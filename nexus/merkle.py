@@ -0,0 +1,216 @@
+import os
+from collections import namedtuple
+
+from .hashing import hasher
+from .instrumentation import count
+from .stage_executor import get_executor
+
+# RFC 6962 domain separation: a leaf can never be passed off as an inner node
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def _as_bytes(block):
+    if isinstance(block, str):
+        return block.encode("utf-8")
+    return bytes(block)
+
+
+def hash_leaves(blocks, hash_name="sha256"):
+    """
+    Returns the concatenated leaf digests of `blocks` (bytes or str).
+    """
+    new = hasher(hash_name)
+    return b"".join(new(LEAF_PREFIX + _as_bytes(block)).digest() for block in blocks)
+
+
+def hash_level(children, digest_size, hash_name="sha256"):
+    """
+    Returns the parent level of `children`, a buffer of concatenated
+    digests. A trailing unpaired child is promoted unchanged.
+    """
+    new = hasher(hash_name)
+    children = bytes(children)
+    pair = 2 * digest_size
+    parents = [
+        new(NODE_PREFIX + children[offset:offset + pair]).digest()
+        for offset in range(0, len(children) - digest_size, pair)
+    ]
+    if (len(children) // digest_size) % 2:
+        parents.append(children[-digest_size:])
+    return b"".join(parents)
+
+
+class MerkleProof(namedtuple("MerkleProof", "index leaf_count siblings")):
+    """
+    Inclusion proof for leaf `index` of a tree of `leaf_count` leaves:
+    sibling digests from the leaf level up. Which side each sibling sits on
+    follows from the index and leaf count, so it cannot be forged separately.
+    """
+    __slots__ = ()
+
+
+def verify_proof(block, proof, root, hash_name="sha256"):
+    """
+    Checks that `block` is leaf `proof.index` of the tree with digest `root`.
+    """
+    new = hasher(hash_name)
+    index, width = proof.index, proof.leaf_count
+    if not 0 <= index < width:
+        return False
+    digest = new(LEAF_PREFIX + _as_bytes(block)).digest()
+    siblings = iter(proof.siblings)
+    while width > 1:
+        if index % 2:
+            digest = new(NODE_PREFIX + next(siblings, b"") + digest).digest()
+        elif index + 1 < width:
+            digest = new(NODE_PREFIX + digest + next(siblings, b"")).digest()
+        index, width = index // 2, (width + 1) // 2
+    return digest == root and next(siblings, None) is None
+
+
+class MerkleTree:
+    """
+    Section 9.1: Merkle Tree Implementation
+    Binary hash tree over byte blocks with RFC 6962 leaf/node prefixes. Each
+    level is one contiguous bytearray of digests; an unpaired last node is
+    promoted to the next level. Updates and appends rehash only the path to
+    the root. Leaf hashing of large inputs is spread over a process pool.
+    """
+    def __init__(self, data_blocks=(), hash_name="sha256", parallel_threshold=1 << 16,
+                 max_workers=None, executor="process"):
+        self.hash_name = hash_name
+        self._new = hasher(hash_name)
+        self.digest_size = self._new().digest_size
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers
+        self.executor = executor
+        self.levels = [bytearray()]
+        self.extend(data_blocks)
+
+    def __len__(self):
+        return len(self.levels[0]) // self.digest_size
+
+    def _node(self, level, index):
+        size = self.digest_size
+        return bytes(self.levels[level][index * size:(index + 1) * size])
+
+    def leaf(self, index):
+        return self._node(0, index)
+
+    @property
+    def leaves(self):
+        return [self._node(0, i).hex() for i in range(len(self))]
+
+    @property
+    def root_digest(self):
+        if not len(self):
+            return self._new().digest()
+        return bytes(self.levels[-1])
+
+    @property
+    def root(self):
+        return self.root_digest.hex()
+
+    def _parallel(self, items):
+        return self.executor != "sequential" and items >= self.parallel_threshold
+
+    def _chunk(self, items):
+        # About four tasks per worker evens out scheduling jitter
+        workers = self.max_workers or os.cpu_count() or 1
+        return -(-items // (workers * 4))
+
+    def extend(self, blocks):
+        blocks = list(blocks)
+        if not blocks:
+            return
+        first = len(self)
+        # One pool serves the leaf level and every parallel level above it
+        executor = get_executor(self.executor, self.max_workers) if self._parallel(len(blocks)) else None
+        try:
+            if executor is not None:
+                step = self._chunk(len(blocks))
+                results = executor.run_all([
+                    (i, hash_leaves, (blocks[i:i + step], self.hash_name)) for i in range(0, len(blocks), step)
+                ])
+                digests = b"".join(results.values())
+            else:
+                digests = hash_leaves(blocks, self.hash_name)
+            self.levels[0] += digests
+            count("merkle_leaves_hashed", len(blocks))
+            self._rebuild_from(first, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _rebuild_from(self, first, executor=None):
+        """
+        Recomputes every node that depends on leaves `first` onward.
+        """
+        size = self.digest_size
+        level = 0
+        while len(self.levels[level]) > size:
+            # Start at the pair containing the first changed node
+            start = (first // 2) * 2
+            children = self.levels[level]
+            pairs = (len(children) // size - start + 1) // 2
+            if executor is not None and self._parallel(pairs):
+                step = 2 * self._chunk(pairs)
+                results = executor.run_all([
+                    (offset, hash_level, (bytes(children[offset * size:(offset + step) * size]), size, self.hash_name))
+                    for offset in range(start, len(children) // size, step)
+                ])
+                parents = b"".join(results.values())
+            else:
+                parents = hash_level(memoryview(children)[start * size:], size, self.hash_name)
+            if level + 1 == len(self.levels):
+                self.levels.append(bytearray())
+            parent_level = self.levels[level + 1]
+            del parent_level[(start // 2) * size:]
+            parent_level += parents
+            first, level = start // 2, level + 1
+
+    def _rehash_path(self, index):
+        size = self.digest_size
+        for level in range(len(self.levels) - 1):
+            children = self.levels[level]
+            width = len(children) // size
+            left = index - index % 2
+            if left + 1 < width:
+                parent = self._new(NODE_PREFIX + children[left * size:(left + 2) * size]).digest()
+            else:
+                parent = bytes(children[left * size:(left + 1) * size])
+            index //= 2
+            self.levels[level + 1][index * size:(index + 1) * size] = parent
+
+    def update(self, index, block):
+        """
+        Replaces leaf `index` and rehashes its path to the root: O(log n).
+        """
+        if not 0 <= index < len(self):
+            raise IndexError("Merkle leaf index out of range")
+        size = self.digest_size
+        self.levels[0][index * size:(index + 1) * size] = self._new(LEAF_PREFIX + _as_bytes(block)).digest()
+        self._rehash_path(index)
+
+    def append(self, block):
+        """
+        Adds one leaf; only the nodes on its path are (re)computed: O(log n).
+        """
+        self.levels[0] += self._new(LEAF_PREFIX + _as_bytes(block)).digest()
+        self._rebuild_from(len(self) - 1)
+
+    def proof(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError("Merkle leaf index out of range")
+        siblings = []
+        position, width = index, len(self)
+        for level in range(len(self.levels) - 1):
+            sibling = position ^ 1
+            if sibling < width:
+                siblings.append(self._node(level, sibling))
+            position, width = position // 2, (width + 1) // 2
+        return MerkleProof(index, len(self), tuple(siblings))
+
+    def verify(self, block, proof):
+        return verify_proof(block, proof, self.root_digest, self.hash_name)
@@ -1,45 +1,60 @@
+import contextlib
+import functools
 import re
 import os
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    fitz = None
+from .instrumentation import instrumented, count
+from .pdf_extraction import PDFExtractor, load_fitz
+from .feature_index import FeatureIndex, default_matcher
+from .spec_tokenizer import SpecTokenizer, Requirement, classify
+from .log import get_logger, quiet, set_level
+
+log = get_logger(__name__)
+
+# Splits a requirement into atomic units at conjunctions and sentence ends
+UNIT_SEPARATOR = re.compile(r' and |\. ')
 
 class SpecificationParser:
+    def __init__(self):
+        self.pdf_extractor = PDFExtractor()
+        self.tokenizer = SpecTokenizer()
+
     def parse(self, specification):
         """
         Extracts requirements from assignment specifications.
         Supports text and PDF intelligence.
         """
-        print("Parsing specification using Neural Engine...")
+        return [record.text for record in self.tokenize(specification)]
+
+    def tokenize(self, specification):
+        """
+        Yields Requirement records with source offsets. Text files are
+        streamed from disk rather than read whole.
+        """
+        log.info("Parsing specification using Neural Engine...")
 
         # Section 1.1: PDF/Document Intelligence
         if isinstance(specification, str) and (specification.endswith('.pdf') or os.path.exists(specification)):
-            if specification.endswith('.pdf') and fitz:
-                print(f"Extracting text from PDF: {specification}")
+            fitz = load_fitz() if specification.endswith('.pdf') else None
+            if fitz:
+                log.info("Extracting text from PDF: %s", specification)
                 try:
-                    doc = fitz.open(specification)
-                    text = ""
-                    for page in doc:
-                        text += page.get_text()
-                    specification = text
+                    specification = self.pdf_extractor.extract(specification)
                 except Exception as e:
-                    print(f"PDF Error: {e}")
+                    log.warning("PDF Error: %s", e)
             elif os.path.exists(specification) and not specification.endswith('.pdf'):
                 # Read as text file
-                with open(specification, 'r') as f:
-                    specification = f.read()
-        Supports text and placeholder for PDF intelligence.
-        """
-        print("Parsing specification using Neural Engine...")
-        # Placeholder for PDF OCR/Intelligence
-        if specification.endswith('.pdf'):
-            print("Extracting text from PDF...")
-            specification = "EXTRACTED_TEXT_FROM_PDF"
+                return self._records(specification, from_file=True)
+
+        return self._records(specification)
 
-        requirements = re.findall(r'REQ: (.*?)(?=REQ:|$)', specification, re.DOTALL)
-        return [req.strip() for req in requirements]
+    def _records(self, source, from_file=False):
+        tokenized = 0
+        with (open(source, 'r') if from_file else contextlib.nullcontext(source)) as source:
+            for record in self.tokenizer.tokenize(source):
+                tokenized += 1
+                yield record
+        count("requirements_tokenized", tokenized)
 
 class RequirementDecomposer:
     """
@@ -47,12 +62,13 @@ class RequirementDecomposer:
     Breaks down complex specs into atomic requirements (REQ).
     """
     def decompose(self, requirements):
-        print("Decomposing requirements into atomic units...")
+        log.info("Decomposing requirements into atomic units...")
         atomic_reqs = []
         for req in requirements:
             # Split by conjunctions or periods to find atomic units
-            units = re.split(r' and |\. ', req)
+            units = UNIT_SEPARATOR.split(req)
             atomic_reqs.extend([u.strip() for u in units if u.strip()])
+        count("atomic_requirements", len(atomic_reqs))
         return atomic_reqs
 
 class TestCaseInferrer:
@@ -61,44 +77,68 @@ class TestCaseInferrer:
     Generates property-based test specifications from natural language descriptions.
     """
     def infer_test_specs(self, atomic_reqs):
-        print("Inferring test specifications from requirements...")
+        log.info("Inferring test specifications from requirements...")
         test_specs = []
+        matcher = default_matcher()
         for req in atomic_reqs:
-            if "fast" in req.lower() or "performance" in req.lower():
+            found = matcher.scan(req)
+            if "fast" in found or "performance" in found:
                 test_specs.append(f"Property: Execution time < threshold for {req}")
-            if "memory" in req.lower():
+            if "memory" in found:
                 test_specs.append(f"Property: Memory usage < limit for {req}")
-            if "concurrent" in req.lower() or "thread" in req.lower():
+            if "concurrent" in found or "thread" in found:
                 test_specs.append(f"Property: Thread safety and linearizability for {req}")
         return test_specs
 
 class SemanticAnalyzer:
+    CONSTRAINT_KEYWORDS = frozenset(["memory", "performance", "limit", "restriction", "fast", "concurrent", "thread"])
+
     def analyze(self, requirements):
         """
         Breaks down requirements into atomic REQs, ASMs, and dependencies.
+        Accepts Requirement records (whose source spans are kept under
+        "spans") or plain strings.
         """
-        print("Analyzing requirements semantics...")
+        log.info("Analyzing requirements semantics...")
         analysis = {
             "req": [],
             "asm": [],
             "dep": [],
-            "constraints": []
+            "constraints": [],
+            "spans": {"req": [], "asm": [], "dep": []}
         }
+        matcher = default_matcher()
         for req in requirements:
-            lower_req = req.lower()
-            if "assume" in lower_req:
-                analysis["asm"].append(req)
-            elif "depends on" in lower_req:
-                analysis["dep"].append(req)
+            if isinstance(req, Requirement):
+                record = req
             else:
-                analysis["req"].append(req)
+                found = matcher.scan(req)
+                record = Requirement(classify(found), req, None, None, found)
+            req, found = record.text, record.keywords
+            kind = record.kind.lower()
+            analysis[kind].append(req)
+            analysis["spans"][kind].append(None if record.start is None else [record.start, record.end])
 
             # Constraint extraction
-            constraint_keywords = ["memory", "performance", "limit", "restriction", "fast", "concurrent", "thread"]
-            if any(word in lower_req for word in constraint_keywords):
+            if found & self.CONSTRAINT_KEYWORDS:
                 analysis["constraints"].append(req)
         return analysis
 
+# The engine owned by a process_many worker process
+_worker_engine = None
+
+
+def _init_analysis_worker():
+    global _worker_engine
+    # Per-specification progress lines from thousands of jobs are just noise
+    set_level("warning")
+    _worker_engine = MultiStageAnalysisEngine()
+
+
+def _analyze_in_worker(specification, return_exceptions=False):
+    return _worker_engine.analyze(specification, return_exceptions)
+
+
 class MultiStageAnalysisEngine:
     def __init__(self):
         self.parser = SpecificationParser()
@@ -106,9 +146,10 @@ class MultiStageAnalysisEngine:
         self.decomposer = RequirementDecomposer()
         self.test_inferrer = TestCaseInferrer()
 
+    @instrumented
     def process(self, specification):
-        print("Starting Multi-Stage Analysis...")
-        requirements = self.parser.parse(specification)
+        log.info("Starting Multi-Stage Analysis...")
+        requirements = self.parser.tokenize(specification)
         analysis_results = self.analyzer.analyze(requirements)
 
         # Section 1.1 Enhancements
@@ -118,4 +159,39 @@ class MultiStageAnalysisEngine:
         analysis_results["atomic_reqs"] = atomic_reqs
         analysis_results["test_specs"] = test_specs
 
+        # Single keyword scan shared by every domain planner
+        analysis_results["features"] = FeatureIndex.build(analysis_results)
+
         return analysis_results
+
+    def analyze(self, specification, return_exceptions=False):
+        try:
+            return self.process(specification)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            return e
+
+    @instrumented
+    def process_many(self, specifications, workers=None, chunksize=None, return_exceptions=False):
+        """
+        Analyzes many specifications on a process pool and returns their
+        results in input order. Each worker builds one engine and logs only
+        warnings; specifications are sent in chunks to amortize the round
+        trips. With return_exceptions, a failing specification yields its
+        exception instead of aborting the batch.
+        """
+        specifications = list(specifications)
+        workers = min(workers or os.cpu_count() or 1, max(1, len(specifications)))
+        if workers == 1:
+            with quiet():
+                results = [self.analyze(spec, return_exceptions) for spec in specifications]
+        else:
+            # About four chunks per worker balances load against pickling overhead
+            chunksize = chunksize or max(1, -(-len(specifications) // (workers * 4)))
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_analysis_worker) as pool:
+                task = functools.partial(_analyze_in_worker, return_exceptions=return_exceptions)
+                results = list(pool.map(task, specifications, chunksize=chunksize))
+        count("specifications_analyzed", len(results))
+        return results
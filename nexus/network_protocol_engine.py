@@ -1,3 +1,8 @@
+from .instrumentation import instrumented
+from .log import get_logger
+
+log = get_logger(__name__)
+
 class PacketDSL:
     """
     Section 8.1: Packet Structure DSL
@@ -88,8 +93,9 @@ class ProtocolFSMGenerator:
         return "\n".join(lines)
 
 class NetworkProtocolEngine:
+    @instrumented
     def process(self, analysis_results):
-        print("Network Protocol Engine: Synthesizing protocol state machines and packet logic...")
+        log.info("Network Protocol Engine: Synthesizing protocol state machines and packet logic...")
         # Example use of DSL for a simple protocol
         dsl = PacketDSL()
         dsl.add_field("version", "uint8")
@@ -1,99 +1,246 @@
-from .multi_stage_analysis_engine import MultiStageAnalysisEngine
-from .formal_verification_core import FormalVerificationCore
-from .code_synthesis_framework import CodeSynthesisFramework
-from .intelligent_testing_system import IntelligentTestingSystem
-from .advanced_data_structure_synthesis import AdvancedDataStructureSynthesis
-from .concurrency_ipc_synthesizer import ConcurrencyIPCSynthesizer
-from .memory_management_optimizer import MemoryManagementOptimizer
-from .network_protocol_engine import NetworkProtocolEngine
-from .algorithm_library import AlgorithmLibrary
-from .compilation_build_system import CompilationBuildSystem
-from .compliance_checker import ComplianceChecker
-from .output_guarantees import OutputGuarantees
+import importlib
+import os
+import threading
+
+from .stage_executor import get_executor, SequentialExecutor, ThreadPoolStageExecutor
+from .pipeline_dag import Stage, StageGraph, DAGScheduler
+from .stage_cache import StageCache
+from .hashing import hash_file
+from .instrumentation import PipelineProfiler, span
+from .pipeline_events import PipelineEvents, stream_events
+from .log import get_logger, iteration as log_iteration
+
+log = get_logger(__name__)
+
+
+def specification_key(specification):
+    """
+    Identifies a specification by content, so a re-uploaded file with the same
+    bytes hits the stage cache whatever its path.
+    """
+    if isinstance(specification, str) and os.path.isfile(specification):
+        return ["file", os.path.splitext(specification)[1].lower(), hash_file(specification)]
+    return ["text", specification]
+
+
+class LazyComponent:
+    """
+    Imports and builds a pipeline subsystem on first attribute access, so
+    constructing an orchestrator (or importing this module) stays cheap.
+    The instance is cached in the owner's __dict__ and can be replaced freely.
+    """
+    _lock = threading.Lock()
+
+    def __init__(self, module, class_name):
+        self.module = module
+        self.class_name = class_name
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        with self._lock:
+            if self.name not in instance.__dict__:
+                module = importlib.import_module(self.module, __package__)
+                instance.__dict__[self.name] = getattr(module, self.class_name)()
+            return instance.__dict__[self.name]
 
-class NexusOrchestrator:
-    def __init__(self):
-        self.analysis_engine = MultiStageAnalysisEngine()
-        self.verification_core = FormalVerificationCore()
-        self.synthesis_framework = CodeSynthesisFramework()
-        self.testing_system = IntelligentTestingSystem()
-        self.data_structure_synthesis = AdvancedDataStructureSynthesis()
-        self.concurrency_synthesizer = ConcurrencyIPCSynthesizer()
-        self.memory_optimizer = MemoryManagementOptimizer()
-        self.network_engine = NetworkProtocolEngine()
-        self.algorithm_library = AlgorithmLibrary()
-        self.build_system = CompilationBuildSystem()
-        self.compliance_checker = ComplianceChecker()
-        self.output_guarantees = OutputGuarantees()
-
-    def run_pipeline(self, specification, max_iterations=3, base_path="."):
-        print(f"Starting NEXUS Pipeline in {base_path}...")
-    def run_pipeline(self, specification, max_iterations=3):
-        print("Starting NEXUS Pipeline...")
-
-        # 1. Multi-Stage Analysis
-        analysis_results = self.analysis_engine.process(specification)
-
-        # 2. Domain Planning (Before Synthesis)
-        print("Starting Domain Planning stages...")
-        plans = {
-            "structures": self.data_structure_synthesis.process(analysis_results),
-            "concurrency": self.concurrency_synthesizer.process(analysis_results),
-            "memory": self.memory_optimizer.process(analysis_results),
-            "network": self.network_engine.process(analysis_results),
-            "algorithms": self.algorithm_library.process(analysis_results)
-        }
-
-        # 3. Formal Verification (Plan)
-        verification_plan = self.verification_core.process(analysis_results)
 
-        iteration = 0
-        code_info = None
-
-        while iteration < max_iterations:
-            iteration += 1
-            print(f"\n--- Synthesis Iteration {iteration} ---")
-
-            code_info = self.synthesis_framework.process(
-                analysis_results, verification_plan, plans
-            )
-            test_results = self.testing_system.process(code_info)
-
-            # Pass base_path to build system
-            build_artifacts = self.build_system.process(code_info, base_path=base_path)
-
-            compliance_results = self.compliance_checker.process(code_info)
+class NexusOrchestrator:
+    analysis_engine = LazyComponent(".multi_stage_analysis_engine", "MultiStageAnalysisEngine")
+    verification_core = LazyComponent(".formal_verification_core", "FormalVerificationCore")
+    synthesis_framework = LazyComponent(".code_synthesis_framework", "CodeSynthesisFramework")
+    testing_system = LazyComponent(".intelligent_testing_system", "IntelligentTestingSystem")
+    data_structure_synthesis = LazyComponent(".advanced_data_structure_synthesis", "AdvancedDataStructureSynthesis")
+    concurrency_synthesizer = LazyComponent(".concurrency_ipc_synthesizer", "ConcurrencyIPCSynthesizer")
+    memory_optimizer = LazyComponent(".memory_management_optimizer", "MemoryManagementOptimizer")
+    network_engine = LazyComponent(".network_protocol_engine", "NetworkProtocolEngine")
+    algorithm_library = LazyComponent(".algorithm_library", "AlgorithmLibrary")
+    build_system = LazyComponent(".compilation_build_system", "CompilationBuildSystem")
+    compliance_checker = LazyComponent(".compliance_checker", "ComplianceChecker")
+    output_guarantees = LazyComponent(".output_guarantees", "OutputGuarantees")
+
+    # Domain planners that only read analysis_results, in plan order
+    PLANNERS = (
+        ("structures", "data_structure_synthesis"),
+        ("concurrency", "concurrency_synthesizer"),
+        ("memory", "memory_optimizer"),
+        ("network", "network_engine"),
+        ("algorithms", "algorithm_library"),
+    )
+
+    def __init__(self, executor=None, max_workers=None, cache=True, trace_memory=False):
+        self.executor = get_executor(executor, max_workers)
+        # Pipeline stages get their own pool: the planning stage waits on
+        # planner tasks and must not occupy the workers they need.
+        if isinstance(self.executor, SequentialExecutor):
+            self.stage_executor = SequentialExecutor()
+        else:
+            self.stage_executor = ThreadPoolStageExecutor(max_workers=max_workers)
+        # Memoizes analysis, planning and verification across runs; pass a
+        # StageCache with a directory to persist results on disk.
+        if cache is True:
+            cache = StageCache()
+        self.cache = cache or None
+        # tracemalloc roughly doubles allocation cost, so it is opt-in
+        self.trace_memory = trace_memory
+
+    def warm(self):
+        """
+        Builds every lazy component up front, for long-lived workers that
+        should not pay the imports on their first job. Returns self.
+        """
+        for name, attr in vars(type(self)).items():
+            if isinstance(attr, LazyComponent):
+                getattr(self, name)
+        return self
+
+    def plan_domains(self, analysis_results):
+        """
+        Fans the domain planners out on the stage executor and collects their
+        results into the plans dict in PLANNERS order.
+        """
+        calls = [
+            (key, getattr(self, attr).process, (analysis_results,))
+            for key, attr in self.PLANNERS
+        ]
+        return self.executor.run_all(calls)
+
+    def _synthesize(self, analysis_results, verification_plan, plans, failures, previous_code_info):
+        if failures:
+            analysis_results = dict(analysis_results, failures=failures)
+        return self.synthesis_framework.process(
+            analysis_results, verification_plan, plans, previous=previous_code_info
+        )
 
+    def build_pipeline_graph(self):
+        """
+        Section 3.1: Declares every pipeline stage with its input and output
+        artifacts. Build and compliance touch the filesystem, so they always run.
+        """
+        return StageGraph([
+            # 1. Multi-Stage Analysis
+            Stage("analysis", self.analysis_engine.process,
+                  inputs=["specification"], outputs=["analysis_results"],
+                  cacheable=True, key=specification_key),
+            # 2. Domain Planning (Before Synthesis)
+            Stage("planning", self.plan_domains,
+                  inputs=["analysis_results"], outputs=["plans"], cacheable=True),
+            # 3. Formal Verification (Plan)
+            Stage("verification", self.verification_core.process,
+                  inputs=["analysis_results"], outputs=["verification_plan"], cacheable=True),
             # 4. Code Synthesis (Using all plans and previous failures if any)
-            code_info = self.synthesis_framework.process(
-                analysis_results, verification_plan, plans
-            )
-
+            Stage("synthesis", self._synthesize,
+                  inputs=["analysis_results", "verification_plan", "plans", "failures", "previous_code_info"],
+                  outputs=["code_info"]),
             # 5. Intelligent Testing
-            test_results = self.testing_system.process(code_info)
-
+            Stage("testing", self.testing_system.process,
+                  inputs=["code_info"], outputs=["test_results"]),
             # 6. Compilation & Build System
-            build_artifacts = self.build_system.process(code_info)
-
+            Stage("build", lambda code_info, base_path: self.build_system.process(code_info, base_path=base_path),
+                  inputs=["code_info", "base_path"], outputs=["build_artifacts"], pure=False),
             # 7. Compliance Checking
-            compliance_results = self.compliance_checker.process(code_info)
-
-            # Section 3.3: Refinement Loop
-            if compliance_results.get("status") == "PASSED" and test_results.get("coverage_results", {}).get("memory_leaks") == "None":
-                print("All checks passed. Synthesis successful.")
-                break
-            else:
-                print(f"Checks failed in iteration {iteration}. Refinement needed.")
-                # Feed failures back into next synthesis (simulated)
-                analysis_results["failures"] = {
-                    "compliance": compliance_results.get("violations"),
-                    "testing": test_results
-                }
-
-        # 8. Output Guarantees
-        final_package = self.output_guarantees.process(
-            code_info, build_artifacts, compliance_results
-        )
+            Stage("compliance", self.compliance_checker.process,
+                  inputs=["code_info"], outputs=["compliance_results"], pure=False),
+            # 8. Output Guarantees
+            Stage("output", self.output_guarantees.process,
+                  inputs=["code_info", "build_artifacts", "compliance_results"],
+                  outputs=["final_package"], pure=False),
+        ])
+
+    def shutdown(self):
+        self.executor.shutdown()
+        self.stage_executor.shutdown()
+
+    def run_pipeline(self, specification, max_iterations=3, base_path=".", on_event=None, profiler=None):
+        """
+        Runs the full pipeline. The result carries the schedule report under
+        "pipeline" and the per-stage profile under "instrumentation".
+        `on_event` receives progress event dicts (see PipelineEvents) as
+        stages and iterations start and finish. Pass a PipelineProfiler as
+        `profiler` to keep the raw spans, e.g. for a Chrome trace; nothing
+        about a run is stored on the orchestrator, so threads can share it.
+        """
+        events = PipelineEvents(on_event)
+        if profiler is None:
+            profiler = PipelineProfiler(trace_memory=self.trace_memory)
+        events.emit("pipeline_started", base_path=base_path)
+        try:
+            with profiler.activate():
+                with profiler.span("pipeline", "pipeline"):
+                    final_package = self._run_pipeline(specification, max_iterations, base_path, events)
+        except Exception as e:
+            events.emit("pipeline_failed", error=f"{type(e).__name__}: {e}")
+            raise
+        final_package["instrumentation"] = profiler.to_dict()
+        events.emit("pipeline_completed", status=final_package.get("status"),
+                    certification=final_package.get("certification"))
+        return final_package
 
-        print("NEXUS Pipeline Completed Successfully.")
+    def iter_pipeline(self, specification, max_iterations=3, base_path="."):
+        """
+        Runs the pipeline on a background thread and yields its progress
+        events; the last one is "pipeline_completed" or "pipeline_failed".
+        """
+        return stream_events(self.run_pipeline, specification=specification,
+                             max_iterations=max_iterations, base_path=base_path)
+
+    def _run_pipeline(self, specification, max_iterations, base_path, events):
+        log.info("Starting NEXUS Pipeline in %s...", base_path)
+
+        scheduler = DAGScheduler(self.build_pipeline_graph(), executor=self.stage_executor,
+                                 cache=self.cache, on_event=events.on_stage)
+        artifacts = {
+            "specification": specification,
+            "base_path": base_path,
+            "failures": None,
+            "previous_code_info": None,
+        }
+        iteration_targets = ("testing", "build", "compliance")
+
+        iteration = 0
+        while iteration < max_iterations:
+            iteration += 1
+            with log_iteration(iteration):
+                events.iteration = iteration
+                log.info("--- Synthesis Iteration %s ---", iteration)
+                events.emit("iteration_started")
+
+                # Stages whose inputs are unchanged since the last iteration are skipped
+                with span(f"iteration {iteration}", "iteration"):
+                    scheduler.run(artifacts, targets=iteration_targets)
+                compliance_results = artifacts["compliance_results"]
+                test_results = artifacts["test_results"]
+
+                # Section 3.3: Refinement Loop
+                passed = (compliance_results.get("status") == "PASSED"
+                          and test_results.get("coverage_results", {}).get("memory_leaks") == "None")
+                events.emit("iteration_completed", passed=passed)
+                if passed:
+                    log.info("All checks passed. Synthesis successful.")
+                    break
+                elif iteration < max_iterations:
+                    log.warning("Checks failed in iteration %s. Refinement needed.", iteration)
+                    # Feed failures back into next synthesis; only the fragments
+                    # they are attributed to are regenerated and re-checked
+                    dirty = set(compliance_results.get("fragment_violations", {}))
+                    dirty.update(test_results.get("failing_fragments", []))
+                    artifacts["failures"] = {
+                        "compliance": compliance_results.get("violations"),
+                        "testing": test_results,
+                        "fragments": sorted(dirty)
+                    }
+                    artifacts["previous_code_info"] = artifacts["code_info"]
+                else:
+                    # Feedback here would re-synthesize code that ships unchecked
+                    log.warning("Checks failed in final iteration %s.", iteration)
+
+        scheduler.run(artifacts, targets=("output",))
+        final_package = artifacts["final_package"]
+        final_package["pipeline"] = scheduler.report()
+
+        log.info("NEXUS Pipeline Completed Successfully.")
         return final_package
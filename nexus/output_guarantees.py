@@ -1,11 +1,16 @@
-from .course_roadmap import ROADMAP_CONTENT
+from .instrumentation import instrumented
+from .log import get_logger
+
+log = get_logger(__name__)
 
 class CourseRoadmapGenerator:
     """
     Generates the Systems Programming Masterclass Roadmap.
     """
     def generate(self):
-        print("Course Roadmap Generator: Retrieving masterclass curriculum...")
+        log.info("Course Roadmap Generator: Retrieving masterclass curriculum...")
+        # Imported on demand: the curriculum is a large string module
+        from .course_roadmap import ROADMAP_CONTENT
         return ROADMAP_CONTENT
 
 class READMEGenerator:
@@ -14,7 +19,7 @@ class READMEGenerator:
     Generates README with architecture, testing instructions.
     """
     def generate_readme(self, code_info, certification, diagram):
-        print("README Generator: Creating project README...")
+        log.info("README Generator: Creating project README...")
         readme = f"""
 # NEXUS Generated Project
 
@@ -43,7 +48,7 @@ class FormalProofGenerator:
     Generates a symbolic mathematical proof of correctness.
     """
     def generate_proof(self, verification_results):
-        print("Formal Proof Generator: Synthesizing mathematical proof...")
+        log.info("Formal Proof Generator: Synthesizing mathematical proof...")
         proof = """
 # Formal Proof of Correctness
 
@@ -77,7 +82,7 @@ class OutputGuarantees:
         """
         Generates a Mermaid.js flowchart of the system architecture.
         """
-        print("Output Guarantees: Generating architecture diagram...")
+        log.info("Output Guarantees: Generating architecture diagram...")
         lines = ["graph TD"]
         for i in range(len(pipeline_stages) - 1):
             lines.append(f"    {pipeline_stages[i]} --> {pipeline_stages[i+1]}")
@@ -87,7 +92,7 @@ class OutputGuarantees:
         """
         Generates API documentation based on function signatures in C code.
         """
-        print("Output Guarantees: Generating API documentation...")
+        log.info("Output Guarantees: Generating API documentation...")
         code = code_info.get("code", "")
         # Very simple API doc generation by finding C functions
         functions = []
@@ -100,8 +105,9 @@ class OutputGuarantees:
             docs.append(f"- `{func}`: Auto-generated description for {func}.")
         return "\n".join(docs)
 
+    @instrumented
     def process(self, code_info, build_artifacts, compliance_results):
-        print("Output Guarantees: Certifying correctness and generating documentation...")
+        log.info("Output Guarantees: Certifying correctness and generating documentation...")
 
         stages = ["Analysis", "Verification", "Synthesis", "Testing", "Compliance", "Optimization"]
         mermaid = self.generate_mermaid_diagram(stages)
@@ -119,7 +125,6 @@ class OutputGuarantees:
                 "architecture_diagram": mermaid,
                 "api_docs": api_docs,
                 "readme": readme,
-                "formal_proof": proof
                 "formal_proof": proof,
                 "course_roadmap": roadmap
             },
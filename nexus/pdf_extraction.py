@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+
+from .hashing import hash_file
+from .instrumentation import count
+from .stage_executor import get_executor
+
+_fitz = None
+
+
+def load_fitz():
+    """
+    Imports PyMuPDF on first use; it is slow to import and only PDF
+    specifications need it. Returns None when it is not installed.
+    """
+    global _fitz
+    if _fitz is None:
+        try:
+            import fitz  # PyMuPDF
+        except ImportError:
+            fitz = False
+        _fitz = fitz
+    return _fitz or None
+
+
+def iter_pdf_pages(path, start=0, stop=None):
+    """
+    Yields the text of pages [start, stop) one at a time; only the current
+    page is loaded, so memory stays flat however long the document is.
+    """
+    fitz = load_fitz()
+    if fitz is None:
+        raise ImportError("PyMuPDF is required to read PDF specifications")
+    doc = fitz.open(path)
+    try:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for number in range(start, stop):
+            yield doc.load_page(number).get_text()
+    finally:
+        doc.close()
+
+
+def _extract_range(path, start, stop):
+    # Runs in a worker process: page texts go back as a list, joined once by the caller
+    return list(iter_pdf_pages(path, start, stop))
+
+
+class PDFExtractor:
+    """
+    Section 1.1: PDF/Document Intelligence
+    Extracts the text of PDF specifications. Small documents are read page by
+    page in-process; documents of `parallel_threshold` pages or more are split
+    into page ranges extracted on a process pool. Results are cached by file
+    content hash, so re-uploads of the same course pack are free.
+    """
+    def __init__(self, parallel_threshold=64, min_pages_per_task=16, max_workers=None,
+                 executor="process", cache_size=16):
+        self.parallel_threshold = parallel_threshold
+        self.min_pages_per_task = min_pages_per_task
+        self.max_workers = max_workers
+        self.executor = executor
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def page_count(self, path):
+        doc = load_fitz().open(path)
+        try:
+            return doc.page_count
+        finally:
+            doc.close()
+
+    def page_ranges(self, pages, workers):
+        # About two tasks per worker evens out pages of uneven density
+        size = max(self.min_pages_per_task, -(-pages // (workers * 2)))
+        return [(start, min(start + size, pages)) for start in range(0, pages, size)]
+
+    def iter_pages(self, path):
+        return iter_pdf_pages(path)
+
+    def extract(self, path):
+        key = hash_file(path)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                count("pdf_cache_hits")
+                return self._cache[key]
+
+        pages = self.page_count(path)
+        if pages >= self.parallel_threshold:
+            text = self._extract_parallel(path, pages)
+        else:
+            text = "".join(self.iter_pages(path))
+        count("pdf_pages", pages)
+
+        with self._lock:
+            self._cache[key] = text
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    def _extract_parallel(self, path, pages):
+        executor = get_executor(self.executor, self.max_workers)
+        try:
+            ranges = self.page_ranges(pages, getattr(executor, "max_workers", 1))
+            chunks = executor.run_all([(r, _extract_range, (path,) + r) for r in ranges])
+        finally:
+            executor.shutdown()
+        return "".join(text for chunk in chunks.values() for text in chunk)
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import time
+
+from .stage_executor import get_executor
+from .stage_cache import MISSING
+from . import instrumentation
+from .log import stage as log_stage
+
+
+def stable_hash(value):
+    """
+    Returns a content hash of a stage input that is stable across runs and
+    processes (dict ordering does not matter).
+    """
+    data = json.dumps(value, sort_keys=True, default=repr, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class Stage:
+    """
+    A pipeline stage declaring the artifacts it reads and writes.
+    Impure stages (disk writes, repository scans) rerun whenever targeted.
+    Cacheable stages are memoized in the scheduler's StageCache; `key` maps
+    the input values to what identifies them (e.g. file contents for a path).
+    """
+    def __init__(self, name, func, inputs=(), outputs=(), pure=True, cacheable=False, key=None):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.pure = pure
+        self.cacheable = cacheable and pure
+        self.key = key
+
+    def fingerprint(self, values):
+        return stable_hash(self.key(*values) if self.key else values)
+
+    def run(self, *values):
+        result = self.func(*values)
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: result}
+        return dict(zip(self.outputs, result))
+
+    def __repr__(self):
+        return f"Stage({self.name}: {list(self.inputs)} -> {list(self.outputs)})"
+
+
+class StageGraph:
+    """
+    Section 3.1: Pipeline DAG
+    Derives stage dependencies from declared inputs and outputs.
+    """
+    def __init__(self, stages=()):
+        self.stages = {}
+        self.producers = {}
+        for stage in stages:
+            self.add(stage)
+
+    def add(self, stage):
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage: {stage.name}")
+        for output in stage.outputs:
+            if output in self.producers:
+                raise ValueError(f"Artifact '{output}' is produced by both {self.producers[output]} and {stage.name}")
+            self.producers[output] = stage.name
+        self.stages[stage.name] = stage
+        return stage
+
+    def dependencies(self, name):
+        stage = self.stages[name]
+        return [self.producers[i] for i in stage.inputs if i in self.producers]
+
+    def topological_order(self):
+        indegree = {name: len(set(self.dependencies(name))) for name in self.stages}
+        dependents = {name: [] for name in self.stages}
+        for name in self.stages:
+            for dep in set(self.dependencies(name)):
+                dependents[dep].append(name)
+
+        # Declaration order breaks ties so the schedule is deterministic
+        order = []
+        ready = [name for name in self.stages if indegree[name] == 0]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in dependents[name]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.stages):
+            cyclic = sorted(set(self.stages) - set(order))
+            raise ValueError(f"Pipeline has a dependency cycle between: {cyclic}")
+        return order
+
+    def upstream(self, targets):
+        """
+        Returns the names of `targets` and every stage they transitively depend on.
+        """
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            needed.add(name)
+            stack.extend(self.dependencies(name))
+        return needed
+
+    def critical_path(self, durations):
+        """
+        Returns the chain of stages with the largest summed duration, which
+        bounds end-to-end latency however many workers are available.
+        """
+        finish = {}
+        previous = {}
+        for name in self.topological_order():
+            start = 0.0
+            for dep in self.dependencies(name):
+                if finish[dep] > start:
+                    start = finish[dep]
+                    previous[name] = dep
+            finish[name] = start + durations.get(name, 0.0)
+
+        if not finish:
+            return {"stages": [], "duration": 0.0}
+        name = max(finish, key=finish.get)
+        total = finish[name]
+        path = [name]
+        while name in previous:
+            name = previous[name]
+            path.append(name)
+        return {"stages": path[::-1], "duration": total}
+
+
+class DAGScheduler:
+    """
+    Runs a StageGraph wave by wave: every stage whose dependencies are
+    satisfied is dispatched to the executor together. A stage is skipped when
+    the fingerprint of its inputs matches its previous run, except that an
+    impure stage always runs when it is one of the requested targets.
+    Cacheable stages are looked up in `cache` before being dispatched.
+    `on_event(event, stage, **fields)` is told about every stage transition.
+    """
+    def __init__(self, graph, executor=None, cache=None, on_event=None):
+        self.graph = graph
+        self.executor = get_executor(executor)
+        self.cache = cache
+        self.on_event = on_event
+        self.fingerprints = {}
+        self.durations = {}
+        self.runs = {}
+        self.skips = {}
+        self.cache_hits = {}
+
+    def _notify(self, event, stage, **fields):
+        if self.on_event is not None:
+            self.on_event(event, stage, **fields)
+
+    def _execute(self, stage, values):
+        self._notify("stage_started", stage.name)
+        start = time.perf_counter()
+        with instrumentation.span(stage.name, "stage"), log_stage(stage.name):
+            outputs = stage.run(*values)
+        elapsed = time.perf_counter() - start
+        self._notify("stage_completed", stage.name, outputs=outputs, duration=elapsed)
+        return outputs, elapsed
+
+    def _inputs(self, stage, artifacts):
+        missing = [i for i in stage.inputs if i not in artifacts]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' is missing inputs: {missing}")
+        return [artifacts[i] for i in stage.inputs]
+
+    def run(self, artifacts, targets=None):
+        """
+        Brings `targets` (all stages by default) up to date, updating the
+        `artifacts` dict in place, and returns it.
+        """
+        order = self.graph.topological_order()
+        targets = set(order) if targets is None else set(targets)
+        pending = self.graph.upstream(targets)
+        done = set()
+
+        while pending:
+            wave = [
+                name for name in order
+                if name in pending and all(dep in done for dep in self.graph.dependencies(name))
+            ]
+            calls = []
+            fingerprints = {}
+            for name in wave:
+                stage = self.graph.stages[name]
+                values = self._inputs(stage, artifacts)
+                fingerprint = stage.fingerprint(values)
+                forced = not stage.pure and name in targets
+                up_to_date = all(o in artifacts for o in stage.outputs)
+                if not forced and up_to_date and self.fingerprints.get(name) == fingerprint:
+                    self.skips[name] = self.skips.get(name, 0) + 1
+                    instrumentation.count("stages_skipped")
+                    self._notify("stage_skipped", name)
+                    continue
+                if stage.cacheable and self.cache is not None:
+                    cached = self.cache.get(self.cache.key(name, fingerprint))
+                    if cached is not MISSING:
+                        artifacts.update(cached)
+                        self.fingerprints[name] = fingerprint
+                        self.cache_hits[name] = self.cache_hits.get(name, 0) + 1
+                        instrumentation.count("cache_hits")
+                        self._notify("stage_cached", name, outputs=cached)
+                        continue
+                fingerprints[name] = fingerprint
+                calls.append((name, self._execute, (stage, values)))
+
+            for name, (outputs, elapsed) in self.executor.run_all(calls).items():
+                artifacts.update(outputs)
+                self.fingerprints[name] = fingerprints[name]
+                if self.graph.stages[name].cacheable and self.cache is not None:
+                    self.cache.put(self.cache.key(name, fingerprints[name]), outputs)
+                self.durations[name] = self.durations.get(name, 0.0) + elapsed
+                self.runs[name] = self.runs.get(name, 0) + 1
+
+            done.update(wave)
+            pending.difference_update(wave)
+
+        return artifacts
+
+    def report(self):
+        return {
+            "order": self.graph.topological_order(),
+            "durations": dict(self.durations),
+            "runs": dict(self.runs),
+            "skipped": dict(self.skips),
+            "cache_hits": dict(self.cache_hits),
+            "critical_path": self.graph.critical_path(self.durations),
+        }
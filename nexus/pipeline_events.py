@@ -0,0 +1,70 @@
+import queue
+import threading
+import time
+
+# Events after which no more events follow for a run
+TERMINAL_EVENTS = ("pipeline_completed", "pipeline_failed")
+
+
+class PipelineEvents:
+    """
+    Section 3.6: Progress Events
+    Turns stage transitions and iteration boundaries into event records
+    passed to a callback. Selected stage outputs are forwarded as "artifact"
+    events as soon as they exist, so clients can render partial results.
+    """
+    ARTIFACTS = ("analysis_results", "plans", "verification_plan", "code_info", "test_results", "compliance_results")
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.iteration = 0
+
+    def emit(self, event, **data):
+        if self.callback is None:
+            return
+        record = {"event": event, "iteration": self.iteration, "timestamp": time.time()}
+        record.update(data)
+        self.callback(record)
+
+    def on_stage(self, event, stage, outputs=None, **data):
+        """
+        Hook for DAGScheduler: may be called from executor threads.
+        """
+        if self.callback is None:
+            return
+        self.emit(event, stage=stage, **data)
+        for name, value in (outputs or {}).items():
+            if name in self.ARTIFACTS:
+                self.emit("artifact", stage=stage, name=name, value=value)
+
+
+def stream_events(run, **kwargs):
+    """
+    Runs `run(on_event=..., **kwargs)` on a background thread and yields its
+    events as they happen. The final event is always terminal; an exception
+    in `run` surfaces as a "pipeline_failed" event.
+    """
+    events = queue.Queue()
+
+    def target():
+        try:
+            run(on_event=events.put, **kwargs)
+        except Exception as e:
+            events.put({"event": "pipeline_failed", "error": f"{type(e).__name__}: {e}", "timestamp": time.time()})
+        finally:
+            events.put(None)
+
+    thread = threading.Thread(target=target, name="nexus-pipeline", daemon=True)
+    thread.start()
+    terminal_seen = False
+    while True:
+        event = events.get()
+        if event is None:
+            break
+        if event["event"] in TERMINAL_EVENTS:
+            # A failure is reported once even if run() emitted it itself
+            if terminal_seen:
+                continue
+            terminal_seen = True
+        yield event
+    thread.join()
@@ -0,0 +1,122 @@
+from collections import namedtuple
+
+from .feature_index import default_matcher
+
+# A record starts at "REQ: " and runs until the next "REQ:" (with or without
+# the space) or the end of the input, as the original lazy regex did.
+MARKER = "REQ:"
+CHUNK_SIZE = 1 << 16
+
+
+class Requirement(namedtuple("Requirement", "kind text start end keywords")):
+    """
+    One REQ/ASM/DEP record. `start`/`end` delimit the stripped text in the
+    source, in characters for text input and bytes for binary input.
+    `keywords` are the feature keywords found in the text.
+    """
+    __slots__ = ()
+
+
+def classify(keywords):
+    if "assume" in keywords:
+        return "ASM"
+    if "depends on" in keywords:
+        return "DEP"
+    return "REQ"
+
+
+def _chunks(source, chunk_size):
+    if hasattr(source, "read"):
+        for chunk in iter(lambda: source.read(chunk_size), source.read(0)):
+            yield chunk
+    elif isinstance(source, (memoryview, bytearray)):
+        view = memoryview(source)
+        for offset in range(0, len(view), chunk_size):
+            yield view[offset:offset + chunk_size].tobytes()
+    elif isinstance(source, (str, bytes)):
+        # Already in memory: scan it in place rather than copying chunks
+        yield source
+    else:
+        # Any iterable of str or bytes pieces, e.g. PDF pages
+        yield from source
+
+
+class SpecTokenizer:
+    """
+    Section 1.1: Requirement Tokenizer
+    Single pass over a specification that yields Requirement records as soon
+    as the next marker is seen. Only the unscanned tail (shorter than the
+    marker) and the requirement being read are held, so specifications of
+    any size stream in bounded memory.
+    """
+    def __init__(self, chunk_size=CHUNK_SIZE, matcher=None):
+        self.chunk_size = chunk_size
+        self.matcher = matcher or default_matcher()
+
+    def tokenize(self, source):
+        chunks = _chunks(source, self.chunk_size)
+        first = next(chunks, None)
+        if first is None:
+            return
+        binary = not isinstance(first, str)
+        marker = MARKER.encode() if binary else MARKER
+        space = b" " if binary else " "
+        empty = first[:0]
+
+        tail, tail_base = empty, 0
+        pieces, record_start = [], None
+        chunk = first
+        while chunk is not None:
+            following = next(chunks, None)
+            final = following is None
+            buf, base = tail + chunk, tail_base
+            pos, found = 0, -1
+            while True:
+                found = buf.find(marker, pos)
+                # The character after the marker decides whether it opens a record
+                if found < 0 or (found + len(marker) >= len(buf) and not final):
+                    break
+                if record_start is not None:
+                    pieces.append(buf[pos:found])
+                    yield self._record(empty.join(pieces), record_start, binary)
+                    pieces = []
+                if buf[found + len(marker):found + len(marker) + 1] == space:
+                    record_start = base + found + len(marker) + 1
+                    pos = found + len(marker) + 1
+                else:
+                    record_start = None
+                    pos = found + len(marker)
+            if final:
+                keep = len(buf)
+            elif found >= 0:
+                keep = found
+            else:
+                keep = max(pos, len(buf) - (len(marker) - 1))
+            if record_start is not None:
+                pieces.append(buf[pos:keep])
+            tail, tail_base = buf[keep:], base + keep
+            chunk = following
+
+        if record_start is not None:
+            yield self._record(empty.join(pieces), record_start, binary)
+
+    def _record(self, raw, offset, binary):
+        if binary:
+            stripped = raw.strip()
+            start = offset + (len(raw) - len(raw.lstrip()))
+            end = start + len(stripped)
+            text = stripped.decode("utf-8", errors="replace")
+        else:
+            text = raw.strip()
+            start = offset + (len(raw) - len(raw.lstrip()))
+            end = start + len(text)
+        keywords = self.matcher.scan(text)
+        return Requirement(classify(keywords), text, start, end, keywords)
+
+
+def tokenize(source, chunk_size=CHUNK_SIZE):
+    """
+    Yields Requirement records from a str, bytes, bytearray, memoryview, file
+    object (text or binary) or iterable of str/bytes pieces.
+    """
+    return SpecTokenizer(chunk_size).tokenize(source)
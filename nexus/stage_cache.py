@@ -0,0 +1,148 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from .log import get_logger
+
+log = get_logger(__name__)
+
+# Bump when stage outputs change shape so stale disk entries are never reused
+CACHE_VERSION = 1
+
+MISSING = object()
+
+
+class StageCache:
+    """
+    Section 3.1: Stage Result Cache
+    Content-addressed memoization of pure stage results. Entries live in an
+    in-memory LRU and, when a directory is given, in a size-bounded on-disk
+    store that survives process restarts.
+    """
+    def __init__(self, max_entries=256, directory=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, stage_name, fingerprint):
+        return f"v{CACHE_VERSION}-{stage_name}-{fingerprint}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        """
+        Returns a private copy of the cached value, or MISSING.
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+
+        if data is None and self.directory:
+            data = self._read_disk(key)
+            if data is not None:
+                self._remember(key, data)
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return MISSING
+            self.hits += 1
+        return pickle.loads(data)
+
+    def put(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, data)
+        if self.directory:
+            self._write_disk(key, data)
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Refresh the mtime so eviction approximates LRU on disk too
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning("Stage Cache: Could not write %s: %s", path, e)
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk()[1]
+            else:
+                self._disk_bytes += len(data)
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _scan_disk(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        return entries, total
+
+    def _evict_disk(self):
+        """
+        Removes the least recently used files until the store fits its budget.
+        """
+        with self._lock:
+            entries, total = self._scan_disk()
+            for _, size, path in sorted(entries):
+                if total <= self.max_disk_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._disk_bytes = total
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.directory:
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith(".pkl"):
+                        os.remove(entry.path)
+                self._disk_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
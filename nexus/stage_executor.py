@@ -0,0 +1,139 @@
+import contextvars
+import os
+import threading
+
+
+def _call(fn, args, kwargs):
+    return fn(*args, **kwargs)
+
+
+class StageExecutor:
+    """
+    Section 3.1: Stage Execution
+    Runs a set of independent pipeline stages and fans their results back in
+    the order the stages were submitted, regardless of completion order.
+    """
+    name = "base"
+    # Whether submitted callables run inside this interpreter (closures allowed)
+    in_process = True
+
+    def submit(self, fn, *args, **kwargs):
+        raise NotImplementedError
+
+    def run_all(self, calls):
+        """
+        Runs `calls`, a list of (key, fn, args) tuples, and returns a dict
+        mapping each key to its result in submission order.
+        """
+        futures = [(key, self.submit(fn, *args)) for key, fn, args in calls]
+        return {key: future.result() for key, future in futures}
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class _ImmediateFuture:
+    def __init__(self, fn, args, kwargs):
+        self._result = None
+        self._error = None
+        try:
+            self._result = fn(*args, **kwargs)
+        except Exception as e:
+            self._error = e
+
+    def result(self, timeout=None):
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class SequentialExecutor(StageExecutor):
+    """
+    Runs stages one after another in the calling thread.
+    """
+    name = "sequential"
+
+    def submit(self, fn, *args, **kwargs):
+        return _ImmediateFuture(fn, args, kwargs)
+
+
+class _PoolExecutor(StageExecutor):
+    def _create_pool(self):
+        raise NotImplementedError
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        # Pools are created on first use so that constructing an orchestrator
+        # stays cheap; the lock keeps concurrent first submits to one pool
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._create_pool()
+            return self._pool
+
+    def submit(self, fn, *args, **kwargs):
+        return self._get_pool().submit(_call, fn, args, kwargs)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+class ThreadPoolStageExecutor(_PoolExecutor):
+    """
+    Runs stages on a shared thread pool. Each task runs in a copy of the
+    submitter's context so profiling spans nest under the submitting stage.
+    """
+    name = "thread"
+
+    def _create_pool(self):
+        # concurrent.futures (and multiprocessing behind it) is imported on
+        # first use to keep CLI start-up fast
+        from concurrent.futures import ThreadPoolExecutor
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def submit(self, fn, *args, **kwargs):
+        context = contextvars.copy_context()
+        return self._get_pool().submit(context.run, _call, fn, args, kwargs)
+
+
+class ProcessPoolStageExecutor(_PoolExecutor):
+    """
+    Runs stages on a process pool. Stage callables and their arguments must be
+    picklable (bound methods of planner instances are).
+    """
+    name = "process"
+    in_process = False
+
+    def _create_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+
+EXECUTORS = {
+    SequentialExecutor.name: SequentialExecutor,
+    ThreadPoolStageExecutor.name: ThreadPoolStageExecutor,
+    ProcessPoolStageExecutor.name: ProcessPoolStageExecutor,
+}
+
+
+def get_executor(executor=None, max_workers=None):
+    """
+    Resolves an executor name ("sequential", "thread", "process") or instance.
+    """
+    if executor is None:
+        return SequentialExecutor()
+    if isinstance(executor, StageExecutor):
+        return executor
+    try:
+        executor_class = EXECUTORS[executor]
+    except KeyError:
+        raise ValueError(f"Unknown stage executor: {executor}")
+    if executor_class is SequentialExecutor:
+        return executor_class()
+    return executor_class(max_workers=max_workers)
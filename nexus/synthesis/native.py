@@ -0,0 +1,66 @@
+import os
+import shutil
+import subprocess
+
+from .registry import default_registry
+
+# Benchmark driver template -> the function its main() delegates to
+BENCHMARK_ENTRY_POINTS = {
+    "QUEUE_BENCHMARK": "queue_benchmark_main",
+    "WORK_STEALING_BENCHMARK": "ws_benchmark_main",
+    "THREAD_POOL_BENCHMARK": "threadpool_benchmark_main",
+    "NET_BENCHMARK": "net_benchmark_main",
+    "ALLOC_BENCHMARK": "alloc_benchmark_main",
+}
+
+
+def find_compiler():
+    """
+    The C compiler to build templates with ($CC, then gcc, cc, clang), or
+    None when there is none on this host.
+    """
+    for candidate in (os.environ.get("CC"), "gcc", "cc", "clang"):
+        if candidate and shutil.which(candidate):
+            return candidate
+    return None
+
+
+def program_source(template_names, main=None, registry=None):
+    """
+    A complete C translation unit: the named templates plus everything they
+    require, assembled by the registry, followed by `main` if given.
+    """
+    registry = registry or default_registry()
+    selection = [(f"program/{name}", name, registry.get(name).source) for name in template_names]
+    assembly = registry.assemble(selection)
+    parts = [f"#include {header}\n" for header in assembly.headers]
+    parts.extend(f"\n{body}\n" for _, body in assembly.fragments)
+    if main:
+        parts.append(main)
+    return "".join(parts)
+
+
+def benchmark_source(driver, registry=None):
+    entry = BENCHMARK_ENTRY_POINTS[driver]
+    main = f"\nint main(int argc, char **argv) {{\n    return {entry}(argc, argv);\n}}\n"
+    return program_source([driver], main, registry)
+
+
+def compile_program(source, output, flags=("-O2",), libs=("-pthread",), compiler=None):
+    """
+    Compiles `source` to the executable `output`. Raises RuntimeError with
+    the compiler diagnostics when it fails.
+    """
+    compiler = compiler or find_compiler()
+    if compiler is None:
+        raise RuntimeError("No C compiler found (set CC or install gcc)")
+    command = [compiler, "-std=gnu11", *flags, "-x", "c", "-", "-o", output, *libs]
+    result = subprocess.run(command, input=source, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} failed:\n{result.stderr}")
+    return output
+
+
+def build_benchmark(driver, directory, flags=("-O2",), compiler=None):
+    output = os.path.join(directory, driver.lower())
+    return compile_program(benchmark_source(driver), output, flags, compiler=compiler)
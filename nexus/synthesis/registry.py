@@ -0,0 +1,206 @@
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+from ..graph import CSRGraph
+from ..instrumentation import count
+from ..log import get_logger
+
+log = get_logger(__name__)
+
+INCLUDE = re.compile(r'^[ \t]*#[ \t]*include[ \t]*([<"][^>"\n]+[>"])[^\n]*\n?', re.M)
+
+# Top-level (column 0) definitions: functions, typedef names, macros and
+# initialized globals. Template bodies indent everything inside a block.
+DEFINITIONS = (
+    re.compile(r"^[A-Za-z_][\w \t*]*?\b([A-Za-z_]\w*)\s*\([^;{]*\)\s*\{", re.M),
+    re.compile(r"^\}\s*([A-Za-z_]\w*)\s*;", re.M),
+    re.compile(r"^typedef\b[^{;]*?\b([A-Za-z_]\w*)\s*;", re.M),
+    re.compile(r"^#[ \t]*define[ \t]+([A-Za-z_]\w*)", re.M),
+    re.compile(r"^[A-Za-z_][\w \t*]*?\b([A-Za-z_]\w*)\s*=[^;]*;", re.M),
+)
+
+
+def split_includes(source):
+    """
+    Returns (headers, body): the #include targets of `source` in order,
+    without duplicates, and the source with those lines removed.
+    """
+    headers = tuple(dict.fromkeys(match.group(1) for match in INCLUDE.finditer(source)))
+    return headers, INCLUDE.sub("", source)
+
+
+def defined_symbols(body):
+    symbols = []
+    for pattern in DEFINITIONS:
+        symbols.extend(pattern.findall(body))
+    return tuple(dict.fromkeys(symbols))
+
+
+class Template(namedtuple("Template", "name source body headers provides requires")):
+    """
+    A C template split into the headers it includes and the code after
+    them, with the symbols it defines and the symbols it needs from other
+    templates.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, name, source, headers=(), provides=None, requires=()):
+        included, body = split_includes(source)
+        if provides is None:
+            provides = defined_symbols(body)
+        return cls(name, source, body, tuple(dict.fromkeys(included + tuple(headers))),
+                   tuple(provides), tuple(requires))
+
+
+Assembly = namedtuple("Assembly", "headers fragments")
+
+
+class TemplateRegistry:
+    """
+    Section 3.2: Template Registry
+    Templates keyed by name with their headers, provided and required
+    symbols. assemble() orders a selection so that every template follows
+    the templates it requires (pulling in unselected ones), drops duplicate
+    templates and hoists one deduplicated include list above them.
+    Assemblies are cached by the selection.
+    """
+    def __init__(self, cache_size=64):
+        self._templates = {}
+        self._providers = {}
+        self._assemblies = OrderedDict()
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def register(self, name, source, headers=(), provides=None, requires=()):
+        template = Template.parse(name, source, headers, provides, requires)
+        for symbol in template.provides:
+            owner = self._providers.get(symbol)
+            if owner is not None and owner != name:
+                raise ValueError(f"Symbol {symbol} is already provided by template {owner}")
+        for symbol in template.provides:
+            self._providers[symbol] = name
+        self._templates[name] = template
+        with self._lock:
+            self._assemblies.clear()
+        return template
+
+    def __contains__(self, name):
+        return name in self._templates
+
+    def __iter__(self):
+        return iter(self._templates)
+
+    def get(self, name):
+        return self._templates.get(name)
+
+    def provider(self, symbol):
+        return self._providers.get(symbol)
+
+    def describe(self, name, source):
+        """
+        The registered template `name` if `source` is its text, otherwise a
+        template parsed from `source` (e.g. one a planner edited).
+        """
+        template = self._templates.get(name)
+        if template is not None and template.source == source:
+            return template
+        return Template.parse(name, source)
+
+    def assemble(self, selection):
+        """
+        `selection` is a sequence of (fragment name, template name, source).
+        Returns Assembly(headers, fragments): the deduplicated includes and
+        the ordered (fragment name, body) pairs. Templates pulled in only to
+        satisfy a requirement are named "requires/<template>".
+        """
+        key = tuple(selection)
+        with self._lock:
+            cached = self._assemblies.get(key)
+            if cached is not None:
+                self._assemblies.move_to_end(key)
+                count("template_assembly_cache_hits")
+                return cached
+        assembly = self._assemble(key)
+        with self._lock:
+            self._assemblies[key] = assembly
+            while len(self._assemblies) > self.cache_size:
+                self._assemblies.popitem(last=False)
+        return assembly
+
+    def _assemble(self, selection):
+        nodes, templates, by_template = [], [], {}
+        for fragment, name, source in selection:
+            template = self.describe(name, source)
+            if name in by_template:
+                if templates[by_template[name]].source == source:
+                    # The same template selected by several plans is emitted once
+                    continue
+            else:
+                by_template[name] = len(nodes)
+            nodes.append(fragment)
+            templates.append(template)
+
+        # Pull in providers of required symbols until the selection is closed
+        edges = []
+        position = 0
+        while position < len(nodes):
+            for symbol in templates[position].requires:
+                owner = self._providers.get(symbol)
+                if owner is None:
+                    raise ValueError(f"Template {templates[position].name} requires unknown symbol {symbol}")
+                if owner not in by_template:
+                    by_template[owner] = len(nodes)
+                    nodes.append(f"requires/{owner}")
+                    templates.append(self._templates[owner])
+                edges.append((position, by_template[owner]))
+            position += 1
+
+        # Edges point from a template to what it requires, so a postorder
+        # walk in selection order places requirements just ahead of their
+        # first user and otherwise keeps the selection order
+        graph = CSRGraph.from_edges(edges, len(nodes))
+        cycle = graph.find_cycle()
+        if cycle is not None:
+            names = " -> ".join(templates[u].name for u in cycle)
+            raise ValueError(f"Template requirements form a cycle: {names}")
+        seen = bytearray(len(nodes))
+        order = [u for root in range(len(nodes)) for u in graph.dfs_postorder(root, seen)]
+
+        headers, fragments, provided = {}, [], {}
+        for u in order:
+            template = templates[u]
+            duplicates = [symbol for symbol in template.provides if symbol in provided]
+            if duplicates and len(duplicates) == len(template.provides):
+                log.debug("Dropping template %s: everything it defines is already defined", template.name)
+                continue
+            if duplicates:
+                log.warning("Template %s redefines %s", template.name, ", ".join(duplicates))
+            headers.update(dict.fromkeys(template.headers))
+            for symbol in template.provides:
+                provided.setdefault(symbol, template.name)
+            fragments.append((nodes[u], template.body))
+        count("templates_assembled", len(fragments))
+        return Assembly(tuple(headers), tuple(fragments))
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_registry():
+    """
+    The registry holding every built-in template, populated on first use.
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            from .templates import TemplateLibrary
+            from ..algorithm_library import AlgorithmLibrary
+
+            registry = TemplateRegistry()
+            TemplateLibrary.register_templates(registry)
+            AlgorithmLibrary.register_templates(registry)
+            _default = registry
+    return _default
@@ -5,71 +5,702 @@ class TemplateLibrary:
     """
 
     LOCK_FREE_QUEUE = """
-/* Lock-free Queue Implementation */
+/* Lock-free Queue Implementation: Michael-Scott MPMC queue on C11 atomics
+ * with hazard-pointer reclamation. A dequeued node is retired, not freed,
+ * and only freed once no thread holds a hazard pointer to it, which also
+ * rules out ABA on the head and tail CAS. Call hp_thread_exit() before a
+ * thread that used the queue exits. */
+#include <stdatomic.h>
+#include <stdbool.h>
+#include <stdlib.h>
+
+#define HP_MAX_THREADS 64
+#define HP_PER_THREAD 2
+#define HP_RETIRE_THRESHOLD (2 * HP_MAX_THREADS * HP_PER_THREAD)
+
 typedef struct node {
     void *data;
-    struct node *next;
+    _Atomic(struct node *) next;
 } node_t;
 
 typedef struct queue {
-    node_t *head;
-    node_t *tail;
+    _Alignas(64) _Atomic(node_t *) head;
+    _Alignas(64) _Atomic(node_t *) tail;
 } queue_t;
 
-void enqueue(queue_t *q, void *data) {
-    node_t *node = malloc(sizeof(node_t));
+typedef struct hp_record {
+    _Atomic(node_t *) hazard[HP_PER_THREAD];
+    atomic_bool active;
+    size_t retired_count;
+    node_t *retired[HP_RETIRE_THRESHOLD];
+} hp_record_t;
+
+static hp_record_t hp_records[HP_MAX_THREADS];
+static _Thread_local hp_record_t *hp_self;
+
+static hp_record_t *hp_get(void) {
+    if (hp_self) return hp_self;
+    for (int i = 0; i < HP_MAX_THREADS; i++) {
+        bool expected = false;
+        if (atomic_compare_exchange_strong(&hp_records[i].active, &expected, true)) {
+            hp_self = &hp_records[i];
+            return hp_self;
+        }
+    }
+    abort(); /* More than HP_MAX_THREADS threads use queues at once */
+}
+
+/* Publishes a hazard pointer to *src and re-reads it until the two agree */
+static node_t *hp_protect(hp_record_t *rec, int slot, _Atomic(node_t *) *src) {
+    node_t *p = atomic_load_explicit(src, memory_order_acquire);
+    for (;;) {
+        atomic_store_explicit(&rec->hazard[slot], p, memory_order_seq_cst);
+        node_t *again = atomic_load_explicit(src, memory_order_seq_cst);
+        if (again == p) return p;
+        p = again;
+    }
+}
+
+static void hp_clear(hp_record_t *rec) {
+    for (int slot = 0; slot < HP_PER_THREAD; slot++) {
+        atomic_store_explicit(&rec->hazard[slot], NULL, memory_order_release);
+    }
+}
+
+static int hp_compare(const void *a, const void *b) {
+    const node_t *x = *(node_t *const *)a, *y = *(node_t *const *)b;
+    return (x > y) - (x < y);
+}
+
+/* Frees every retired node no thread currently protects */
+static void hp_scan(hp_record_t *rec) {
+    node_t *hazards[HP_MAX_THREADS * HP_PER_THREAD];
+    size_t count = 0;
+    for (int i = 0; i < HP_MAX_THREADS; i++) {
+        for (int slot = 0; slot < HP_PER_THREAD; slot++) {
+            node_t *p = atomic_load_explicit(&hp_records[i].hazard[slot], memory_order_seq_cst);
+            if (p) hazards[count++] = p;
+        }
+    }
+    qsort(hazards, count, sizeof(hazards[0]), hp_compare);
+    size_t kept = 0;
+    for (size_t i = 0; i < rec->retired_count; i++) {
+        node_t *p = rec->retired[i];
+        if (bsearch(&p, hazards, count, sizeof(hazards[0]), hp_compare)) {
+            rec->retired[kept++] = p;
+        } else {
+            free(p);
+        }
+    }
+    rec->retired_count = kept;
+}
+
+static void hp_retire(hp_record_t *rec, node_t *node) {
+    rec->retired[rec->retired_count++] = node;
+    if (rec->retired_count == HP_RETIRE_THRESHOLD) hp_scan(rec);
+}
+
+/* Releases the calling thread's record; nodes still protected elsewhere
+ * stay on it and are freed by the next thread that takes it over. */
+void hp_thread_exit(void) {
+    if (!hp_self) return;
+    hp_clear(hp_self);
+    hp_scan(hp_self);
+    atomic_store(&hp_self->active, false);
+    hp_self = NULL;
+}
+
+int queue_init(queue_t *q) {
+    node_t *dummy = malloc(sizeof(*dummy));
+    if (!dummy) return -1;
+    dummy->data = NULL;
+    atomic_init(&dummy->next, NULL);
+    atomic_init(&q->head, dummy);
+    atomic_init(&q->tail, dummy);
+    return 0;
+}
+
+bool enqueue(queue_t *q, void *data) {
+    node_t *node = malloc(sizeof(*node));
+    if (!node) return false;
     node->data = data;
-    node->next = NULL;
-    node_t *last, *next;
-    while (1) {
-        last = q->tail;
-        next = last->next;
-        if (last == q->tail) {
-            if (next == NULL) {
-                if (__sync_bool_compare_and_swap(&last->next, next, node)) break;
-            } else {
-                __sync_bool_compare_and_swap(&q->tail, last, next);
-            }
+    atomic_init(&node->next, NULL);
+    hp_record_t *rec = hp_get();
+    for (;;) {
+        node_t *tail = hp_protect(rec, 0, &q->tail);
+        node_t *next = atomic_load_explicit(&tail->next, memory_order_acquire);
+        if (next != NULL) {
+            /* Tail is lagging: help the other enqueuer swing it */
+            atomic_compare_exchange_weak_explicit(&q->tail, &tail, next,
+                                                  memory_order_release, memory_order_relaxed);
+            continue;
+        }
+        if (atomic_compare_exchange_weak_explicit(&tail->next, &next, node,
+                                                  memory_order_release, memory_order_relaxed)) {
+            atomic_compare_exchange_strong_explicit(&q->tail, &tail, node,
+                                                    memory_order_release, memory_order_relaxed);
+            break;
+        }
+    }
+    hp_clear(rec);
+    return true;
+}
+
+bool dequeue(queue_t *q, void **data) {
+    hp_record_t *rec = hp_get();
+    node_t *head;
+    for (;;) {
+        head = hp_protect(rec, 0, &q->head);
+        node_t *tail = atomic_load_explicit(&q->tail, memory_order_acquire);
+        node_t *next = atomic_load_explicit(&head->next, memory_order_acquire);
+        atomic_store_explicit(&rec->hazard[1], next, memory_order_seq_cst);
+        /* Head unchanged means head was not retired, so next is still live */
+        if (head != atomic_load_explicit(&q->head, memory_order_seq_cst)) continue;
+        if (next == NULL) {
+            hp_clear(rec);
+            return false;
+        }
+        if (head == tail) {
+            atomic_compare_exchange_weak_explicit(&q->tail, &tail, next,
+                                                  memory_order_release, memory_order_relaxed);
+            continue;
+        }
+        void *value = next->data;
+        if (atomic_compare_exchange_strong_explicit(&q->head, &head, next,
+                                                    memory_order_acq_rel, memory_order_relaxed)) {
+            *data = value;
+            break;
         }
     }
-    __sync_bool_compare_and_swap(&q->tail, last, node);
+    hp_clear(rec);
+    hp_retire(rec, head);
+    return true;
+}
+
+/* Frees the remaining nodes; no other thread may use the queue any more */
+void queue_destroy(queue_t *q) {
+    node_t *node = atomic_load(&q->head);
+    while (node) {
+        node_t *next = atomic_load(&node->next);
+        free(node);
+        node = next;
+    }
+    if (hp_self) hp_scan(hp_self);
 }
 """
 
-    ARENA_ALLOCATOR = """
-/* Arena Allocator Implementation */
+    # Bounded alternative for specs that ask for a fixed-capacity queue
+    MPMC_RING_BUFFER = """
+/* Bounded MPMC Ring Buffer (Vyukov): one CAS per operation and no
+ * allocation after init. Each cell's sequence number says whether it is
+ * free for the producer or ready for the consumer at a given position. */
+#include <stdatomic.h>
+#include <stdbool.h>
+#include <stdint.h>
 #include <stdlib.h>
+
+typedef struct mpmc_cell {
+    _Atomic size_t sequence;
+    void *data;
+} mpmc_cell_t;
+
+typedef struct mpmc_ring {
+    mpmc_cell_t *cells;
+    size_t mask;
+    _Alignas(64) _Atomic size_t enqueue_pos;
+    _Alignas(64) _Atomic size_t dequeue_pos;
+} mpmc_ring_t;
+
+/* capacity must be a power of two, at least 2 */
+int mpmc_init(mpmc_ring_t *ring, size_t capacity) {
+    if (capacity < 2 || (capacity & (capacity - 1))) return -1;
+    ring->cells = malloc(capacity * sizeof(mpmc_cell_t));
+    if (!ring->cells) return -1;
+    for (size_t i = 0; i < capacity; i++) {
+        atomic_init(&ring->cells[i].sequence, i);
+    }
+    ring->mask = capacity - 1;
+    atomic_init(&ring->enqueue_pos, 0);
+    atomic_init(&ring->dequeue_pos, 0);
+    return 0;
+}
+
+/* Returns false when the ring is full */
+bool mpmc_enqueue(mpmc_ring_t *ring, void *data) {
+    mpmc_cell_t *cell;
+    size_t pos = atomic_load_explicit(&ring->enqueue_pos, memory_order_relaxed);
+    for (;;) {
+        cell = &ring->cells[pos & ring->mask];
+        size_t sequence = atomic_load_explicit(&cell->sequence, memory_order_acquire);
+        intptr_t diff = (intptr_t)sequence - (intptr_t)pos;
+        if (diff == 0) {
+            if (atomic_compare_exchange_weak_explicit(&ring->enqueue_pos, &pos, pos + 1,
+                                                      memory_order_relaxed, memory_order_relaxed)) break;
+        } else if (diff < 0) {
+            return false;
+        } else {
+            pos = atomic_load_explicit(&ring->enqueue_pos, memory_order_relaxed);
+        }
+    }
+    cell->data = data;
+    atomic_store_explicit(&cell->sequence, pos + 1, memory_order_release);
+    return true;
+}
+
+/* Returns false when the ring is empty */
+bool mpmc_dequeue(mpmc_ring_t *ring, void **data) {
+    mpmc_cell_t *cell;
+    size_t pos = atomic_load_explicit(&ring->dequeue_pos, memory_order_relaxed);
+    for (;;) {
+        cell = &ring->cells[pos & ring->mask];
+        size_t sequence = atomic_load_explicit(&cell->sequence, memory_order_acquire);
+        intptr_t diff = (intptr_t)sequence - (intptr_t)(pos + 1);
+        if (diff == 0) {
+            if (atomic_compare_exchange_weak_explicit(&ring->dequeue_pos, &pos, pos + 1,
+                                                      memory_order_relaxed, memory_order_relaxed)) break;
+        } else if (diff < 0) {
+            return false;
+        } else {
+            pos = atomic_load_explicit(&ring->dequeue_pos, memory_order_relaxed);
+        }
+    }
+    *data = cell->data;
+    atomic_store_explicit(&cell->sequence, pos + ring->mask + 1, memory_order_release);
+    return true;
+}
+
+void mpmc_destroy(mpmc_ring_t *ring) {
+    free(ring->cells);
+    ring->cells = NULL;
+}
+"""
+
+    # Throughput driver for both queues: <ms|ring> producers consumers items [capacity]
+    QUEUE_BENCHMARK = """
+/* Multi-threaded queue throughput benchmark */
+#include <pthread.h>
+#include <sched.h>
+#include <stdatomic.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+typedef struct queue_bench {
+    bool (*push)(void *queue, void *item);
+    bool (*pop)(void *queue, void **item);
+    void *queue;
+    long per_producer;
+    int producers;
+    atomic_int producers_done;
+    atomic_long consumed;
+    atomic_ullong checksum;
+} queue_bench_t;
+
+typedef struct queue_bench_arg {
+    queue_bench_t *bench;
+    long first;
+} queue_bench_arg_t;
+
+static bool queue_bench_ms_push(void *q, void *item) { return enqueue(q, item); }
+static bool queue_bench_ms_pop(void *q, void **item) { return dequeue(q, item); }
+static bool queue_bench_ring_push(void *q, void *item) { return mpmc_enqueue(q, item); }
+static bool queue_bench_ring_pop(void *q, void **item) { return mpmc_dequeue(q, item); }
+
+static void *queue_bench_producer(void *arg) {
+    queue_bench_arg_t *a = arg;
+    queue_bench_t *b = a->bench;
+    for (long i = 0; i < b->per_producer; i++) {
+        void *item = (void *)(uintptr_t)(a->first + i);
+        while (!b->push(b->queue, item)) sched_yield();
+    }
+    atomic_fetch_add(&b->producers_done, 1);
+    hp_thread_exit();
+    return NULL;
+}
+
+static void *queue_bench_consumer(void *arg) {
+    queue_bench_t *b = arg;
+    unsigned long long sum = 0;
+    long count = 0;
+    void *item;
+    for (;;) {
+        if (b->pop(b->queue, &item)) {
+            sum += (uintptr_t)item;
+            count++;
+        } else if (atomic_load(&b->producers_done) == b->producers) {
+            /* Every push has completed, so one more miss means empty for good */
+            if (!b->pop(b->queue, &item)) break;
+            sum += (uintptr_t)item;
+            count++;
+        } else {
+            sched_yield();
+        }
+    }
+    atomic_fetch_add(&b->consumed, count);
+    atomic_fetch_add(&b->checksum, sum);
+    hp_thread_exit();
+    return NULL;
+}
+
+int queue_benchmark_main(int argc, char **argv) {
+    const char *kind = argc > 1 ? argv[1] : "ms";
+    int producers = argc > 2 ? atoi(argv[2]) : 2;
+    int consumers = argc > 3 ? atoi(argv[3]) : 2;
+    long items = argc > 4 ? atol(argv[4]) : 1000000;
+    size_t capacity = argc > 5 ? (size_t)atol(argv[5]) : 1024;
+    if (producers < 1 || consumers < 1) return 2;
+
+    queue_t ms;
+    mpmc_ring_t ring;
+    queue_bench_t bench = {0};
+    if (strcmp(kind, "ring") == 0) {
+        if (mpmc_init(&ring, capacity) != 0) return 2;
+        bench.push = queue_bench_ring_push;
+        bench.pop = queue_bench_ring_pop;
+        bench.queue = &ring;
+    } else {
+        if (queue_init(&ms) != 0) return 2;
+        bench.push = queue_bench_ms_push;
+        bench.pop = queue_bench_ms_pop;
+        bench.queue = &ms;
+    }
+    bench.per_producer = items / producers;
+    bench.producers = producers;
+
+    pthread_t *threads = malloc((producers + consumers) * sizeof(pthread_t));
+    queue_bench_arg_t *args = malloc(producers * sizeof(queue_bench_arg_t));
+    struct timespec start, end;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    for (int i = 0; i < consumers; i++) pthread_create(&threads[i], NULL, queue_bench_consumer, &bench);
+    for (int i = 0; i < producers; i++) {
+        args[i].bench = &bench;
+        args[i].first = 1 + i * bench.per_producer;
+        pthread_create(&threads[consumers + i], NULL, queue_bench_producer, &args[i]);
+    }
+    for (int i = 0; i < producers + consumers; i++) pthread_join(threads[i], NULL);
+    clock_gettime(CLOCK_MONOTONIC, &end);
+
+    long total = bench.per_producer * producers;
+    unsigned long long expected = (unsigned long long)total * (total + 1) / 2;
+    double seconds = (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+    int ok = atomic_load(&bench.consumed) == total && atomic_load(&bench.checksum) == expected;
+    printf("queue=%s producers=%d consumers=%d items=%ld seconds=%.4f ops_per_sec=%.0f ok=%d\\n",
+           kind, producers, consumers, total, seconds, total / seconds, ok);
+    if (bench.queue == &ring) mpmc_destroy(&ring); else queue_destroy(&ms);
+    free(threads);
+    free(args);
+    return ok ? 0 : 1;
+}
+"""
+
+    ARENA_ALLOCATOR = """
+/* Arena Allocator Implementation: bump allocation from a chain of blocks
+ * that doubles in size whenever the current block is full, so allocation
+ * only fails when malloc does. Every pointer is aligned to max_align_t, or
+ * to any power of two with arena_alloc_aligned. */
+#include <stdalign.h>
 #include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
 
-typedef struct Arena {
-    char *buffer;
+typedef struct ArenaBlock {
+    struct ArenaBlock *next;  /* Older, smaller blocks */
     size_t size;
     size_t offset;
+    alignas(max_align_t) char data[];
+} ArenaBlock;
+
+typedef struct Arena {
+    ArenaBlock *head;
+    size_t block_size;  /* Size of the next block */
 } Arena;
 
+static ArenaBlock *arena_block_new(size_t size, ArenaBlock *next) {
+    ArenaBlock *block = malloc(sizeof(ArenaBlock) + size);
+    if (!block) return NULL;
+    block->next = next;
+    block->size = size;
+    block->offset = 0;
+    return block;
+}
+
 Arena* arena_init(size_t size) {
     Arena *arena = malloc(sizeof(Arena));
-    arena->buffer = malloc(size);
-    arena->size = size;
-    arena->offset = 0;
+    if (!arena) return NULL;
+    arena->block_size = size ? size : 4096;
+    arena->head = arena_block_new(arena->block_size, NULL);
+    if (!arena->head) {
+        free(arena);
+        return NULL;
+    }
     return arena;
 }
 
+/* `align` must be a power of two */
+void* arena_alloc_aligned(Arena *arena, size_t size, size_t align) {
+    ArenaBlock *block = arena->head;
+    uintptr_t start = (uintptr_t)block->data;
+    uintptr_t aligned = (start + block->offset + align - 1) & ~(uintptr_t)(align - 1);
+    if (aligned + size > start + block->size) {
+        size_t grown = arena->block_size * 2;
+        while (grown < size + align) grown *= 2;
+        block = arena_block_new(grown, arena->head);
+        if (!block) return NULL;
+        arena->head = block;
+        arena->block_size = grown;
+        start = (uintptr_t)block->data;
+        aligned = (start + align - 1) & ~(uintptr_t)(align - 1);
+    }
+    block->offset = aligned + size - start;
+    return (void *)aligned;
+}
+
 void* arena_alloc(Arena *arena, size_t size) {
-    if (arena->offset + size > arena->size) return NULL;
-    void *ptr = &arena->buffer[arena->offset];
-    arena->offset += size;
-    return ptr;
+    return arena_alloc_aligned(arena, size, alignof(max_align_t));
 }
 
+/* Frees everything at once, keeping only the newest (largest) block */
 void arena_reset(Arena *arena) {
-    arena->offset = 0;
+    ArenaBlock *older = arena->head->next;
+    while (older) {
+        ArenaBlock *next = older->next;
+        free(older);
+        older = next;
+    }
+    arena->head->next = NULL;
+    arena->head->offset = 0;
 }
 
 void arena_destroy(Arena *arena) {
-    free(arena->buffer);
+    arena_reset(arena);
+    free(arena->head);
     free(arena);
 }
+"""
+
+    # Section 7.1: Size-class Slab Allocator
+    SLAB_ALLOCATOR = """
+/* Slab Allocator (Section 7.1): 28 size classes from 16 bytes to 4 KiB
+ * (16-byte steps to 128, then four per doubling). Each thread allocates
+ * from and frees into its own per-class cache without locking; caches
+ * exchange fixed-size batches with a global list per class and refill from
+ * 64 KiB slabs carved out of a chain of chunks that double in size as the
+ * heap grows. Frees are sized (pass the size given to slab_alloc). Blocks
+ * are 16-byte aligned; power-of-two classes are aligned to their size, so
+ * slab_alloc_aligned serves alignments up to 4 KiB from slabs. */
+#include <pthread.h>
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+#define SLAB_MAX_SIZE 4096
+#define SLAB_CLASSES 28
+#define SLAB_SIZE (64 * 1024)
+#define SLAB_BATCH 32
+#define SLAB_CHUNK_MIN (1024 * 1024)
+#define SLAB_CHUNK_MAX (64 * 1024 * 1024)
+
+typedef struct slab_chunk {
+    struct slab_chunk *next;
+} slab_chunk_t;
+
+/* Free blocks: word 0 links blocks within a batch, word 1 links batches */
+typedef struct slab_node {
+    struct slab_node *next;
+    struct slab_node *next_batch;
+} slab_node_t;
+
+typedef struct {
+    pthread_mutex_t lock;
+    slab_node_t *batches;
+} slab_class_t;
+
+typedef struct {
+    slab_node_t *head[SLAB_CLASSES];
+    unsigned count[SLAB_CLASSES];
+    bool registered;
+} slab_cache_t;
+
+static slab_class_t slab_classes[SLAB_CLASSES];
+static pthread_mutex_t slab_heap_lock = PTHREAD_MUTEX_INITIALIZER;
+static slab_chunk_t *slab_chunks;
+static char *slab_bump, *slab_bump_end;
+static size_t slab_next_chunk = SLAB_CHUNK_MIN;
+static pthread_once_t slab_once = PTHREAD_ONCE_INIT;
+static pthread_key_t slab_key;
+static _Thread_local slab_cache_t slab_local;
+
+static int slab_class_of(size_t size) {
+    if (size <= 128) return size ? (int)((size + 15) / 16) - 1 : 0;
+    int bit = 63 - __builtin_clzll((unsigned long long)(size - 1));
+    return 8 + (bit - 7) * 4 + (int)((size - 1) >> (bit - 2)) - 4;
+}
+
+static size_t slab_class_size(int index) {
+    if (index < 8) return (size_t)(index + 1) * 16;
+    int bit = 7 + (index - 8) / 4;
+    return (size_t)((index - 8) % 4 + 5) << (bit - 2);
+}
+
+static void slab_flush_class(slab_cache_t *cache, int index, unsigned keep) {
+    while (cache->count[index] > keep) {
+        /* Cut off up to one batch and hand it to the global list */
+        slab_node_t *batch = cache->head[index], *last = batch;
+        unsigned n = 1;
+        while (n < SLAB_BATCH && n < cache->count[index] - keep) {
+            last = last->next;
+            n++;
+        }
+        cache->head[index] = last->next;
+        cache->count[index] -= n;
+        last->next = NULL;
+        slab_class_t *cls = &slab_classes[index];
+        pthread_mutex_lock(&cls->lock);
+        batch->next_batch = cls->batches;
+        cls->batches = batch;
+        pthread_mutex_unlock(&cls->lock);
+    }
+}
+
+static void slab_thread_exit(void *arg) {
+    slab_cache_t *cache = arg;
+    for (int i = 0; i < SLAB_CLASSES; i++) slab_flush_class(cache, i, 0);
+    cache->registered = false;
+}
+
+static void slab_init(void) {
+    for (int i = 0; i < SLAB_CLASSES; i++) pthread_mutex_init(&slab_classes[i].lock, NULL);
+    pthread_key_create(&slab_key, slab_thread_exit);
+}
+
+/* A fresh SLAB_SIZE piece of the current chunk, chaining a bigger chunk
+ * when it is used up */
+static char *slab_new_slab(void) {
+    pthread_mutex_lock(&slab_heap_lock);
+    if (slab_bump == slab_bump_end) {
+        slab_chunk_t *chunk = aligned_alloc(SLAB_SIZE, slab_next_chunk);
+        if (!chunk) {
+            pthread_mutex_unlock(&slab_heap_lock);
+            return NULL;
+        }
+        chunk->next = slab_chunks;
+        slab_chunks = chunk;
+        /* The first slab holds the chunk link */
+        slab_bump = (char *)chunk + SLAB_SIZE;
+        slab_bump_end = (char *)chunk + slab_next_chunk;
+        if (slab_next_chunk < SLAB_CHUNK_MAX) slab_next_chunk *= 2;
+    }
+    char *slab = slab_bump;
+    slab_bump += SLAB_SIZE;
+    pthread_mutex_unlock(&slab_heap_lock);
+    return slab;
+}
+
+static slab_node_t *slab_refill(slab_cache_t *cache, int index) {
+    slab_class_t *cls = &slab_classes[index];
+    pthread_mutex_lock(&cls->lock);
+    slab_node_t *batch = cls->batches;
+    if (batch) cls->batches = batch->next_batch;
+    pthread_mutex_unlock(&cls->lock);
+    if (batch) {
+        unsigned n = 0;
+        for (slab_node_t *node = batch; node; node = node->next) n++;
+        cache->head[index] = batch;
+        cache->count[index] = n;
+        return batch;
+    }
+    char *slab = slab_new_slab();
+    if (!slab) return NULL;
+    size_t size = slab_class_size(index);
+    size_t n = SLAB_SIZE / size;
+    slab_node_t *head = NULL;
+    for (size_t i = n; i-- > 0;) {
+        slab_node_t *node = (slab_node_t *)(slab + i * size);
+        node->next = head;
+        head = node;
+    }
+    cache->head[index] = head;
+    cache->count[index] = (unsigned)n;
+    return head;
+}
+
+static slab_cache_t *slab_cache(void) {
+    slab_cache_t *cache = &slab_local;
+    if (!cache->registered) {
+        pthread_once(&slab_once, slab_init);
+        /* Returns the cache to the global lists when the thread exits */
+        pthread_setspecific(slab_key, cache);
+        cache->registered = true;
+    }
+    return cache;
+}
+
+void *slab_alloc(size_t size) {
+    if (size > SLAB_MAX_SIZE) return malloc(size);
+    int index = slab_class_of(size);
+    slab_cache_t *cache = slab_cache();
+    slab_node_t *node = cache->head[index];
+    if (!node && !(node = slab_refill(cache, index))) return NULL;
+    cache->head[index] = node->next;
+    cache->count[index]--;
+    return node;
+}
+
+void slab_free(void *ptr, size_t size) {
+    if (!ptr) return;
+    if (size > SLAB_MAX_SIZE) {
+        free(ptr);
+        return;
+    }
+    int index = slab_class_of(size);
+    slab_cache_t *cache = slab_cache();
+    slab_node_t *node = ptr;
+    node->next = cache->head[index];
+    cache->head[index] = node;
+    if (++cache->count[index] >= 2 * SLAB_BATCH) slab_flush_class(cache, index, SLAB_BATCH);
+}
+
+static size_t slab_aligned_size(size_t size, size_t align) {
+    if (align <= 16) return size;
+    /* Power-of-two classes are aligned to their size */
+    size_t rounded = align;
+    while (rounded < size) rounded *= 2;
+    return rounded;
+}
+
+/* `align` must be a power of two; free with slab_free_aligned */
+void *slab_alloc_aligned(size_t size, size_t align) {
+    size_t rounded = slab_aligned_size(size, align);
+    if (rounded > SLAB_MAX_SIZE && align > 16) return aligned_alloc(align, (size + align - 1) & ~(align - 1));
+    return slab_alloc(rounded);
+}
+
+void slab_free_aligned(void *ptr, size_t size, size_t align) {
+    slab_free(ptr, slab_aligned_size(size, align));
+}
+
+/* Returns every chunk to the system. Only valid once nothing allocated from
+ * the slabs is in use and no other thread uses the allocator. */
+void slab_release_all(void) {
+    pthread_once(&slab_once, slab_init);
+    for (int i = 0; i < SLAB_CLASSES; i++) {
+        slab_local.head[i] = NULL;
+        slab_local.count[i] = 0;
+        slab_classes[i].batches = NULL;
+    }
+    pthread_mutex_lock(&slab_heap_lock);
+    while (slab_chunks) {
+        slab_chunk_t *next = slab_chunks->next;
+        free(slab_chunks);
+        slab_chunks = next;
+    }
+    slab_bump = slab_bump_end = NULL;
+    slab_next_chunk = SLAB_CHUNK_MIN;
+    pthread_mutex_unlock(&slab_heap_lock);
+}
 """
 
     OBJECT_POOL = """
@@ -123,6 +754,176 @@ void pool_destroy(ObjectPool *op) {
     free(op->used);
     free(op);
 }
+"""
+
+    # Allocation driver: threads ops [max_size]
+    ALLOC_BENCHMARK = """
+/* Allocator benchmark: glibc malloc vs slab, object pool and arena. "churn"
+ * keeps a window of live objects and replaces a random one per operation;
+ * "batch" allocates a whole window and releases it at once. Every block is
+ * tagged on allocation and checked on release to catch overlaps. */
+#include <pthread.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#define ALLOC_BENCH_WINDOW 1024
+#define ALLOC_BENCH_POOL_SIZE 64
+
+enum { ALLOC_MALLOC, ALLOC_SLAB, ALLOC_POOL, ALLOC_ARENA };
+static const char *alloc_bench_names[] = {"malloc", "slab", "pool", "arena"};
+
+typedef struct {
+    int strategy;
+    int batch;
+    long ops;
+    size_t max_size;
+    unsigned seed;
+    int ok;
+} alloc_bench_t;
+
+static size_t alloc_bench_size(alloc_bench_t *b, unsigned *rng) {
+    if (b->strategy == ALLOC_POOL) return ALLOC_BENCH_POOL_SIZE;
+    *rng = *rng * 1103515245u + 12345u;
+    return 16 + (*rng >> 8) % (b->max_size - 15);
+}
+
+static void alloc_bench_tag(char *p, size_t size, unsigned char tag) {
+    p[0] = (char)tag;
+    p[size - 1] = (char)tag;
+}
+
+static int alloc_bench_check(const char *p, size_t size, unsigned char tag) {
+    return (unsigned char)p[0] == tag && (unsigned char)p[size - 1] == tag && ((uintptr_t)p & 15) == 0;
+}
+
+static void *alloc_bench_thread(void *arg) {
+    alloc_bench_t *b = arg;
+    char *live[ALLOC_BENCH_WINDOW] = {0};
+    size_t sizes[ALLOC_BENCH_WINDOW];
+    unsigned rng = b->seed;
+    ObjectPool *pool = b->strategy == ALLOC_POOL ? pool_init(ALLOC_BENCH_POOL_SIZE, ALLOC_BENCH_WINDOW) : NULL;
+    Arena *arena = b->strategy == ALLOC_ARENA ? arena_init(64 * 1024) : NULL;
+    b->ok = 1;
+
+    for (long done = 0; done < b->ops;) {
+        if (b->batch) {
+            for (int i = 0; i < ALLOC_BENCH_WINDOW && done < b->ops; i++, done++) {
+                size_t size = alloc_bench_size(b, &rng);
+                char *p = b->strategy == ALLOC_MALLOC ? malloc(size)
+                        : b->strategy == ALLOC_SLAB ? slab_alloc(size)
+                        : b->strategy == ALLOC_POOL ? pool_alloc(pool)
+                        : arena_alloc(arena, size);
+                if (!p) {
+                    b->ok = 0;
+                    return NULL;
+                }
+                alloc_bench_tag(p, size, (unsigned char)i);
+                live[i] = p;
+                sizes[i] = size;
+            }
+            for (int i = 0; i < ALLOC_BENCH_WINDOW && live[i]; i++) {
+                b->ok &= alloc_bench_check(live[i], sizes[i], (unsigned char)i);
+                if (b->strategy == ALLOC_MALLOC) free(live[i]);
+                else if (b->strategy == ALLOC_SLAB) slab_free(live[i], sizes[i]);
+                else if (b->strategy == ALLOC_POOL) pool_free(pool, live[i]);
+                live[i] = NULL;
+            }
+            if (arena) arena_reset(arena);
+        } else {
+            rng = rng * 1103515245u + 12345u;
+            int slot = (int)((rng >> 8) % ALLOC_BENCH_WINDOW);
+            if (live[slot]) {
+                b->ok &= alloc_bench_check(live[slot], sizes[slot], (unsigned char)slot);
+                if (b->strategy == ALLOC_MALLOC) free(live[slot]);
+                else if (b->strategy == ALLOC_SLAB) slab_free(live[slot], sizes[slot]);
+                else pool_free(pool, live[slot]);
+            }
+            size_t size = alloc_bench_size(b, &rng);
+            char *p = b->strategy == ALLOC_MALLOC ? malloc(size)
+                    : b->strategy == ALLOC_SLAB ? slab_alloc(size)
+                    : pool_alloc(pool);
+            if (!p) {
+                b->ok = 0;
+                return NULL;
+            }
+            alloc_bench_tag(p, size, (unsigned char)slot);
+            live[slot] = p;
+            sizes[slot] = size;
+            done++;
+        }
+    }
+    for (int i = 0; i < ALLOC_BENCH_WINDOW; i++) {
+        if (!live[i]) continue;
+        if (b->strategy == ALLOC_MALLOC) free(live[i]);
+        else if (b->strategy == ALLOC_SLAB) slab_free(live[i], sizes[i]);
+    }
+    if (pool) pool_destroy(pool);
+    if (arena) arena_destroy(arena);
+    return NULL;
+}
+
+static int alloc_bench_run(int strategy, int batch, int threads, long ops, size_t max_size) {
+    pthread_t *ids = calloc(threads, sizeof(pthread_t));
+    alloc_bench_t *benches = calloc(threads, sizeof(alloc_bench_t));
+    if (!ids || !benches) return 0;
+    struct timespec start, end;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    for (int t = 0; t < threads; t++) {
+        benches[t] = (alloc_bench_t){strategy, batch, ops / threads, max_size, 2654435761u * (t + 1), 0};
+        pthread_create(&ids[t], NULL, alloc_bench_thread, &benches[t]);
+    }
+    int ok = 1;
+    for (int t = 0; t < threads; t++) {
+        pthread_join(ids[t], NULL);
+        ok &= benches[t].ok;
+    }
+    clock_gettime(CLOCK_MONOTONIC, &end);
+    double seconds = (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+    long total = ops / threads * threads;
+    printf("workload=%s strategy=%s threads=%d ops=%ld max_size=%zu seconds=%.4f ops_per_sec=%.0f ok=%d\\n",
+           batch ? "batch" : "churn", alloc_bench_names[strategy], threads, total,
+           strategy == ALLOC_POOL ? (size_t)ALLOC_BENCH_POOL_SIZE : max_size, seconds, total / seconds, ok);
+    free(ids);
+    free(benches);
+    return ok;
+}
+
+/* Alignment guarantees of slab_alloc_aligned and arena_alloc_aligned */
+static int alloc_bench_alignment(void) {
+    int ok = 1;
+    Arena *arena = arena_init(256);
+    for (size_t align = 16; align <= 8192; align *= 2) {
+        for (size_t size = 1; size <= 5000; size = size * 3 + 1) {
+            void *p = slab_alloc_aligned(size, align);
+            void *q = arena_alloc_aligned(arena, size, align);
+            ok &= p && q && ((uintptr_t)p & (align - 1)) == 0 && ((uintptr_t)q & (align - 1)) == 0;
+            slab_free_aligned(p, size, align);
+        }
+    }
+    arena_destroy(arena);
+    return ok;
+}
+
+int alloc_benchmark_main(int argc, char **argv) {
+    int threads = argc > 1 ? atoi(argv[1]) : 4;
+    long ops = argc > 2 ? atol(argv[2]) : 10000000;
+    size_t max_size = argc > 3 ? (size_t)atol(argv[3]) : 256;
+    if (threads < 1) threads = 1;
+    if (max_size < 16) max_size = 16;
+    int ok = alloc_bench_alignment();
+    printf("alignment ok=%d\\n", ok);
+    for (int strategy = ALLOC_MALLOC; strategy <= ALLOC_POOL; strategy++) {
+        ok &= alloc_bench_run(strategy, 0, threads, ops, max_size);
+    }
+    for (int strategy = ALLOC_MALLOC; strategy <= ALLOC_ARENA; strategy++) {
+        ok &= alloc_bench_run(strategy, 1, threads, ops, max_size);
+    }
+    slab_release_all();
+    return ok ? 0 : 1;
+}
 """
 
     REFERENCE_COUNTING = """
@@ -194,48 +995,430 @@ static inline void list_add(struct list_head *new, struct list_head *head) {
 """
 
     WORK_STEALING_SCHEDULER = """
-/* Work-stealing Scheduler Pattern (Section 6.1) */
+/* Work-stealing Scheduler (Section 6.1): one dynamic circular Chase-Lev
+ * deque per worker (C11 orderings after Le et al., PPoPP 2013), randomized
+ * victim selection, parking of idle workers, and fork-join (ws_spawn /
+ * ws_sync) plus ws_parallel_for on top. The thread calling ws_run() acts
+ * as worker 0 for the duration of the call. */
 #include <pthread.h>
+#include <sched.h>
+#include <stdatomic.h>
 #include <stdbool.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <unistd.h>
+
+#define WS_INITIAL_CAPACITY 64
+#define WS_SPINS_BEFORE_PARK 64
+
+typedef struct ws_array {
+    long size;
+    struct ws_array *retired;
+    _Atomic(void *) buffer[];
+} ws_array_t;
 
 typedef struct ws_deque {
-    void **buffer;
-    size_t size;
-    volatile long top, bottom;
+    _Alignas(64) atomic_long top;
+    _Alignas(64) atomic_long bottom;
+    _Atomic(ws_array_t *) array;
 } ws_deque_t;
 
-void ws_push(ws_deque_t *q, void *data) {
-    long b = q->bottom;
-    q->buffer[b % q->size] = data;
-    q->bottom = b + 1;
+typedef struct ws_group {
+    atomic_long pending;
+} ws_group_t;
+
+#define WS_GROUP_INIT {0}
+
+typedef struct ws_task {
+    void (*fn)(void *);
+    void *arg;
+    ws_group_t *group;
+} ws_task_t;
+
+typedef struct ws_pool ws_pool_t;
+
+typedef struct ws_worker {
+    ws_deque_t deque;
+    ws_pool_t *pool;
+    uint64_t rng;
+} ws_worker_t;
+
+struct ws_pool {
+    int count;
+    ws_worker_t *workers;
+    pthread_t *threads;
+    atomic_int sleeping;
+    atomic_bool shutdown;
+    pthread_mutex_t lock;
+    pthread_cond_t wake;
+    pthread_mutex_t run_lock;
+};
+
+static _Thread_local ws_worker_t *ws_self;
+
+static ws_array_t *ws_array_new(long size) {
+    ws_array_t *a = malloc(sizeof(ws_array_t) + size * sizeof(_Atomic(void *)));
+    if (!a) abort();
+    a->size = size;
+    a->retired = NULL;
+    return a;
+}
+
+static void ws_deque_init(ws_deque_t *q) {
+    atomic_init(&q->top, 0);
+    atomic_init(&q->bottom, 0);
+    atomic_init(&q->array, ws_array_new(WS_INITIAL_CAPACITY));
+}
+
+static void ws_deque_destroy(ws_deque_t *q) {
+    ws_array_t *a = atomic_load_explicit(&q->array, memory_order_relaxed);
+    while (a) {
+        ws_array_t *older = a->retired;
+        free(a);
+        a = older;
+    }
 }
 
-void* ws_pop(ws_deque_t *q) {
-    long b = q->bottom - 1;
-    q->bottom = b;
-    long t = q->top;
+/* Owner only. Thieves may still read the old array, so it is kept on the
+ * retired chain until the deque is destroyed. */
+static ws_array_t *ws_grow(ws_deque_t *q, ws_array_t *a, long top, long bottom) {
+    ws_array_t *bigger = ws_array_new(a->size * 2);
+    for (long i = top; i < bottom; i++) {
+        void *task = atomic_load_explicit(&a->buffer[i % a->size], memory_order_relaxed);
+        atomic_store_explicit(&bigger->buffer[i % bigger->size], task, memory_order_release);
+    }
+    bigger->retired = a;
+    atomic_store_explicit(&q->array, bigger, memory_order_release);
+    return bigger;
+}
+
+/* Owner only */
+static void ws_push(ws_deque_t *q, void *task) {
+    long b = atomic_load_explicit(&q->bottom, memory_order_relaxed);
+    long t = atomic_load_explicit(&q->top, memory_order_acquire);
+    ws_array_t *a = atomic_load_explicit(&q->array, memory_order_relaxed);
+    if (b - t > a->size - 1) a = ws_grow(q, a, t, b);
+    /* Release on the slot as well as bottom so the task contents are
+     * published to thieves (and visible to ThreadSanitizer, which does not
+     * model fences) */
+    atomic_store_explicit(&a->buffer[b % a->size], task, memory_order_release);
+    atomic_store_explicit(&q->bottom, b + 1, memory_order_release);
+}
+
+/* Owner only: LIFO end */
+static void *ws_take(ws_deque_t *q) {
+    long b = atomic_load_explicit(&q->bottom, memory_order_relaxed) - 1;
+    ws_array_t *a = atomic_load_explicit(&q->array, memory_order_relaxed);
+    atomic_store_explicit(&q->bottom, b, memory_order_relaxed);
+    atomic_thread_fence(memory_order_seq_cst);
+    long t = atomic_load_explicit(&q->top, memory_order_relaxed);
+    void *task = NULL;
     if (t <= b) {
-        void *data = q->buffer[b % q->size];
+        task = atomic_load_explicit(&a->buffer[b % a->size], memory_order_relaxed);
         if (t == b) {
-            if (!__sync_bool_compare_and_swap(&q->top, t, t + 1)) data = NULL;
-            q->bottom = t + 1;
+            /* Last task: race the thieves for it */
+            if (!atomic_compare_exchange_strong_explicit(&q->top, &t, t + 1,
+                                                         memory_order_seq_cst, memory_order_relaxed)) {
+                task = NULL;
+            }
+            atomic_store_explicit(&q->bottom, b + 1, memory_order_relaxed);
         }
-        return data;
+    } else {
+        atomic_store_explicit(&q->bottom, b + 1, memory_order_relaxed);
+    }
+    return task;
+}
+
+/* Any thread: FIFO end. NULL when empty or when another thief won. */
+static void *ws_steal(ws_deque_t *q) {
+    long t = atomic_load_explicit(&q->top, memory_order_acquire);
+    atomic_thread_fence(memory_order_seq_cst);
+    long b = atomic_load_explicit(&q->bottom, memory_order_acquire);
+    if (t >= b) return NULL;
+    ws_array_t *a = atomic_load_explicit(&q->array, memory_order_acquire);
+    void *task = atomic_load_explicit(&a->buffer[t % a->size], memory_order_acquire);
+    if (!atomic_compare_exchange_strong_explicit(&q->top, &t, t + 1,
+                                                 memory_order_seq_cst, memory_order_relaxed)) {
+        return NULL;
+    }
+    return task;
+}
+
+static uint64_t ws_random(ws_worker_t *w) {
+    /* xorshift64 */
+    w->rng ^= w->rng << 13;
+    w->rng ^= w->rng >> 7;
+    w->rng ^= w->rng << 17;
+    return w->rng;
+}
+
+static ws_task_t *ws_find_task(ws_worker_t *w) {
+    ws_task_t *task = ws_take(&w->deque);
+    if (task) return task;
+    ws_pool_t *pool = w->pool;
+    int start = (int)(ws_random(w) % (uint64_t)pool->count);
+    for (int i = 0; i < pool->count; i++) {
+        ws_worker_t *victim = &pool->workers[(start + i) % pool->count];
+        if (victim == w) continue;
+        task = ws_steal(&victim->deque);
+        if (task) return task;
     }
-    q->bottom = t;
     return NULL;
 }
 
-void* ws_steal(ws_deque_t *q) {
-    long t = q->top;
-    long b = q->bottom;
-    if (t < b) {
-        void *data = q->buffer[t % q->size];
-        if (!__sync_bool_compare_and_swap(&q->top, t, t + 1)) return NULL;
-        return data;
+static void ws_execute(ws_task_t *task) {
+    ws_group_t *group = task->group;
+    task->fn(task->arg);
+    free(task);
+    atomic_fetch_sub_explicit(&group->pending, 1, memory_order_release);
+}
+
+static bool ws_any_work(ws_pool_t *pool) {
+    for (int i = 0; i < pool->count; i++) {
+        ws_deque_t *q = &pool->workers[i].deque;
+        if (atomic_load(&q->bottom) > atomic_load(&q->top)) return true;
+    }
+    return false;
+}
+
+static void ws_notify(ws_pool_t *pool) {
+    /* Pairs with the sleeper's increment-then-check in ws_park */
+    atomic_thread_fence(memory_order_seq_cst);
+    if (atomic_load_explicit(&pool->sleeping, memory_order_relaxed) > 0) {
+        pthread_mutex_lock(&pool->lock);
+        pthread_cond_signal(&pool->wake);
+        pthread_mutex_unlock(&pool->lock);
+    }
+}
+
+static void ws_park(ws_pool_t *pool) {
+    pthread_mutex_lock(&pool->lock);
+    atomic_fetch_add(&pool->sleeping, 1);
+    if (!atomic_load(&pool->shutdown) && !ws_any_work(pool)) {
+        pthread_cond_wait(&pool->wake, &pool->lock);
+    }
+    atomic_fetch_sub(&pool->sleeping, 1);
+    pthread_mutex_unlock(&pool->lock);
+}
+
+static void *ws_worker_main(void *arg) {
+    ws_worker_t *w = arg;
+    ws_self = w;
+    int idle = 0;
+    while (!atomic_load_explicit(&w->pool->shutdown, memory_order_acquire)) {
+        ws_task_t *task = ws_find_task(w);
+        if (task) {
+            ws_execute(task);
+            idle = 0;
+        } else if (++idle < WS_SPINS_BEFORE_PARK) {
+            sched_yield();
+        } else {
+            ws_park(w->pool);
+            idle = 0;
+        }
     }
     return NULL;
 }
+
+/* Queues fn(arg) on the calling worker's deque, counted in `group`. Outside
+ * a pool (or out of memory) the call simply runs inline. */
+void ws_spawn(ws_group_t *group, void (*fn)(void *), void *arg) {
+    ws_worker_t *self = ws_self;
+    ws_task_t *task = self ? malloc(sizeof(ws_task_t)) : NULL;
+    if (!task) {
+        fn(arg);
+        return;
+    }
+    task->fn = fn;
+    task->arg = arg;
+    task->group = group;
+    atomic_fetch_add_explicit(&group->pending, 1, memory_order_relaxed);
+    ws_push(&self->deque, task);
+    ws_notify(self->pool);
+}
+
+/* Waits for every task spawned in `group`, running other tasks meanwhile */
+void ws_sync(ws_group_t *group) {
+    ws_worker_t *self = ws_self;
+    while (atomic_load_explicit(&group->pending, memory_order_acquire) > 0) {
+        ws_task_t *task = self ? ws_find_task(self) : NULL;
+        if (task) {
+            ws_execute(task);
+        } else {
+            sched_yield();
+        }
+    }
+}
+
+typedef struct ws_range {
+    long begin, end, grain;
+    void (*body)(long, long, void *);
+    void *ctx;
+} ws_range_t;
+
+void ws_parallel_for(long begin, long end, long grain, void (*body)(long, long, void *), void *ctx);
+
+static void ws_range_task(void *arg) {
+    ws_range_t range = *(ws_range_t *)arg;
+    free(arg);
+    ws_parallel_for(range.begin, range.end, range.grain, range.body, range.ctx);
+}
+
+/* Calls body(lo, hi, ctx) over [begin, end) in chunks of at most `grain`,
+ * splitting in halves so idle workers steal the largest pieces first */
+void ws_parallel_for(long begin, long end, long grain, void (*body)(long, long, void *), void *ctx) {
+    ws_group_t group = WS_GROUP_INIT;
+    if (grain < 1) grain = 1;
+    while (end - begin > grain) {
+        long mid = begin + (end - begin) / 2;
+        ws_range_t *right = malloc(sizeof(ws_range_t));
+        if (!right) break;
+        *right = (ws_range_t){mid, end, grain, body, ctx};
+        ws_spawn(&group, ws_range_task, right);
+        end = mid;
+    }
+    body(begin, end, ctx);
+    ws_sync(&group);
+}
+
+/* `workers` <= 0 means one per online CPU */
+ws_pool_t *ws_pool_create(int workers) {
+    if (workers <= 0) workers = (int)sysconf(_SC_NPROCESSORS_ONLN);
+    if (workers <= 0) workers = 1;
+    ws_pool_t *pool = calloc(1, sizeof(ws_pool_t));
+    if (!pool) return NULL;
+    pool->count = workers;
+    pool->workers = calloc(workers, sizeof(ws_worker_t));
+    pool->threads = calloc(workers, sizeof(pthread_t));
+    if (!pool->workers || !pool->threads) abort();
+    atomic_init(&pool->sleeping, 0);
+    atomic_init(&pool->shutdown, false);
+    pthread_mutex_init(&pool->lock, NULL);
+    pthread_cond_init(&pool->wake, NULL);
+    pthread_mutex_init(&pool->run_lock, NULL);
+    for (int i = 0; i < workers; i++) {
+        ws_deque_init(&pool->workers[i].deque);
+        pool->workers[i].pool = pool;
+        pool->workers[i].rng = 0x9E3779B97F4A7C15ULL * (uint64_t)(i + 1);
+    }
+    /* Worker 0 is whichever thread calls ws_run */
+    for (int i = 1; i < workers; i++) {
+        pthread_create(&pool->threads[i], NULL, ws_worker_main, &pool->workers[i]);
+    }
+    return pool;
+}
+
+/* Runs fn(arg) on the pool and returns once it (and everything it synced)
+ * has finished. Calls from inside the pool just run fn. */
+void ws_run(ws_pool_t *pool, void (*fn)(void *), void *arg) {
+    if (ws_self && ws_self->pool == pool) {
+        fn(arg);
+        return;
+    }
+    pthread_mutex_lock(&pool->run_lock);
+    ws_worker_t *previous = ws_self;
+    ws_self = &pool->workers[0];
+    fn(arg);
+    ws_self = previous;
+    pthread_mutex_unlock(&pool->run_lock);
+}
+
+void ws_pool_destroy(ws_pool_t *pool) {
+    atomic_store_explicit(&pool->shutdown, true, memory_order_release);
+    pthread_mutex_lock(&pool->lock);
+    pthread_cond_broadcast(&pool->wake);
+    pthread_mutex_unlock(&pool->lock);
+    for (int i = 1; i < pool->count; i++) pthread_join(pool->threads[i], NULL);
+    for (int i = 0; i < pool->count; i++) ws_deque_destroy(&pool->workers[i].deque);
+    pthread_mutex_destroy(&pool->lock);
+    pthread_cond_destroy(&pool->wake);
+    pthread_mutex_destroy(&pool->run_lock);
+    free(pool->workers);
+    free(pool->threads);
+    free(pool);
+}
+"""
+
+    # Scalability driver: workers fib_n items (fork-join fib and parallel_for)
+    WORK_STEALING_BENCHMARK = """
+/* Work-stealing scheduler benchmark: fine-grained fork-join and parallel_for */
+#include <stdatomic.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+typedef struct ws_bench_fib {
+    int n;
+    long result;
+} ws_bench_fib_t;
+
+static long ws_bench_serial_fib(int n) {
+    return n < 2 ? n : ws_bench_serial_fib(n - 1) + ws_bench_serial_fib(n - 2);
+}
+
+static void ws_bench_fib_task(void *arg) {
+    ws_bench_fib_t *f = arg;
+    if (f->n < 12) {
+        f->result = ws_bench_serial_fib(f->n);
+        return;
+    }
+    ws_bench_fib_t left = {f->n - 1, 0}, right = {f->n - 2, 0};
+    ws_group_t group = WS_GROUP_INIT;
+    ws_spawn(&group, ws_bench_fib_task, &left);
+    ws_bench_fib_task(&right);
+    ws_sync(&group);
+    f->result = left.result + right.result;
+}
+
+typedef struct ws_bench_sum {
+    long items;
+    atomic_long total;
+} ws_bench_sum_t;
+
+static void ws_bench_sum_body(long begin, long end, void *ctx) {
+    ws_bench_sum_t *sum = ctx;
+    long local = 0;
+    for (long i = begin; i < end; i++) local += (i * i) % 7;
+    atomic_fetch_add_explicit(&sum->total, local, memory_order_relaxed);
+}
+
+static void ws_bench_sum_task(void *arg) {
+    ws_bench_sum_t *sum = arg;
+    ws_parallel_for(0, sum->items, 4096, ws_bench_sum_body, sum);
+}
+
+static double ws_bench_seconds(struct timespec start) {
+    struct timespec end;
+    clock_gettime(CLOCK_MONOTONIC, &end);
+    return (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+}
+
+int ws_benchmark_main(int argc, char **argv) {
+    int workers = argc > 1 ? atoi(argv[1]) : 0;
+    int n = argc > 2 ? atoi(argv[2]) : 32;
+    long items = argc > 3 ? atol(argv[3]) : 50000000;
+    ws_pool_t *pool = ws_pool_create(workers);
+    if (!pool) return 2;
+
+    struct timespec start;
+    ws_bench_fib_t fib = {n, 0};
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    ws_run(pool, ws_bench_fib_task, &fib);
+    double fib_seconds = ws_bench_seconds(start);
+
+    ws_bench_sum_t sum = {items, 0};
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    ws_run(pool, ws_bench_sum_task, &sum);
+    double for_seconds = ws_bench_seconds(start);
+
+    long expected = 0;
+    for (long i = 0; i < items; i++) expected += (i * i) % 7;
+    int ok = fib.result == ws_bench_serial_fib(n) && atomic_load(&sum.total) == expected;
+    printf("workers=%d fib=%d fib_seconds=%.4f items=%ld for_seconds=%.4f ok=%d\\n",
+           pool->count, n, fib_seconds, items, for_seconds, ok);
+    ws_pool_destroy(pool);
+    return ok ? 0 : 1;
+}
 """
 
     COPY_ON_WRITE = """
@@ -263,16 +1446,634 @@ void* cow_fork_child(void *parent_ptr, size_t size) {
 #include <arpa/inet.h>
 #include <unistd.h>
 
+/* Returns a blocking listening socket on `port` (0: any free port), or -1 */
 int start_tcp_server(int port) {
+    int one = 1;
     int server_fd = socket(AF_INET, SOCK_STREAM, 0);
+    if (server_fd < 0) return -1;
     struct sockaddr_in address;
     address.sin_family = AF_INET;
     address.sin_addr.s_addr = INADDR_ANY;
     address.sin_port = htons(port);
-    bind(server_fd, (struct sockaddr *)&address, sizeof(address));
-    listen(server_fd, 3);
+    setsockopt(server_fd, SOL_SOCKET, SO_REUSEADDR, &one, sizeof(one));
+    if (bind(server_fd, (struct sockaddr *)&address, sizeof(address)) != 0 ||
+        listen(server_fd, SOMAXCONN) != 0) {
+        close(server_fd);
+        return -1;
+    }
     return server_fd;
 }
+"""
+
+    # Section 6.2: Event-loop Server (thousands of connections)
+    EPOLL_SERVER = """
+/* Event-loop TCP Server (Section 6.2): one edge-triggered epoll reactor per
+ * thread, each with its own SO_REUSEPORT listening socket so the kernel
+ * spreads connections across reactors without a shared accept lock.
+ * Sockets are non-blocking; every connection buffers partial input and
+ * pending output, and responses go out with writev (header and body
+ * without joining them) or sendfile (file bodies straight from the page
+ * cache). Linux only. */
+#include <errno.h>
+#include <fcntl.h>
+#include <netinet/in.h>
+#include <netinet/tcp.h>
+#include <pthread.h>
+#include <signal.h>
+#include <stdbool.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/epoll.h>
+#include <sys/eventfd.h>
+#include <sys/sendfile.h>
+#include <sys/socket.h>
+#include <sys/uio.h>
+#include <unistd.h>
+
+#define EV_MAX_EVENTS 256
+#define EV_READ_CHUNK 16384
+#define EV_MAX_REQUEST (1 << 20)
+#define EV_MAX_PENDING_OUTPUT (1 << 20)
+
+typedef struct ev_conn ev_conn_t;
+
+/* Handles buffered input: returns the number of bytes consumed (0 while a
+ * request is incomplete) or -1 to close the connection. Responses are
+ * queued with ev_conn_write, ev_conn_writev and ev_conn_sendfile. */
+typedef long (*ev_handler_t)(ev_conn_t *conn, const char *data, size_t len, void *ctx);
+
+typedef struct {
+    char *data;
+    size_t start, end, cap;
+} ev_buffer_t;
+
+typedef struct ev_reactor ev_reactor_t;
+
+struct ev_conn {
+    int fd;
+    ev_buffer_t in;
+    ev_buffer_t out;
+    int file_fd;            /* sendfile body queued after `out`, or -1 */
+    off_t file_offset;
+    size_t file_remaining;
+    bool closing;           /* peer stopped sending: close once output drains */
+    ev_reactor_t *reactor;
+    ev_conn_t *prev, *next;
+};
+
+typedef struct ev_server ev_server_t;
+
+struct ev_reactor {
+    int epoll_fd;
+    int listen_fd;
+    int wake_fd;
+    bool started;
+    pthread_t thread;
+    ev_server_t *server;
+    ev_conn_t *conns;
+};
+
+struct ev_server {
+    int port;
+    int reactor_count;
+    ev_reactor_t *reactors;
+    ev_handler_t handler;
+    void *ctx;
+};
+
+static int ev_buffer_reserve(ev_buffer_t *b, size_t extra) {
+    if (b->cap - b->end >= extra) return 0;
+    /* Compact before growing; an empty (possibly unallocated) buffer has
+     * nothing to move */
+    size_t used = b->end - b->start;
+    if (used) memmove(b->data, b->data + b->start, used);
+    b->start = 0;
+    b->end = used;
+    if (b->cap - used >= extra) return 0;
+    size_t cap = b->cap ? b->cap : 4096;
+    while (cap - used < extra) cap *= 2;
+    char *data = realloc(b->data, cap);
+    if (!data) return -1;
+    b->data = data;
+    b->cap = cap;
+    return 0;
+}
+
+static int ev_buffer_append(ev_buffer_t *b, const void *data, size_t len) {
+    if (ev_buffer_reserve(b, len) != 0) return -1;
+    memcpy(b->data + b->end, data, len);
+    b->end += len;
+    return 0;
+}
+
+/* Sends straight from the caller's buffers when nothing is queued ahead and
+ * keeps only what the socket did not take. -1 on error or while a
+ * sendfile body is still queued. */
+int ev_conn_writev(ev_conn_t *conn, const struct iovec *iov, int count) {
+    if (conn->file_fd >= 0) return -1;
+    size_t skip = 0;
+    if (conn->out.start == conn->out.end) {
+        ssize_t n;
+        do {
+            n = writev(conn->fd, iov, count);
+        } while (n < 0 && errno == EINTR);
+        if (n < 0 && errno != EAGAIN && errno != EWOULDBLOCK) return -1;
+        if (n > 0) skip = (size_t)n;
+    }
+    for (int i = 0; i < count; i++) {
+        if (skip >= iov[i].iov_len) {
+            skip -= iov[i].iov_len;
+            continue;
+        }
+        if (ev_buffer_append(&conn->out, (char *)iov[i].iov_base + skip, iov[i].iov_len - skip) != 0) return -1;
+        skip = 0;
+    }
+    return 0;
+}
+
+int ev_conn_write(ev_conn_t *conn, const void *data, size_t len) {
+    struct iovec iov = {(void *)data, len};
+    return ev_conn_writev(conn, &iov, 1);
+}
+
+/* Queues `count` bytes of `file_fd` from `offset` after the output already
+ * queued. The file is not closed and must stay open until sent. */
+int ev_conn_sendfile(ev_conn_t *conn, int file_fd, off_t offset, size_t count) {
+    if (conn->file_fd >= 0) return -1;
+    if (count == 0) return 0;
+    conn->file_fd = file_fd;
+    conn->file_offset = offset;
+    conn->file_remaining = count;
+    return 0;
+}
+
+/* 1 when everything queued is sent, 0 when the socket is full, -1 on error */
+static int ev_flush(ev_conn_t *conn) {
+    while (conn->out.start < conn->out.end) {
+        ssize_t n = write(conn->fd, conn->out.data + conn->out.start, conn->out.end - conn->out.start);
+        if (n < 0) {
+            if (errno == EINTR) continue;
+            return errno == EAGAIN || errno == EWOULDBLOCK ? 0 : -1;
+        }
+        conn->out.start += (size_t)n;
+    }
+    conn->out.start = conn->out.end = 0;
+    while (conn->file_fd >= 0) {
+        ssize_t n = sendfile(conn->fd, conn->file_fd, &conn->file_offset, conn->file_remaining);
+        if (n < 0) {
+            if (errno == EINTR) continue;
+            return errno == EAGAIN || errno == EWOULDBLOCK ? 0 : -1;
+        }
+        if (n == 0) return -1; /* File shorter than announced */
+        conn->file_remaining -= (size_t)n;
+        if (conn->file_remaining == 0) conn->file_fd = -1;
+    }
+    return 1;
+}
+
+/* 1 after reading data, 0 when the socket would block or the peer closed
+ * (sets `closing`), -1 on error or an oversized request */
+static int ev_read(ev_conn_t *conn) {
+    if (conn->in.end - conn->in.start >= EV_MAX_REQUEST) return -1;
+    if (ev_buffer_reserve(&conn->in, EV_READ_CHUNK) != 0) return -1;
+    for (;;) {
+        ssize_t n = read(conn->fd, conn->in.data + conn->in.end, conn->in.cap - conn->in.end);
+        if (n > 0) {
+            conn->in.end += (size_t)n;
+            return 1;
+        }
+        if (n == 0) {
+            conn->closing = true;
+            return 0;
+        }
+        if (errno == EINTR) continue;
+        return errno == EAGAIN || errno == EWOULDBLOCK ? 0 : -1;
+    }
+}
+
+static int ev_handle_input(ev_conn_t *conn) {
+    ev_server_t *server = conn->reactor->server;
+    /* Requests queued behind a sendfile body wait until it is sent */
+    while (conn->file_fd < 0 && conn->in.start < conn->in.end) {
+        long used = server->handler(conn, conn->in.data + conn->in.start, conn->in.end - conn->in.start, server->ctx);
+        if (used < 0) return -1;
+        if (used == 0) break;
+        conn->in.start += (size_t)used;
+    }
+    return 0;
+}
+
+static void ev_close(ev_conn_t *conn) {
+    ev_reactor_t *reactor = conn->reactor;
+    if (conn->prev) conn->prev->next = conn->next;
+    else reactor->conns = conn->next;
+    if (conn->next) conn->next->prev = conn->prev;
+    close(conn->fd); /* Also removes it from the epoll set */
+    free(conn->in.data);
+    free(conn->out.data);
+    free(conn);
+}
+
+/* Edge-triggered: keep going until reads would block. The only early
+ * return is while output is backed up, where the next EPOLLOUT edge
+ * resumes reading. */
+static void ev_service(ev_conn_t *conn) {
+    for (;;) {
+        int flushed = ev_flush(conn);
+        if (flushed < 0) break;
+        if (!flushed && (conn->file_fd >= 0 || conn->out.end - conn->out.start > EV_MAX_PENDING_OUTPUT)) return;
+        if (conn->closing) {
+            if (flushed) break;
+            return;
+        }
+        int status = ev_read(conn);
+        if (status < 0 || ev_handle_input(conn) < 0) break;
+        if (status == 0 && !conn->closing) {
+            if (ev_flush(conn) < 0) break;
+            return;
+        }
+    }
+    ev_close(conn);
+}
+
+static void ev_accept(ev_reactor_t *reactor) {
+    int one = 1;
+    for (;;) {
+        int fd = accept(reactor->listen_fd, NULL, NULL);
+        if (fd < 0) {
+            if (errno == EINTR || errno == ECONNABORTED) continue;
+            return; /* Drained (EAGAIN), or out of descriptors until the next edge */
+        }
+        ev_conn_t *conn = calloc(1, sizeof(ev_conn_t));
+        if (!conn || fcntl(fd, F_SETFL, fcntl(fd, F_GETFL) | O_NONBLOCK) != 0) {
+            free(conn);
+            close(fd);
+            continue;
+        }
+        setsockopt(fd, IPPROTO_TCP, TCP_NODELAY, &one, sizeof(one));
+        conn->fd = fd;
+        conn->file_fd = -1;
+        conn->reactor = reactor;
+        conn->next = reactor->conns;
+        if (conn->next) conn->next->prev = conn;
+        reactor->conns = conn;
+        struct epoll_event event = {.events = EPOLLIN | EPOLLOUT | EPOLLRDHUP | EPOLLET, .data.ptr = conn};
+        if (epoll_ctl(reactor->epoll_fd, EPOLL_CTL_ADD, fd, &event) != 0) ev_close(conn);
+    }
+}
+
+static void *ev_reactor_main(void *arg) {
+    ev_reactor_t *reactor = arg;
+    struct epoll_event events[EV_MAX_EVENTS];
+    for (;;) {
+        int n = epoll_wait(reactor->epoll_fd, events, EV_MAX_EVENTS, -1);
+        if (n < 0) {
+            if (errno == EINTR) continue;
+            return NULL;
+        }
+        for (int i = 0; i < n; i++) {
+            void *source = events[i].data.ptr;
+            if (source == &reactor->wake_fd) return NULL;
+            if (source == &reactor->listen_fd) ev_accept(reactor);
+            else ev_service(source);
+        }
+    }
+}
+
+static int ev_listen(int port) {
+    int one = 1;
+    int fd = socket(AF_INET, SOCK_STREAM | SOCK_NONBLOCK, 0);
+    if (fd < 0) return -1;
+    struct sockaddr_in address = {.sin_family = AF_INET, .sin_port = htons(port), .sin_addr.s_addr = htonl(INADDR_ANY)};
+    if (setsockopt(fd, SOL_SOCKET, SO_REUSEADDR, &one, sizeof(one)) != 0 ||
+        setsockopt(fd, SOL_SOCKET, SO_REUSEPORT, &one, sizeof(one)) != 0 ||
+        bind(fd, (struct sockaddr *)&address, sizeof(address)) != 0 || listen(fd, SOMAXCONN) != 0) {
+        close(fd);
+        return -1;
+    }
+    return fd;
+}
+
+void ev_server_stop(ev_server_t *server) {
+    uint64_t one = 1;
+    for (int i = 0; i < server->reactor_count; i++) {
+        ev_reactor_t *reactor = &server->reactors[i];
+        if (reactor->started && write(reactor->wake_fd, &one, sizeof(one)) == sizeof(one)) {
+            pthread_join(reactor->thread, NULL);
+        }
+        while (reactor->conns) ev_close(reactor->conns);
+        if (reactor->listen_fd >= 0) close(reactor->listen_fd);
+        if (reactor->wake_fd >= 0) close(reactor->wake_fd);
+        if (reactor->epoll_fd >= 0) close(reactor->epoll_fd);
+    }
+    free(server->reactors);
+    free(server);
+}
+
+/* Serves `port` (0 picks a free one, see server->port) with `reactors`
+ * threads (<= 0: one per online CPU). Returns NULL on failure. */
+ev_server_t *ev_server_start(int port, int reactors, ev_handler_t handler, void *ctx) {
+    if (reactors <= 0) reactors = (int)sysconf(_SC_NPROCESSORS_ONLN);
+    if (reactors <= 0) reactors = 1;
+    /* Peers that disconnect mid-response must not kill the process */
+    signal(SIGPIPE, SIG_IGN);
+    ev_server_t *server = calloc(1, sizeof(ev_server_t));
+    if (!server) return NULL;
+    server->reactors = calloc(reactors, sizeof(ev_reactor_t));
+    if (!server->reactors) {
+        free(server);
+        return NULL;
+    }
+    server->handler = handler;
+    server->ctx = ctx;
+    for (int i = 0; i < reactors; i++) {
+        ev_reactor_t *reactor = &server->reactors[i];
+        reactor->server = server;
+        reactor->listen_fd = reactor->wake_fd = reactor->epoll_fd = -1;
+        server->reactor_count = i + 1;
+        reactor->listen_fd = ev_listen(port);
+        if (reactor->listen_fd < 0) goto fail;
+        if (port == 0) {
+            /* The other reactors join the port the first one was given */
+            struct sockaddr_in bound;
+            socklen_t size = sizeof(bound);
+            if (getsockname(reactor->listen_fd, (struct sockaddr *)&bound, &size) != 0) goto fail;
+            port = ntohs(bound.sin_port);
+        }
+        reactor->epoll_fd = epoll_create1(0);
+        reactor->wake_fd = eventfd(0, EFD_NONBLOCK);
+        if (reactor->epoll_fd < 0 || reactor->wake_fd < 0) goto fail;
+        struct epoll_event listen_event = {.events = EPOLLIN | EPOLLET, .data.ptr = &reactor->listen_fd};
+        struct epoll_event wake_event = {.events = EPOLLIN, .data.ptr = &reactor->wake_fd};
+        if (epoll_ctl(reactor->epoll_fd, EPOLL_CTL_ADD, reactor->listen_fd, &listen_event) != 0 ||
+            epoll_ctl(reactor->epoll_fd, EPOLL_CTL_ADD, reactor->wake_fd, &wake_event) != 0) goto fail;
+        if (pthread_create(&reactor->thread, NULL, ev_reactor_main, reactor) != 0) goto fail;
+        reactor->started = true;
+    }
+    server->port = port;
+    return server;
+fail:
+    ev_server_stop(server);
+    return NULL;
+}
+"""
+
+    # Load generator: <epoll|blocking> connections requests body_size [reactors] [client_threads]
+    NET_BENCHMARK = """
+/* Event-loop vs blocking server benchmark: a local load generator keeps
+ * `connections` connections open and sends `requests` requests on each,
+ * pipelined across the connections of every client thread */
+#include <arpa/inet.h>
+#include <netinet/in.h>
+#include <netinet/tcp.h>
+#include <pthread.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/resource.h>
+#include <sys/socket.h>
+#include <sys/uio.h>
+#include <time.h>
+#include <unistd.h>
+
+#define NET_BENCH_MAGIC 0x4e455855u
+#define NET_BENCH_SENDFILE_MIN 16384
+
+/* Response: 8-byte header (magic, body length; big-endian) then the body */
+typedef struct {
+    uint32_t header[2];
+    char *data;
+    size_t size;
+    int file_fd;  /* The same bytes in an unlinked temporary file */
+} net_bench_body_t;
+
+static long net_bench_epoll_handler(ev_conn_t *conn, const char *data, size_t len, void *ctx) {
+    net_bench_body_t *body = ctx;
+    if (len < 4) return 0;
+    if (memcmp(data, "GET\\n", 4) != 0) return -1;
+    if (body->size >= NET_BENCH_SENDFILE_MIN) {
+        if (ev_conn_write(conn, body->header, sizeof(body->header)) != 0) return -1;
+        if (ev_conn_sendfile(conn, body->file_fd, 0, body->size) != 0) return -1;
+    } else {
+        struct iovec iov[2] = {{body->header, sizeof(body->header)}, {body->data, body->size}};
+        if (ev_conn_writev(conn, iov, 2) != 0) return -1;
+    }
+    return 4;
+}
+
+static int net_bench_read_full(int fd, char *buffer, size_t len) {
+    while (len > 0) {
+        ssize_t n = read(fd, buffer, len);
+        if (n <= 0) return -1;
+        buffer += n;
+        len -= (size_t)n;
+    }
+    return 0;
+}
+
+static int net_bench_write_full(int fd, const char *buffer, size_t len) {
+    while (len > 0) {
+        ssize_t n = write(fd, buffer, len);
+        if (n <= 0) return -1;
+        buffer += n;
+        len -= (size_t)n;
+    }
+    return 0;
+}
+
+typedef struct {
+    int listen_fd;
+    net_bench_body_t *body;
+    pthread_mutex_t lock;
+    pthread_cond_t idle;
+    int sessions;  /* Live connection threads */
+} net_bench_acceptor_t;
+
+typedef struct {
+    int fd;
+    net_bench_acceptor_t *acceptor;
+} net_bench_session_t;
+
+static void net_bench_session_exit(net_bench_acceptor_t *acceptor) {
+    pthread_mutex_lock(&acceptor->lock);
+    if (--acceptor->sessions == 0) pthread_cond_broadcast(&acceptor->idle);
+    pthread_mutex_unlock(&acceptor->lock);
+}
+
+/* Blocking server: one thread per connection */
+static void *net_bench_blocking_session(void *arg) {
+    net_bench_session_t session = *(net_bench_session_t *)arg;
+    net_bench_body_t *body = session.acceptor->body;
+    free(arg);
+    char request[4];
+    while (net_bench_read_full(session.fd, request, sizeof(request)) == 0) {
+        if (net_bench_write_full(session.fd, (char *)body->header, sizeof(body->header)) != 0 ||
+            net_bench_write_full(session.fd, body->data, body->size) != 0) break;
+    }
+    close(session.fd);
+    net_bench_session_exit(session.acceptor);
+    return NULL;
+}
+
+static void *net_bench_blocking_accept(void *arg) {
+    net_bench_acceptor_t *acceptor = arg;
+    pthread_attr_t attr;
+    pthread_attr_init(&attr);
+    pthread_attr_setdetachstate(&attr, PTHREAD_CREATE_DETACHED);
+    pthread_attr_setstacksize(&attr, 1 << 16);
+    int one = 1;
+    for (;;) {
+        int fd = accept(acceptor->listen_fd, NULL, NULL);
+        if (fd < 0) break; /* Listening socket shut down */
+        setsockopt(fd, IPPROTO_TCP, TCP_NODELAY, &one, sizeof(one));
+        net_bench_session_t *session = malloc(sizeof(net_bench_session_t));
+        pthread_t thread;
+        if (!session) {
+            close(fd);
+            continue;
+        }
+        *session = (net_bench_session_t){fd, acceptor};
+        pthread_mutex_lock(&acceptor->lock);
+        acceptor->sessions++;
+        pthread_mutex_unlock(&acceptor->lock);
+        if (pthread_create(&thread, &attr, net_bench_blocking_session, session) != 0) {
+            free(session);
+            close(fd);
+            net_bench_session_exit(acceptor);
+        }
+    }
+    pthread_attr_destroy(&attr);
+    return NULL;
+}
+
+typedef struct {
+    int port;
+    int connections;
+    long requests;
+    size_t body_size;
+    long completed;
+} net_bench_client_t;
+
+static void *net_bench_client_main(void *arg) {
+    net_bench_client_t *client = arg;
+    int *fds = calloc(client->connections, sizeof(int));
+    char *response = malloc(8 + client->body_size);
+    struct sockaddr_in address = {.sin_family = AF_INET, .sin_port = htons(client->port),
+                                  .sin_addr.s_addr = htonl(INADDR_LOOPBACK)};
+    int one = 1, opened = 0;
+    if (!fds || !response) goto done;
+    for (; opened < client->connections; opened++) {
+        fds[opened] = socket(AF_INET, SOCK_STREAM, 0);
+        if (fds[opened] < 0) goto done;
+        if (connect(fds[opened], (struct sockaddr *)&address, sizeof(address)) != 0) {
+            close(fds[opened]);
+            goto done;
+        }
+        setsockopt(fds[opened], IPPROTO_TCP, TCP_NODELAY, &one, sizeof(one));
+    }
+    for (long r = 0; r < client->requests; r++) {
+        for (int i = 0; i < opened; i++) {
+            if (net_bench_write_full(fds[i], "GET\\n", 4) != 0) goto done;
+        }
+        for (int i = 0; i < opened; i++) {
+            uint32_t header[2];
+            if (net_bench_read_full(fds[i], response, 8 + client->body_size) != 0) goto done;
+            memcpy(header, response, sizeof(header));
+            if (ntohl(header[0]) != NET_BENCH_MAGIC || ntohl(header[1]) != client->body_size) goto done;
+            if (client->body_size && response[8 + client->body_size - 1] != 'x') goto done;
+            client->completed++;
+        }
+    }
+done:
+    for (int i = 0; i < opened; i++) close(fds[i]);
+    free(fds);
+    free(response);
+    return NULL;
+}
+
+int net_benchmark_main(int argc, char **argv) {
+    const char *kind = argc > 1 ? argv[1] : "epoll";
+    int connections = argc > 2 ? atoi(argv[2]) : 100;
+    long requests = argc > 3 ? atol(argv[3]) : 1000;
+    size_t body_size = argc > 4 ? (size_t)atol(argv[4]) : 128;
+    int reactors = argc > 5 ? atoi(argv[5]) : 0;
+    int client_threads = argc > 6 ? atoi(argv[6]) : 4;
+    if (client_threads > connections) client_threads = connections;
+    if (client_threads < 1) client_threads = 1;
+
+    /* Both ends of every connection live in this process */
+    struct rlimit limit;
+    if (getrlimit(RLIMIT_NOFILE, &limit) == 0 && limit.rlim_cur < limit.rlim_max) {
+        limit.rlim_cur = limit.rlim_max;
+        setrlimit(RLIMIT_NOFILE, &limit);
+    }
+
+    net_bench_body_t body = {{htonl(NET_BENCH_MAGIC), htonl((uint32_t)body_size)}, malloc(body_size + 1), body_size, -1};
+    char path[] = "/tmp/nexus-net-XXXXXX";
+    body.file_fd = mkstemp(path);
+    if (!body.data || body.file_fd < 0) return 2;
+    unlink(path);
+    memset(body.data, 'x', body_size);
+    if (net_bench_write_full(body.file_fd, body.data, body_size) != 0) return 2;
+
+    int port;
+    ev_server_t *server = NULL;
+    net_bench_acceptor_t acceptor = {-1, &body, PTHREAD_MUTEX_INITIALIZER, PTHREAD_COND_INITIALIZER, 0};
+    pthread_t accept_thread;
+    if (strcmp(kind, "blocking") == 0) {
+        acceptor.listen_fd = start_tcp_server(0);
+        struct sockaddr_in bound;
+        socklen_t size = sizeof(bound);
+        if (acceptor.listen_fd < 0 || getsockname(acceptor.listen_fd, (struct sockaddr *)&bound, &size) != 0) return 2;
+        port = ntohs(bound.sin_port);
+        pthread_create(&accept_thread, NULL, net_bench_blocking_accept, &acceptor);
+    } else {
+        server = ev_server_start(0, reactors, net_bench_epoll_handler, &body);
+        if (!server) return 2;
+        port = server->port;
+        reactors = server->reactor_count;
+    }
+
+    net_bench_client_t *clients = calloc(client_threads, sizeof(net_bench_client_t));
+    pthread_t *threads = calloc(client_threads, sizeof(pthread_t));
+    if (!clients || !threads) return 2;
+    struct timespec start, end;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    for (int i = 0; i < client_threads; i++) {
+        clients[i] = (net_bench_client_t){port, connections / client_threads + (i < connections % client_threads),
+                                          requests, body_size, 0};
+        pthread_create(&threads[i], NULL, net_bench_client_main, &clients[i]);
+    }
+    long completed = 0;
+    for (int i = 0; i < client_threads; i++) {
+        pthread_join(threads[i], NULL);
+        completed += clients[i].completed;
+    }
+    clock_gettime(CLOCK_MONOTONIC, &end);
+    double seconds = (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+
+    if (server) {
+        ev_server_stop(server);
+    } else {
+        shutdown(acceptor.listen_fd, SHUT_RDWR);
+        pthread_join(accept_thread, NULL);
+        close(acceptor.listen_fd);
+        /* Sessions end as soon as their clients have disconnected */
+        pthread_mutex_lock(&acceptor.lock);
+        while (acceptor.sessions > 0) pthread_cond_wait(&acceptor.idle, &acceptor.lock);
+        pthread_mutex_unlock(&acceptor.lock);
+    }
+    int ok = completed == (long)connections * requests;
+    printf("server=%s reactors=%d connections=%d requests=%ld body=%zu seconds=%.4f requests_per_sec=%.0f ok=%d\\n",
+           kind, server ? reactors : 0, connections, completed, body_size, seconds, completed / seconds, ok);
+    free(clients);
+    free(threads);
+    free(body.data);
+    close(body.file_fd);
+    return ok ? 0 : 1;
+}
 """
 
     SHARED_MEMORY = """
@@ -303,19 +2104,55 @@ void close_file(int *fd) {
 """
 
     THREAD_POOL = """
-/* POSIX Thread Pool Template */
+/* POSIX Thread Pool Template (Section 6.1): a fixed set of workers fed by a
+ * bounded ring of tasks. Submitters block while the ring is full
+ * (backpressure), batches are queued under one lock acquisition, futures
+ * and threadpool_wait() report completion, and shutdown either drains or
+ * cancels queued work. With THREADPOOL_LOCAL_QUEUES each worker moves a
+ * share of the ring into its own queue, taking the lock once per batch
+ * instead of once per task. */
 #include <pthread.h>
+#include <stdatomic.h>
 #include <stdlib.h>
+#include <unistd.h>
+
+#define THREADPOOL_LOCAL_QUEUES 1
+#define THREADPOOL_LOCAL_BATCH 16
+#define THREADPOOL_DEFAULT_QUEUE 1024
+
+/* threadpool_destroy modes */
+#define THREADPOOL_IMMEDIATE 0
+#define THREADPOOL_GRACEFUL 1
+
+enum { THREADPOOL_PENDING, THREADPOOL_DONE, THREADPOOL_CANCELLED };
 
 typedef struct {
     void (*function)(void *);
     void *argument;
 } threadpool_task_t;
 
+typedef struct threadpool threadpool_t;
+
+typedef struct threadpool_future {
+    threadpool_t *pool;
+    void *(*function)(void *);
+    void *argument;
+    void *result;
+    atomic_int state;
+} threadpool_future_t;
+
 typedef struct {
+    threadpool_t *pool;
+    threadpool_task_t local[THREADPOOL_LOCAL_BATCH];
+} threadpool_worker_t;
+
+struct threadpool {
     pthread_mutex_t lock;
-    pthread_cond_t notify;
+    pthread_cond_t notify;     /* tasks queued or shutdown */
+    pthread_cond_t not_full;   /* ring has room */
+    pthread_cond_t completed;  /* a future finished or nothing is pending */
     pthread_t *threads;
+    threadpool_worker_t *workers;
     threadpool_task_t *queue;
     int thread_count;
     int queue_size;
@@ -323,9 +2160,297 @@ typedef struct {
     int tail;
     int count;
     int shutdown;
-} threadpool_t;
+    int flags;
+    int idle;                  /* workers waiting on notify */
+    int blocked;               /* submitters waiting on not_full */
+    atomic_long pending;       /* queued + running tasks */
+    atomic_int waiters;        /* threads blocked on `completed` */
+};
+
+int threadpool_destroy(threadpool_t *pool, int mode);
+
+static void threadpool_wake_waiters(threadpool_t *pool) {
+    /* Pairs with the increment of `waiters` before a waiter re-checks its
+     * condition under the lock, so a completion is never missed */
+    atomic_thread_fence(memory_order_seq_cst);
+    if (atomic_load_explicit(&pool->waiters, memory_order_relaxed) > 0) {
+        pthread_mutex_lock(&pool->lock);
+        pthread_cond_broadcast(&pool->completed);
+        pthread_mutex_unlock(&pool->lock);
+    }
+}
+
+static void threadpool_future_run(void *arg) {
+    threadpool_future_t *future = arg;
+    future->result = future->function(future->argument);
+    atomic_store(&future->state, THREADPOOL_DONE);
+    threadpool_wake_waiters(future->pool);
+}
+
+static void *threadpool_worker(void *arg) {
+    threadpool_worker_t *self = arg;
+    threadpool_t *pool = self->pool;
+    int batch = (pool->flags & THREADPOOL_LOCAL_QUEUES) ? THREADPOOL_LOCAL_BATCH : 1;
+    for (;;) {
+        pthread_mutex_lock(&pool->lock);
+        while (pool->count == 0 && !pool->shutdown) {
+            pool->idle++;
+            pthread_cond_wait(&pool->notify, &pool->lock);
+            pool->idle--;
+        }
+        if (pool->count == 0) {
+            /* Shut down and drained */
+            pthread_mutex_unlock(&pool->lock);
+            return NULL;
+        }
+        /* Take a fair share so the other workers are not starved */
+        int take = pool->count / pool->thread_count;
+        if (take < 1) take = 1;
+        if (take > batch) take = batch;
+        for (int i = 0; i < take; i++) {
+            self->local[i] = pool->queue[pool->head];
+            pool->head = (pool->head + 1) % pool->queue_size;
+        }
+        pool->count -= take;
+        if (pool->blocked) pthread_cond_broadcast(&pool->not_full);
+        pthread_mutex_unlock(&pool->lock);
+
+        for (int i = 0; i < take; i++) {
+            self->local[i].function(self->local[i].argument);
+            if (atomic_fetch_sub(&pool->pending, 1) == 1) threadpool_wake_waiters(pool);
+        }
+    }
+}
+
+/* `thread_count` <= 0 means one per online CPU, `queue_size` <= 0 the
+ * default ring size. Returns NULL on failure. */
+threadpool_t *threadpool_create(int thread_count, int queue_size, int flags) {
+    if (thread_count <= 0) thread_count = (int)sysconf(_SC_NPROCESSORS_ONLN);
+    if (thread_count <= 0) thread_count = 1;
+    if (queue_size <= 0) queue_size = THREADPOOL_DEFAULT_QUEUE;
+    threadpool_t *pool = calloc(1, sizeof(threadpool_t));
+    if (!pool) return NULL;
+    pool->threads = calloc(thread_count, sizeof(pthread_t));
+    pool->workers = calloc(thread_count, sizeof(threadpool_worker_t));
+    pool->queue = calloc(queue_size, sizeof(threadpool_task_t));
+    if (!pool->threads || !pool->workers || !pool->queue) {
+        free(pool->threads);
+        free(pool->workers);
+        free(pool->queue);
+        free(pool);
+        return NULL;
+    }
+    pool->queue_size = queue_size;
+    pool->flags = flags;
+    atomic_init(&pool->pending, 0);
+    atomic_init(&pool->waiters, 0);
+    pthread_mutex_init(&pool->lock, NULL);
+    pthread_cond_init(&pool->notify, NULL);
+    pthread_cond_init(&pool->not_full, NULL);
+    pthread_cond_init(&pool->completed, NULL);
+    pool->thread_count = thread_count;
+    for (int i = 0; i < thread_count; i++) {
+        pool->workers[i].pool = pool;
+        if (pthread_create(&pool->threads[i], NULL, threadpool_worker, &pool->workers[i]) != 0) {
+            pool->thread_count = i;
+            threadpool_destroy(pool, THREADPOOL_IMMEDIATE);
+            return NULL;
+        }
+    }
+    return pool;
+}
+
+/* Queues `n` tasks, blocking while the ring is full. Returns how many were
+ * queued, which is fewer than `n` only if the pool is shut down meanwhile. */
+int threadpool_submit_batch(threadpool_t *pool, const threadpool_task_t *tasks, int n) {
+    int queued = 0;
+    pthread_mutex_lock(&pool->lock);
+    while (queued < n && !pool->shutdown) {
+        if (pool->count == pool->queue_size) {
+            pool->blocked++;
+            pthread_cond_wait(&pool->not_full, &pool->lock);
+            pool->blocked--;
+            continue;
+        }
+        int take = pool->queue_size - pool->count;
+        if (take > n - queued) take = n - queued;
+        for (int i = 0; i < take; i++) {
+            pool->queue[pool->tail] = tasks[queued + i];
+            pool->tail = (pool->tail + 1) % pool->queue_size;
+        }
+        pool->count += take;
+        atomic_fetch_add(&pool->pending, take);
+        queued += take;
+        /* Wake one idle worker per new task */
+        if (take >= pool->idle) {
+            pthread_cond_broadcast(&pool->notify);
+        } else {
+            for (int i = 0; i < take; i++) pthread_cond_signal(&pool->notify);
+        }
+    }
+    pthread_mutex_unlock(&pool->lock);
+    return queued;
+}
+
+/* 0 on success, -1 once the pool is shutting down */
+int threadpool_submit(threadpool_t *pool, void (*function)(void *), void *argument) {
+    threadpool_task_t task = {function, argument};
+    return threadpool_submit_batch(pool, &task, 1) == 1 ? 0 : -1;
+}
+
+/* Runs function(argument) on the pool; threadpool_future_get() returns its
+ * result. `future` must stay valid until then. */
+int threadpool_submit_future(threadpool_t *pool, threadpool_future_t *future,
+                             void *(*function)(void *), void *argument) {
+    future->pool = pool;
+    future->function = function;
+    future->argument = argument;
+    future->result = NULL;
+    atomic_init(&future->state, THREADPOOL_PENDING);
+    if (threadpool_submit(pool, threadpool_future_run, future) != 0) {
+        atomic_store(&future->state, THREADPOOL_CANCELLED);
+        return -1;
+    }
+    return 0;
+}
+
+/* Blocks until the future's task has run and returns its result (NULL if
+ * the task was cancelled by an immediate shutdown). */
+void *threadpool_future_get(threadpool_future_t *future) {
+    threadpool_t *pool = future->pool;
+    if (atomic_load(&future->state) == THREADPOOL_PENDING) {
+        pthread_mutex_lock(&pool->lock);
+        atomic_fetch_add(&pool->waiters, 1);
+        while (atomic_load(&future->state) == THREADPOOL_PENDING) {
+            pthread_cond_wait(&pool->completed, &pool->lock);
+        }
+        atomic_fetch_sub(&pool->waiters, 1);
+        pthread_mutex_unlock(&pool->lock);
+    }
+    return atomic_load(&future->state) == THREADPOOL_DONE ? future->result : NULL;
+}
+
+/* Blocks until every task submitted so far has finished */
+void threadpool_wait(threadpool_t *pool) {
+    if (atomic_load(&pool->pending) == 0) return;
+    pthread_mutex_lock(&pool->lock);
+    atomic_fetch_add(&pool->waiters, 1);
+    while (atomic_load(&pool->pending) > 0) {
+        pthread_cond_wait(&pool->completed, &pool->lock);
+    }
+    atomic_fetch_sub(&pool->waiters, 1);
+    pthread_mutex_unlock(&pool->lock);
+}
+
+/* THREADPOOL_GRACEFUL runs everything already queued before the workers
+ * exit; THREADPOOL_IMMEDIATE drops queued tasks and cancels their futures.
+ * Tasks already taken by a worker always finish. */
+int threadpool_destroy(threadpool_t *pool, int mode) {
+    pthread_mutex_lock(&pool->lock);
+    if (pool->shutdown) {
+        pthread_mutex_unlock(&pool->lock);
+        return -1;
+    }
+    if (mode != THREADPOOL_GRACEFUL) {
+        for (; pool->count > 0; pool->count--) {
+            threadpool_task_t task = pool->queue[pool->head];
+            pool->head = (pool->head + 1) % pool->queue_size;
+            if (task.function == threadpool_future_run) {
+                atomic_store(&((threadpool_future_t *)task.argument)->state, THREADPOOL_CANCELLED);
+            }
+            atomic_fetch_sub(&pool->pending, 1);
+        }
+    }
+    pool->shutdown = 1;
+    pthread_cond_broadcast(&pool->notify);
+    pthread_cond_broadcast(&pool->not_full);
+    pthread_cond_broadcast(&pool->completed);
+    pthread_mutex_unlock(&pool->lock);
 
-/* ... (Omitted full implementation for brevity in template) ... */
+    for (int i = 0; i < pool->thread_count; i++) pthread_join(pool->threads[i], NULL);
+    pthread_mutex_destroy(&pool->lock);
+    pthread_cond_destroy(&pool->notify);
+    pthread_cond_destroy(&pool->not_full);
+    pthread_cond_destroy(&pool->completed);
+    free(pool->threads);
+    free(pool->workers);
+    free(pool->queue);
+    free(pool);
+    return 0;
+}
+"""
+
+    # Throughput driver: threads tasks [work per task ...]
+    THREAD_POOL_BENCHMARK = """
+/* Thread pool benchmark: tasks per second by submission mode and task size */
+#include <stdatomic.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+static atomic_ulong tp_bench_total;
+
+static unsigned long tp_bench_compute(long work) {
+    uint64_t x = (uint64_t)work + 1;
+    for (long i = 0; i < work; i++) x = x * 6364136223846793005ULL + 1442695040888963407ULL;
+    return (unsigned long)(x & 0xff) + 1;
+}
+
+static void tp_bench_task(void *arg) {
+    atomic_fetch_add_explicit(&tp_bench_total, tp_bench_compute((long)(intptr_t)arg), memory_order_relaxed);
+}
+
+static void *tp_bench_square(void *arg) {
+    return (void *)((intptr_t)arg * (intptr_t)arg);
+}
+
+/* mode 0: one submit per task, 1: batches, 2: batches + local queues */
+static int tp_bench_run(int mode, int threads, long tasks, long work) {
+    static const char *names[] = {"single", "batch", "local"};
+    threadpool_t *pool = threadpool_create(threads, 1024, mode == 2 ? THREADPOOL_LOCAL_QUEUES : 0);
+    if (!pool) return 0;
+    threadpool_task_t batch[64];
+    for (int i = 0; i < 64; i++) batch[i] = (threadpool_task_t){tp_bench_task, (void *)(intptr_t)work};
+    atomic_store(&tp_bench_total, 0);
+
+    struct timespec start, end;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    for (long submitted = 0; submitted < tasks;) {
+        if (mode == 0) {
+            threadpool_submit(pool, tp_bench_task, (void *)(intptr_t)work);
+            submitted++;
+        } else {
+            int n = tasks - submitted < 64 ? (int)(tasks - submitted) : 64;
+            submitted += threadpool_submit_batch(pool, batch, n);
+        }
+    }
+    threadpool_wait(pool);
+    clock_gettime(CLOCK_MONOTONIC, &end);
+    double seconds = (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+
+    threadpool_future_t futures[8];
+    int ok = atomic_load(&tp_bench_total) == tp_bench_compute(work) * (unsigned long)tasks;
+    for (intptr_t i = 0; i < 8; i++) threadpool_submit_future(pool, &futures[i], tp_bench_square, (void *)i);
+    for (intptr_t i = 0; i < 8; i++) ok &= (intptr_t)threadpool_future_get(&futures[i]) == i * i;
+    threadpool_destroy(pool, THREADPOOL_GRACEFUL);
+
+    printf("mode=%s threads=%d work=%ld tasks=%ld seconds=%.4f tasks_per_sec=%.0f ok=%d\\n",
+           names[mode], threads, work, tasks, seconds, tasks / seconds, ok);
+    return ok;
+}
+
+int threadpool_benchmark_main(int argc, char **argv) {
+    int threads = argc > 1 ? atoi(argv[1]) : 4;
+    long tasks = argc > 2 ? atol(argv[2]) : 1000000;
+    long default_work[] = {0, 100, 1000, 10000};
+    int ok = 1;
+    for (int w = 0; w < (argc > 3 ? argc - 3 : 4); w++) {
+        long work = argc > 3 ? atol(argv[3 + w]) : default_work[w];
+        for (int mode = 0; mode < 3; mode++) ok &= tp_bench_run(mode, threads, tasks, work);
+    }
+    return ok ? 0 : 1;
+}
 """
 
     SIGNAL_HANDLER = """
@@ -351,6 +2476,33 @@ void setup_signals() {
 }
 """
 
+    # Headers and symbols a template uses without declaring them itself
+    METADATA = {
+        "QUEUE_BENCHMARK": {"requires": ("enqueue", "dequeue", "queue_init", "queue_destroy", "hp_thread_exit",
+                                         "mpmc_enqueue", "mpmc_dequeue", "mpmc_init", "mpmc_destroy")},
+        "WORK_STEALING_BENCHMARK": {"requires": ("ws_pool_create", "ws_run", "ws_spawn", "ws_sync",
+                                                 "ws_parallel_for", "ws_pool_destroy")},
+        "THREAD_POOL_BENCHMARK": {"requires": ("threadpool_create", "threadpool_submit", "threadpool_submit_batch",
+                                               "threadpool_submit_future", "threadpool_future_get",
+                                               "threadpool_wait", "threadpool_destroy")},
+        "NET_BENCHMARK": {"requires": ("ev_server_start", "ev_server_stop", "ev_conn_write", "ev_conn_writev",
+                                       "ev_conn_sendfile", "start_tcp_server")},
+        "ALLOC_BENCHMARK": {"requires": ("slab_alloc", "slab_free", "slab_alloc_aligned", "slab_free_aligned",
+                                         "slab_release_all", "pool_init", "pool_alloc", "pool_free", "pool_destroy",
+                                         "arena_init", "arena_alloc", "arena_alloc_aligned", "arena_reset",
+                                         "arena_destroy")},
+        "RAII_CLEANUP": {"headers": ("<stdio.h>", "<unistd.h>")},
+    }
+
     @classmethod
     def get_template(cls, name):
-        return getattr(cls, name.upper(), None)
+        return TEMPLATES.get(name.upper())
+
+    @classmethod
+    def register_templates(cls, registry):
+        for name, source in TEMPLATES.items():
+            registry.register(name, source, **cls.METADATA.get(name, {}))
+
+
+# Name -> source, collected once instead of a getattr per lookup
+TEMPLATES = {name: value for name, value in vars(TemplateLibrary).items() if name.isupper() and isinstance(value, str)}
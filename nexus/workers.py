@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from .orchestrator import NexusOrchestrator
+from .stage_cache import StageCache
+
+# The warmed orchestrator and event channel owned by a worker process
+_worker_orchestrator = None
+_worker_events = None
+
+
+def build_orchestrator(cache_dir=None):
+    cache = StageCache(directory=cache_dir) if cache_dir else True
+    return NexusOrchestrator(cache=cache)
+
+
+def _init_worker(cache_dir, events):
+    global _worker_orchestrator, _worker_events
+    _worker_orchestrator = build_orchestrator(cache_dir).warm()
+    _worker_events = events
+
+
+def _run_in_worker(specification, base_path, max_iterations, job_id):
+    return execute_job(_worker_orchestrator, specification, base_path, max_iterations,
+                       job_id=job_id, events=_worker_events)
+
+
+def execute_job(orchestrator, specification, base_path, max_iterations=3, job_id=None, events=None):
+    """
+    Runs one specification into its own session directory and returns a
+    JSON-serializable summary; pipeline errors are reported, not raised.
+    When `events` is given, progress events are put on it as (job_id, event).
+    """
+    start = time.perf_counter()
+    summary = {"session_dir": base_path}
+    on_event = None
+    if events is not None:
+        on_event = lambda event: events.put((job_id, event))
+    try:
+        os.makedirs(base_path, exist_ok=True)
+        result = orchestrator.run_pipeline(specification, max_iterations=max_iterations,
+                                           base_path=base_path, on_event=on_event)
+        summary.update({
+            "status": "success",
+            "certification": result.get("certification"),
+            "pipeline_status": result.get("status"),
+            "result": result,
+        })
+    except Exception as e:
+        summary.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    summary["elapsed_s"] = round(time.perf_counter() - start, 4)
+    return summary
+
+
+class WorkerPool:
+    """
+    Section 3.5: Worker Pool
+    Runs pipeline jobs on long-lived, warmed orchestrators. In "process" mode
+    each worker process builds one orchestrator at start-up; in "thread" mode
+    all threads share a single orchestrator, which keeps no per-run state
+    (each job's profile is returned in its result). `events`, if set before the first submit, is a
+    queue (multiprocessing.Queue in process mode) receiving progress events.
+    """
+    def __init__(self, workers=None, mode="process", cache_dir=None, events=None):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown worker mode: {mode}")
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.cache_dir = cache_dir
+        self.events = events
+        self._orchestrator = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                if self.mode == "process":
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers, initializer=_init_worker,
+                        initargs=(self.cache_dir, self.events)
+                    )
+                else:
+                    self._orchestrator = build_orchestrator(self.cache_dir)
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def submit(self, specification, base_path, max_iterations=3, job_id=None):
+        pool = self._get_pool()
+        if self.mode == "process":
+            return pool.submit(_run_in_worker, specification, base_path, max_iterations, job_id)
+        return pool.submit(execute_job, self._orchestrator, specification, base_path, max_iterations,
+                           job_id=job_id, events=self.events)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+            if self._orchestrator is not None:
+                self._orchestrator.shutdown()
+                self._orchestrator = None
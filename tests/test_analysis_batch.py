@@ -0,0 +1,34 @@
+import contextlib
+import io
+import unittest
+from nexus.multi_stage_analysis_engine import MultiStageAnalysisEngine
+
+SPECS = [f"REQ: Job {i} must be fast. REQ: Assume {i} threads." for i in range(12)]
+
+class TestProcessMany(unittest.TestCase):
+    def setUp(self):
+        self.engine = MultiStageAnalysisEngine()
+
+    def test_results_are_ordered_and_match_process(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = [self.engine.process(spec) for spec in SPECS]
+        results = self.engine.process_many(SPECS, workers=2, chunksize=3)
+        self.assertEqual(results, expected)
+
+    def test_in_process_batch_is_quiet(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            results = self.engine.process_many(SPECS[:2], workers=1)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(results[1]["req"], ["Job 1 must be fast."])
+
+    def test_return_exceptions(self):
+        results = self.engine.process_many(["REQ: a", None, "REQ: b"], workers=2, return_exceptions=True)
+        self.assertEqual(results[0]["req"], ["a"])
+        self.assertIsInstance(results[1], TypeError)
+        self.assertEqual(results[2]["req"], ["b"])
+        with self.assertRaises(TypeError):
+            self.engine.process_many([None], workers=1)
+
+if __name__ == '__main__':
+    unittest.main()
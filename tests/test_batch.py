@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from nexus.batch import BatchRunner, load_batch_jobs
+from nexus.workers import WorkerPool
+
+class TestBatchMode(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_load_jobs_from_directory_and_jsonl(self):
+        specs = os.path.join(self.root, "specs")
+        os.makedirs(specs)
+        for name in ("b.txt", "a.md", "notes.bin"):
+            with open(os.path.join(specs, name), "w") as f:
+                f.write("REQ: Must be fast.")
+        self.assertEqual([j.job_id for j in load_batch_jobs(specs)], ["a", "b"])
+
+        path = self.write("jobs.jsonl", "\n".join([
+            json.dumps({"id": "q/1", "spec": "REQ: x"}),
+            "",
+            json.dumps({"spec": "REQ: y"}),
+            json.dumps({"id": "q/1", "spec": "REQ: z"}),
+        ]))
+        jobs = list(load_batch_jobs(path))
+        self.assertEqual([j.job_id for j in jobs], ["q_1", "job-00003", "q_1-2"])
+        self.assertEqual(jobs[1].specification, "REQ: y")
+
+    def test_batch_run_streams_results(self):
+        path = self.write("jobs.jsonl", "\n".join(
+            json.dumps({"id": f"spec{i}", "spec": f"REQ: Must be concurrent {i}."}) for i in range(4)
+        ))
+        out_dir = os.path.join(self.root, "out")
+        runner = BatchRunner(out_dir, concurrency=2, mode="thread", max_iterations=1)
+        summary = runner.run(load_batch_jobs(path))
+
+        self.assertEqual(summary["total"], 4)
+        self.assertEqual(summary["failed"], 0)
+        with open(summary["results_path"]) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(sorted(r["id"] for r in records), ["spec0", "spec1", "spec2", "spec3"])
+        for record in records:
+            self.assertEqual(record["status"], "success")
+            self.assertTrue(os.path.exists(os.path.join(record["session_dir"], "main.c")))
+
+    def test_thread_workers_keep_profiles_apart(self):
+        pool = WorkerPool(workers=2, mode="thread")
+        try:
+            futures = [pool.submit(f"REQ: Must be concurrent {i}.", os.path.join(self.root, f"job{i}"), max_iterations=1)
+                       for i in range(4)]
+            summaries = [future.result() for future in futures]
+            self.assertFalse(hasattr(pool._orchestrator, "last_profile"))
+        finally:
+            pool.shutdown()
+        for summary in summaries:
+            self.assertEqual(summary["status"], "success")
+            spans = summary["result"]["instrumentation"]["spans"]
+            self.assertEqual([s["name"] for s in spans if s["category"] == "pipeline"], ["pipeline"])
+
+    def test_process_workers_reuse_orchestrator(self):
+        spec = self.write("spec.txt", "REQ: Must use TCP socket.")
+        pool = WorkerPool(workers=1, mode="process")
+        try:
+            summaries = [pool.submit(spec, os.path.join(self.root, f"job{i}"), max_iterations=1).result()
+                         for i in range(3)]
+        finally:
+            pool.shutdown()
+        for summary in summaries:
+            self.assertEqual(summary["status"], "success")
+        # The worker's orchestrator (and its in-memory stage cache) outlives
+        # a job, so only the first one runs the analysis
+        cache_hits = [summary["result"]["pipeline"]["cache_hits"] for summary in summaries]
+        self.assertNotIn("analysis", cache_hits[0])
+        self.assertEqual([hits.get("analysis") for hits in cache_hits[1:]], [1, 1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from nexus.synthesis import native
+from nexus.synthesis.templates import TemplateLibrary
+from nexus.advanced_data_structure_synthesis import AdvancedDataStructureSynthesis
+from nexus.concurrency_ipc_synthesizer import ConcurrencyIPCSynthesizer
+from nexus.memory_management_optimizer import MemoryManagementOptimizer, object_size_hints
+from nexus.multi_stage_analysis_engine import MultiStageAnalysisEngine
+from nexus.code_synthesis_framework import CodeSynthesisFramework
+
+def analyze(*requirements):
+    return MultiStageAnalysisEngine().process(" ".join(f"REQ: {r}" for r in requirements))
+
+COMPILER = native.find_compiler()
+
+@unittest.skipUnless(COMPILER, "no C compiler available")
+class TestNativeTemplates(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def build(self, driver):
+        return native.build_benchmark(driver, self.tmp.name, flags=("-O2", "-Wall", "-Werror"))
+
+    def test_queues_deliver_every_item_exactly_once(self):
+        binary = self.build("QUEUE_BENCHMARK")
+        for kind in ("ms", "ring"):
+            result = subprocess.run([binary, kind, "3", "2", "60000", "16"], capture_output=True, text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+            self.assertIn("ok=1", result.stdout)
+
+    def test_work_stealing_results_match_serial(self):
+        binary = self.build("WORK_STEALING_BENCHMARK")
+        for workers in ("1", "4"):
+            result = subprocess.run([binary, workers, "24", "2000000"], capture_output=True, text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+            self.assertIn(f"workers={workers} ", result.stdout)
+            self.assertIn("ok=1", result.stdout)
+
+    def test_thread_pool_runs_every_task_in_each_mode(self):
+        binary = self.build("THREAD_POOL_BENCHMARK")
+        result = subprocess.run([binary, "3", "20000", "0", "200"], capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        for mode in ("single", "batch", "local"):
+            self.assertIn(f"mode={mode} threads=3 work=200", result.stdout)
+        self.assertNotIn("ok=0", result.stdout)
+
+    def test_thread_pool_immediate_shutdown_cancels_queued_futures(self):
+        main = """
+#include <stdio.h>
+static void *slow(void *arg) { usleep(1000); return arg; }
+int main(void) {
+    threadpool_t *pool = threadpool_create(1, 64, 0);
+    threadpool_future_t futures[64];
+    for (long i = 0; i < 64; i++) threadpool_submit_future(pool, &futures[i], slow, (void *)(i + 1));
+    long first = (long)threadpool_future_get(&futures[0]);
+    threadpool_destroy(pool, THREADPOOL_IMMEDIATE);
+    int done = 0, cancelled = 0;
+    for (int i = 0; i < 64; i++) {
+        done += atomic_load(&futures[i].state) == THREADPOOL_DONE;
+        cancelled += atomic_load(&futures[i].state) == THREADPOOL_CANCELLED;
+    }
+    printf("first=%ld done=%d cancelled=%d\\n", first, done, cancelled);
+    return 0;
+}
+"""
+        source = native.program_source(["THREAD_POOL"], main)
+        binary = native.compile_program(source, os.path.join(self.tmp.name, "cancel"), flags=("-O2", "-Wall", "-Werror"))
+        result = subprocess.run([binary], capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        first, done, cancelled = (int(field.split("=")[1]) for field in result.stdout.split())
+        self.assertEqual(first, 1)
+        self.assertEqual(done + cancelled, 64)
+        self.assertGreater(done, 0)
+        self.assertGreater(cancelled, 0)
+
+    def test_event_loop_and_blocking_servers_answer_every_request(self):
+        binary = self.build("NET_BENCHMARK")
+        # Small bodies go out with writev, large ones with sendfile
+        for args in (["epoll", "40", "20", "100", "2"], ["epoll", "8", "10", "100000", "2"],
+                     ["blocking", "40", "20", "100"]):
+            result = subprocess.run([binary, *args], capture_output=True, text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+            self.assertIn("ok=1", result.stdout)
+
+    def test_event_loop_has_no_undefined_behaviour(self):
+        try:
+            binary = native.build_benchmark("NET_BENCHMARK", self.tmp.name,
+                                            flags=("-O1", "-fsanitize=undefined", "-fno-sanitize-recover=undefined"))
+        except RuntimeError as e:
+            self.skipTest(f"UBSan unavailable: {e}")
+        for args in (["epoll", "40", "20", "100", "2"], ["epoll", "8", "10", "100000", "2"]):
+            result = subprocess.run([binary, *args], capture_output=True, text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+            self.assertNotIn("runtime error", result.stderr)
+
+    def test_allocators_keep_blocks_intact_and_aligned(self):
+        binary = self.build("ALLOC_BENCHMARK")
+        # 6000-byte maximum also covers the malloc fallback above the largest size class
+        for max_size in ("256", "6000"):
+            result = subprocess.run([binary, "3", "60000", max_size], capture_output=True, text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+            self.assertIn("alignment ok=1", result.stdout)
+            for strategy in ("malloc", "slab", "pool", "arena"):
+                self.assertIn(f"strategy={strategy} ", result.stdout)
+            self.assertNotIn("ok=0", result.stdout)
+
+    def test_generated_program_compiles_for_each_allocation_strategy(self):
+        specs = {
+            "Standard malloc/free": "Parse the input file.",
+            "Object Pool": "Must handle frequent allocation of small objects.",
+            "Slab Allocator": "Allocate many short-lived 64-byte and 128-byte objects.",
+            "Arena Allocator": "Objects are freed together per request.",
+            "Conservative GC": "Objects form a complex ownership graph.",
+        }
+        optimizer = MemoryManagementOptimizer()
+        for allocation, requirement in specs.items():
+            analysis = analyze(requirement)
+            plans = {"memory": optimizer.process(analysis)}
+            self.assertEqual(plans["memory"]["allocation"], allocation)
+            code = CodeSynthesisFramework().process(analysis, {}, plans)["code"]
+            # The Makefile's compiler flags and libraries
+            native.compile_program(code, os.path.join(self.tmp.name, "app"), flags=("-Wall", "-Wextra"),
+                                   libs=("-lpthread", "-lcrypto"))
+
+    def test_queue_templates_compile_together(self):
+        source = native.program_source(["LOCK_FREE_QUEUE", "MPMC_RING_BUFFER"], "\nint main(void) { return 0; }\n")
+        native.compile_program(source, os.path.join(self.tmp.name, "both"), flags=("-Wall", "-Werror", "-c"), libs=())
+
+class TestQueueSelection(unittest.TestCase):
+    def select(self, requirement):
+        return AdvancedDataStructureSynthesis().process(analyze(requirement))
+
+    def test_unbounded_queue_by_default(self):
+        results = self.select("Must be concurrent")
+        self.assertEqual(results["selected_structures"], ["LOCK_FREE_QUEUE"])
+        self.assertIn("dequeue", results["templates"]["LOCK_FREE_QUEUE"])
+        self.assertNotIn("__sync", results["templates"]["LOCK_FREE_QUEUE"])
+
+    def test_bounded_specs_get_the_ring_buffer(self):
+        results = self.select("Concurrent workers share a bounded queue with backpressure")
+        self.assertEqual(results["selected_structures"], ["MPMC_RING_BUFFER"])
+        self.assertTrue(any("Ring Buffer" in r for r in results["design_reasoning"]))
+        self.assertIn("mpmc_dequeue", TemplateLibrary.get_template("MPMC_RING_BUFFER"))
+
+class TestConcurrencySelection(unittest.TestCase):
+    def test_divide_and_conquer_specs_get_work_stealing(self):
+        model = ConcurrencyIPCSynthesizer().process(analyze("Parallel divide-and-conquer sort over many threads."))
+        self.assertIn("THREAD_POOL", model["templates"])
+        self.assertIn("ws_steal", model["templates"]["WORK_STEALING_SCHEDULER"])
+        self.assertIn("Work-stealing Scheduler", model["templates"]["WORK_STEALING_SCHEDULER"])
+        self.assertEqual(model["threads"], "POSIX Threads (work-stealing)")
+
+    def test_plain_threading_keeps_the_pool(self):
+        model = ConcurrencyIPCSynthesizer().process(analyze("Must use threads."))
+        self.assertNotIn("WORK_STEALING_SCHEDULER", model["templates"])
+        self.assertEqual(model["threads"], "POSIX Threads")
+
+    def test_servers_with_many_connections_get_the_event_loop(self):
+        model = ConcurrencyIPCSynthesizer().process(analyze("A TCP server handling thousands of connections."))
+        self.assertIn("EPOLL_SERVER", model["templates"])
+        self.assertNotIn("TCP_SERVER", model["templates"])
+        self.assertIn("EPOLLET", model["templates"]["EPOLL_SERVER"])
+
+    def test_plain_tcp_keeps_the_blocking_server(self):
+        model = ConcurrencyIPCSynthesizer().process(analyze("Must use a TCP socket."))
+        self.assertEqual(model["ipc"], "TCP Sockets")
+        self.assertIn("TCP_SERVER", model["templates"])
+
+class TestMemorySelection(unittest.TestCase):
+    def select(self, *requirements):
+        return MemoryManagementOptimizer().select_strategy(analyze(*requirements))
+
+    def test_size_hints(self):
+        self.assertEqual(object_size_hints(["48-byte nodes and 2 KB buffers", "a 512B header, 48 bytes"]),
+                         [48, 512, 2048])
+        self.assertEqual(object_size_hints(["no sizes here"]), [])
+
+    def test_mixed_sizes_or_threads_get_the_slab_allocator(self):
+        for requirement in ("Frequent allocation of 48-byte and 200-byte nodes",
+                            "Many small objects allocated by concurrent workers"):
+            strategy = self.select(requirement)
+            self.assertEqual(strategy["allocation"], "Slab Allocator")
+            self.assertIn("slab_alloc", strategy["templates"]["SLAB_ALLOCATOR"])
+
+    def test_single_size_gets_the_object_pool(self):
+        strategy = self.select("Many small objects of 64 bytes")
+        self.assertEqual(strategy["allocation"], "Object Pool")
+        self.assertEqual(strategy["hints"]["object_sizes"], [64])
+        self.assertEqual(list(strategy["templates"]), ["OBJECT_POOL"])
+
+    def test_large_objects_stay_on_malloc(self):
+        strategy = self.select("Short-lived 8 MB frames")
+        self.assertEqual(strategy["allocation"], "Standard malloc/free")
+        self.assertEqual(strategy["templates"], {})
+
+    def test_long_lived_objects_stay_on_malloc(self):
+        strategy = self.select("Many small objects of 64 bytes, long-lived for the whole run")
+        self.assertEqual(strategy["hints"]["lifetime"], "long")
+        self.assertEqual(strategy["allocation"], "Standard malloc/free")
+        self.assertEqual(strategy["templates"], {})
+        self.assertTrue(any("Long-lived" in o for o in strategy["optimizations"]))
+
+    def test_hints_come_from_requirements_without_constraint_keywords(self):
+        cases = {
+            "Allocate many short-lived 64-byte and 128-byte objects.": "Slab Allocator",
+            "Objects are freed together per request.": "Arena Allocator",
+            "Must handle frequent allocation of small objects.": "Object Pool",
+        }
+        for requirement, allocation in cases.items():
+            self.assertEqual(self.select(requirement)["allocation"], allocation, requirement)
+        self.assertEqual(self.select("Allocate many short-lived 64-byte and 128-byte objects.")["hints"]["object_sizes"],
+                         [64, 128])
+
+    def test_graph_algorithms_do_not_imply_garbage_collection(self):
+        self.assertNotEqual(self.select("Traverse the dependency graph.")["allocation"], "Conservative GC")
+        self.assertEqual(self.select("Objects form a complex ownership graph.")["allocation"], "Conservative GC")
+
+    def test_grouped_lifetimes_get_the_arena(self):
+        strategy = self.select("Per-request buffers freed together")
+        self.assertEqual(strategy["allocation"], "Arena Allocator")
+        self.assertIn("arena_alloc_aligned", strategy["templates"]["ARENA_ALLOCATOR"])
+
+if __name__ == '__main__':
+    unittest.main()
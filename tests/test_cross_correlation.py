@@ -0,0 +1,98 @@
+import random
+import unittest
+from nexus.instrumentation import PipelineProfiler, span
+from nexus.cross_correlation import FFTBasedCrossCorrelation, direct_correlate, fft, load_numpy, next_power_of_two
+
+numpy = load_numpy()
+
+def assert_close(test, actual, expected):
+    test.assertEqual(len(actual), len(expected))
+    for x, y in zip(actual, expected):
+        test.assertAlmostEqual(x, y, places=9)
+
+class TestCrossCorrelation(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(7)
+        self.correlator = FFTBasedCrossCorrelation(use_numpy=False)
+
+    def signal(self, n):
+        return [self.rng.uniform(-1, 1) for _ in range(n)]
+
+    def test_matches_numpy_correlate_semantics(self):
+        self.assertEqual(direct_correlate([1, 2, 3], [0, 1, 0.5]), [0.5, 2.0, 3.5, 3.0, 0.0])
+        assert_close(self, self.correlator.compute([1, 2, 3], [0, 1, 0.5], "fft"), [0.5, 2.0, 3.5, 3.0, 0.0])
+
+    def test_fft_round_trip(self):
+        values = self.signal(16)
+        assert_close(self, [v.real for v in fft(fft(values), inverse=True)], values)
+        with self.assertRaises(ValueError):
+            fft([1, 2, 3])
+        self.assertEqual([next_power_of_two(n) for n in (1, 2, 3, 64, 65)], [1, 2, 4, 64, 128])
+
+    def test_all_methods_agree(self):
+        for n, m in [(50, 50), (300, 20), (20, 300), (129, 65)]:
+            a, b = self.signal(n), self.signal(m)
+            expected = direct_correlate(a, b)
+            for method in ("fft", "overlap_save", "auto"):
+                assert_close(self, self.correlator.compute(a, b, method), expected)
+
+    def test_overlap_save_small_blocks(self):
+        a, b = self.signal(1000), self.signal(9)
+        assert_close(self, self.correlator.overlap_save(a, b, block_size=16), direct_correlate(a, b))
+
+    def test_method_selection_and_batch(self):
+        self.assertEqual(self.correlator.choose_method(16, 16), "direct")
+        self.assertEqual(self.correlator.choose_method(200, 200), "fft")
+        self.assertEqual(self.correlator.choose_method(10000, 100), "overlap_save")
+        pairs = [(self.signal(70), self.signal(80)), (self.signal(3), self.signal(2)), ([], [1.0])]
+        results = self.correlator.compute_many(pairs)
+        assert_close(self, results[0], direct_correlate(*pairs[0]))
+        assert_close(self, results[1], direct_correlate(*pairs[1]))
+        self.assertEqual(results[2], [])
+
+@unittest.skipUnless(numpy, "NumPy is not installed")
+class TestNumpyCrossCorrelation(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(11)
+        self.correlator = FFTBasedCrossCorrelation(use_numpy=True)
+        self.reference = FFTBasedCrossCorrelation(use_numpy=False)
+
+    def signal(self, n):
+        return [self.rng.uniform(-1, 1) for _ in range(n)]
+
+    def test_compute_matches_pure_python(self):
+        for n, m in [(3, 3), (50, 50), (300, 20), (20, 300), (129, 65), (1, 40)]:
+            a, b = self.signal(n), self.signal(m)
+            for method in ("direct", "fft", "overlap_save", "auto"):
+                result = self.correlator.compute(a, b, method)
+                self.assertIsInstance(result, list)
+                assert_close(self, result, self.reference.compute(a, b, method))
+
+    def test_overlap_save_matches_pure_python(self):
+        a, b = self.signal(1000), self.signal(9)
+        for block_size in (None, 16, 64):
+            assert_close(self, self.correlator.overlap_save(a, b, block_size=block_size),
+                         self.reference.overlap_save(a, b, block_size=block_size))
+
+    def test_compute_many_matches_pure_python(self):
+        pairs = [(self.signal(70), self.signal(80)), (self.signal(80), self.signal(70)),
+                 (self.signal(300), self.signal(300)), (self.signal(3), self.signal(2)), ([], [1.0])]
+        for method in ("auto", "fft", "direct"):
+            results = self.correlator.compute_many(pairs, method)
+            expected = self.reference.compute_many(pairs, method)
+            self.assertEqual(len(results), len(expected))
+            for result, reference in zip(results, expected):
+                assert_close(self, result, reference)
+    def test_compute_many_counts_each_pair_once(self):
+        pairs = [(self.signal(300), self.signal(300)), (self.signal(300), self.signal(260)),
+                 (self.signal(3), self.signal(2)), ([], [1.0])]
+        profiler = PipelineProfiler()
+        with profiler.activate(), span("planning", "stage"):
+            self.correlator.compute_many(pairs)
+        totals = profiler.totals()
+        self.assertEqual(totals["correlation_batched"], 2)
+        self.assertEqual(totals["correlation_direct"], 1)
+        self.assertNotIn("correlation_fft", totals)
+
+if __name__ == '__main__':
+    unittest.main()
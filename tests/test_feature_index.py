@@ -0,0 +1,44 @@
+import pickle
+import unittest
+from nexus.feature_index import KeywordMatcher, FeatureIndex
+from nexus.multi_stage_analysis_engine import MultiStageAnalysisEngine
+from nexus.concurrency_ipc_synthesizer import ConcurrencyIPCSynthesizer
+from nexus.pipeline_dag import stable_hash
+
+class TestFeatureIndex(unittest.TestCase):
+    def test_matcher_finds_overlapping_keywords(self):
+        matcher = KeywordMatcher(["he", "she", "his", "hers"])
+        self.assertEqual(list(matcher.iter_matches("ushers")), [(4, "she"), (4, "he"), (6, "hers")])
+        self.assertEqual(matcher.scan("USHERS"), {"she", "he", "hers"})
+        self.assertEqual(matcher.scan("nothing"), frozenset())
+
+    def test_index_is_per_field_and_skips_failures(self):
+        index = FeatureIndex.build({
+            "constraints": ["Must be FAST"],
+            "req": ["Uses a TCP socket"],
+            "failures": {"compliance": ["thread"]},
+        })
+        self.assertEqual(index.fields, ("constraints", "req"))
+        self.assertTrue(index.has("fast", fields=("constraints",)))
+        self.assertFalse(index.has("tcp", fields=("constraints",)))
+        self.assertTrue(index.has("tcp", "pipe"))
+        self.assertFalse(index.has("thread"))
+
+    def test_index_is_immutable_picklable_and_stable(self):
+        engine = MultiStageAnalysisEngine()
+        first = engine.process("REQ: Must be concurrent. REQ: Uses shared memory.")
+        second = engine.process("REQ: Must be concurrent. REQ: Uses shared memory.")
+        index = first["features"]
+        with self.assertRaises(AttributeError):
+            index.extra = 1
+        self.assertEqual(pickle.loads(pickle.dumps(index)), index)
+        self.assertEqual(repr(index), repr(second["features"]))
+        self.assertEqual(stable_hash(first), stable_hash(second))
+
+    def test_planners_use_attached_index(self):
+        analysis = {"req": ["plain text"], "features": FeatureIndex({"req": {"shm"}})}
+        model = ConcurrencyIPCSynthesizer().select_concurrency_model(analysis)
+        self.assertEqual(model["ipc"], "POSIX Shared Memory")
+
+if __name__ == '__main__':
+    unittest.main()
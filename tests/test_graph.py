@@ -0,0 +1,163 @@
+import random
+import unittest
+from nexus.graph import CSRGraph
+from nexus.algorithm_library import GraphAlgorithms
+
+def recursive_dfs(graph, start, visited=None):
+    visited = [] if visited is None else visited
+    visited.append(start)
+    for node in graph.get(start, []):
+        if node not in visited:
+            recursive_dfs(graph, node, visited)
+    return visited
+
+class TestCSRGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": [], "x": ["y"]}
+        self.csr = CSRGraph.from_adjacency(self.graph)
+
+    def test_adjacency_layout(self):
+        self.assertEqual(self.csr.labels, ["a", "b", "c", "d", "x", "y"])
+        self.assertEqual(list(self.csr.offsets), [0, 2, 3, 4, 4, 5, 5])
+        self.assertEqual([self.csr.label(v) for v in self.csr.neighbors(0)], ["b", "c"])
+        self.assertEqual(self.csr.num_edges, 5)
+
+    def test_from_edges_keeps_edge_order(self):
+        csr = CSRGraph.from_edges([(2, 0), (0, 3), (2, 1), (0, 1)])
+        self.assertEqual(list(csr.neighbors(0)), [3, 1])
+        self.assertEqual(list(csr.neighbors(2)), [0, 1])
+        self.assertEqual(csr.num_nodes, 4)
+
+    def test_traversal_orders_match_recursive_and_queue_versions(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            n = rng.randint(1, 30)
+            graph = {u: rng.sample(range(n), rng.randint(0, min(n, 4))) for u in range(n)}
+            csr = CSRGraph.from_adjacency(graph)
+            self.assertEqual([csr.label(u) for u in csr.dfs_order(0)], recursive_dfs(graph, 0))
+            order, queue = [0], [0]
+            while queue:
+                for v in graph[queue.pop(0)]:
+                    if v not in order:
+                        order.append(v)
+                        queue.append(v)
+            self.assertEqual([csr.label(u) for u in csr.bfs_order(0)], order)
+
+    def test_postorder_lists_descendants_first(self):
+        self.assertEqual([self.csr.label(u) for u in self.csr.dfs_postorder(0)], ["d", "b", "c", "a"])
+
+    def test_deep_graph_does_not_recurse(self):
+        n = 200000
+        csr = CSRGraph.from_edges(((i, i + 1) for i in range(n - 1)), n)
+        self.assertEqual(len(csr.dfs_order(0)), n)
+        self.assertEqual(csr.topological_sort(), list(range(n)))
+        self.assertFalse(csr.has_cycle())
+
+    def test_topological_sort_and_cycles(self):
+        order = self.csr.topological_sort()
+        position = {u: i for i, u in enumerate(order)}
+        for u, v in self.csr.edges():
+            self.assertLess(position[u], position[v])
+        cyclic = CSRGraph.from_edges([(0, 1), (1, 2), (2, 1), (2, 3)])
+        self.assertEqual(cyclic.find_cycle(), [1, 2, 1])
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            cyclic.topological_sort()
+
+    def test_connected_components_are_weak(self):
+        self.assertEqual(self.csr.connected_components(), [[0, 1, 2, 3], [4, 5]])
+
+class TestGraphAnalytics(unittest.TestCase):
+    def random_graph(self, rng, n, weighted=False):
+        edges = [(rng.randrange(n), rng.randrange(n)) for _ in range(rng.randint(0, 3 * n))]
+        if weighted:
+            return CSRGraph.from_edges([(u, v, rng.randint(0, 9)) for u, v in edges], n, weighted=True)
+        return CSRGraph.from_edges(edges, n)
+
+    def test_tarjan_and_kosaraju_agree_with_reachability(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            csr = self.random_graph(rng, rng.randint(1, 25))
+            reach = [set(csr.dfs_order(u)) for u in range(csr.num_nodes)]
+            expected = {frozenset(v for v in reach[u] if u in reach[v]) for u in range(csr.num_nodes)}
+            for method in ("tarjan", "kosaraju"):
+                components = csr.strongly_connected_components(method)
+                self.assertEqual({frozenset(c) for c in components}, expected)
+                self.assertEqual(sum(map(len, components)), csr.num_nodes)
+
+    def test_scc_orders_follow_condensation(self):
+        csr = CSRGraph.from_edges([(0, 1), (1, 0), (1, 2), (2, 3), (3, 2)])
+        self.assertEqual([sorted(c) for c in csr.strongly_connected_components("tarjan")], [[2, 3], [0, 1]])
+        self.assertEqual([sorted(c) for c in csr.strongly_connected_components("kosaraju")], [[0, 1], [2, 3]])
+        with self.assertRaises(ValueError):
+            csr.strongly_connected_components("bogus")
+
+    def test_dijkstra_matches_bellman_ford(self):
+        rng = random.Random(5)
+        for _ in range(30):
+            csr = self.random_graph(rng, rng.randint(1, 20), weighted=True)
+            expected = [float("inf")] * csr.num_nodes
+            expected[0] = 0
+            for _ in range(csr.num_nodes):
+                for e, (u, v) in enumerate(csr.edges()):
+                    expected[v] = min(expected[v], expected[u] + csr.weights[e])
+            distances, parents = csr.dijkstra(0)
+            self.assertEqual(distances, expected)
+            for v in range(csr.num_nodes):
+                if distances[v] != float("inf"):
+                    distance, path = csr.shortest_path(0, v)
+                    self.assertEqual(distance, expected[v])
+                    self.assertEqual(path[0], 0)
+                    self.assertEqual(path[-1], v)
+
+    def test_dijkstra_rejects_negative_weights(self):
+        with self.assertRaises(ValueError):
+            CSRGraph.from_edges([(0, 1, -1.0)], weighted=True).dijkstra(0)
+
+    def test_multi_source_bfs_and_levels(self):
+        csr = CSRGraph.from_edges([(i, i + 1) for i in range(9)])
+        self.assertEqual(list(csr.multi_source_bfs([0, 6])), [0, 1, 2, 3, 4, 5, 0, 1, 2, 3])
+        self.assertEqual(csr.bfs_levels([0, 6])[:2], [[0, 6], [1, 7]])
+        self.assertEqual(list(CSRGraph.from_edges([(0, 1)], 3).multi_source_bfs(0)), [0, 1, -1])
+
+    def test_parallel_levels_match_sequential(self):
+        rng = random.Random(11)
+        csr = self.random_graph(rng, 400)
+        sequential = csr.bfs_levels([0, 1])
+        parallel = csr.bfs_levels([0, 1], executor="process", max_workers=2, parallel_threshold=1)
+        self.assertEqual(parallel, sequential)
+        with self.assertRaises(ValueError):
+            csr.bfs_levels(0, executor="gpu")
+
+class TestGraphAlgorithmsAdapter(unittest.TestCase):
+    def test_dict_api_is_unchanged(self):
+        graph = {1: [2, 3], 2: [4], 3: [], 4: [1]}
+        algorithms = GraphAlgorithms()
+        self.assertEqual(algorithms.dfs(graph, 1), {1, 2, 3, 4})
+        self.assertEqual(algorithms.bfs(graph, 2), {1, 2, 3, 4})
+        self.assertEqual(algorithms.dfs(graph, 3), {3})
+        self.assertEqual(algorithms.bfs(graph, 99), {99})
+        visited = {2}
+        self.assertIs(algorithms.dfs(graph, 1, visited), visited)
+        self.assertEqual(visited, {1, 2, 3})
+
+    def test_dict_results_use_node_names(self):
+        algorithms = GraphAlgorithms()
+        graph = {"lib": ["core"], "app": ["lib", "core"], "tool": []}
+        self.assertEqual(algorithms.topological_sort(graph), ["app", "tool", "lib", "core"])
+        self.assertIsNone(algorithms.find_cycle(graph))
+        self.assertEqual(algorithms.connected_components(graph), [["lib", "app", "core"], ["tool"]])
+        self.assertEqual(algorithms.find_cycle({"a": ["b"], "b": ["a"]}), ["a", "b", "a"])
+
+    def test_dict_analytics(self):
+        algorithms = GraphAlgorithms()
+        roads = {"a": {"b": 4, "c": 1}, "c": {"b": 2}, "b": {"d": 5}}
+        self.assertEqual(algorithms.dijkstra(roads, "a"), {"a": 0, "b": 3, "c": 1, "d": 8})
+        self.assertEqual(algorithms.shortest_path(roads, "a", "d"), (8, ["a", "c", "b", "d"]))
+        self.assertEqual(algorithms.shortest_path(roads, "d", "a"), (float("inf"), None))
+        locks = {"m1": ["m2"], "m2": ["m1", "m3"], "m3": []}
+        self.assertEqual(algorithms.strongly_connected_components(locks), [["m3"], ["m2", "m1"]])
+        self.assertEqual(algorithms.multi_source_bfs(locks, ["m3", "m1"]), {"m3": 0, "m1": 0, "m2": 1})
+        self.assertEqual(algorithms.bfs_levels(locks, ["m1"]), [["m1"], ["m2"], ["m3"]])
+
+if __name__ == '__main__':
+    unittest.main()
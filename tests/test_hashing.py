@@ -0,0 +1,73 @@
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+from nexus import hashing
+from nexus.algorithm_library import AlgorithmLibrary
+from nexus.compilation_build_system import CompilationBuildSystem
+
+class TestHashing(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.data = os.urandom(300000)
+        self.path = os.path.join(self.tmp.name, "blob.bin")
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+
+    def test_chunked_digests_match_one_shot(self):
+        expected = hashlib.sha256(self.data).hexdigest()
+        self.assertEqual(hashing.hash_buffer(self.data, chunk_size=4096), expected)
+        self.assertEqual(hashing.hash_buffer(bytearray(self.data), chunk_size=7), expected)
+        self.assertEqual(hashing.hash_stream(io.BytesIO(self.data), chunk_size=1000), expected)
+        self.assertEqual(hashing.hash_file(self.path, chunk_size=65536), expected)
+        self.assertEqual(hashing.hash_file(self.path, use_mmap=True, chunk_size=65536), expected)
+        self.assertEqual(hashing.hash_buffer("héllo"), hashlib.sha256("héllo".encode()).hexdigest())
+
+    def test_blake2_and_empty_files(self):
+        self.assertEqual(hashing.hash_file(self.path, "blake2b"), hashlib.blake2b(self.data).hexdigest())
+        empty = os.path.join(self.tmp.name, "empty")
+        open(empty, "wb").close()
+        self.assertEqual(hashing.hash_file(empty, "blake2s", use_mmap=True), hashlib.blake2s().hexdigest())
+        with self.assertRaises(ValueError):
+            hashing.hasher("no-such-hash")
+
+    def test_hash_files_in_parallel_keeps_order(self):
+        paths = []
+        for i in range(5):
+            paths.append(os.path.join(self.tmp.name, f"f{i}"))
+            with open(paths[-1], "wb") as f:
+                f.write(bytes([i]) * 1000)
+        digests = hashing.hash_files(reversed(paths), max_workers=3)
+        self.assertEqual(list(digests), paths[::-1])
+        self.assertEqual(digests[paths[2]], hashlib.sha256(b"\x02" * 1000).hexdigest())
+
+    def test_directory_fingerprint_tracks_every_change(self):
+        os.makedirs(os.path.join(self.tmp.name, "sub"))
+        with open(os.path.join(self.tmp.name, "sub", "a.c"), "w") as f:
+            f.write("int a;")
+        first = hashing.fingerprint_directory(self.tmp.name)
+        self.assertEqual(list(first["files"]), ["blob.bin", "sub/a.c"])
+        self.assertEqual(hashing.fingerprint_directory(self.tmp.name)["root"], first["root"])
+        os.rename(os.path.join(self.tmp.name, "sub", "a.c"), os.path.join(self.tmp.name, "sub", "b.c"))
+        renamed = hashing.fingerprint_directory(self.tmp.name)
+        self.assertNotEqual(renamed["root"], first["root"])
+        self.assertEqual(renamed["files"]["sub/b.c"], first["files"]["sub/a.c"])
+
+    def test_build_artifacts_carry_fingerprint(self):
+        artifacts = CompilationBuildSystem().process({"code": "int main() { return 0; }"}, base_path=self.tmp.name)
+        fingerprint = artifacts["fingerprint"]
+        self.assertEqual(sorted(fingerprint["files"]), ["Makefile", "main.c"])
+        self.assertEqual(fingerprint["files"]["main.c"], hashlib.sha256(b"int main() { return 0; }").hexdigest())
+
+    def test_streaming_template_for_large_inputs(self):
+        library = AlgorithmLibrary()
+        self.assertNotIn("SHA256_Init", library.SHA256_C_TEMPLATE)
+        plain = library.process({"requirements": ["Hash a password"], "constraints": []})
+        self.assertNotIn("SHA256_STREAM", plain["templates"])
+        large = library.process({"requirements": ["Checksum large artifacts"], "constraints": []})
+        self.assertIn("EVP_DigestUpdate", large["templates"]["SHA256_STREAM"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import MagicMock
+from nexus.orchestrator import NexusOrchestrator
+from nexus.code_synthesis_framework import CodeSynthesisFramework
+from nexus.compliance_checker import ComplianceChecker
+from nexus.intelligent_testing_system import IntelligentTestingSystem
+
+PLANS = {
+    "structures": {"templates": {"LOCK_FREE_QUEUE": "/* queue */", "ARENA_ALLOCATOR": "/* arena */"}},
+    "algorithms": {"templates": {"SHA256": "/* sha */"}},
+}
+
+class TestIncrementalSynthesis(unittest.TestCase):
+    def test_only_dirty_fragments_are_regenerated(self):
+        framework = CodeSynthesisFramework()
+        first = framework.process({}, {}, PLANS)
+        self.assertEqual([f["name"] for f in first["fragments"]],
+                         ["prelude", "structures/LOCK_FREE_QUEUE", "structures/ARENA_ALLOCATOR",
+                          "algorithms/SHA256", "main"])
+
+        failures = {"fragments": ["structures/ARENA_ALLOCATOR"]}
+        second = framework.process({"failures": failures}, {}, PLANS, previous=first)
+        self.assertEqual(second["regenerated"], ["structures/ARENA_ALLOCATOR"])
+        self.assertEqual(second["code"], first["code"])
+
+    def test_compliance_attributes_and_reuses_fragment_verdicts(self):
+        checker = ComplianceChecker()
+        checker.check_forbidden_functions = MagicMock(wraps=checker.check_forbidden_functions)
+        code_info = {"fragments": [
+            {"name": "prelude", "code": "#include <stdio.h>\n"},
+            {"name": "structures/BAD", "code": "void f() { char b[8]; gets(b); }\n"},
+        ]}
+        code_info["code"] = "".join(f["code"] for f in code_info["fragments"])
+        results = checker.process(code_info)
+        self.assertEqual(results["status"], "FAILED")
+        self.assertEqual(results["fragment_violations"], {"structures/BAD": ["gets"]})
+
+        code_info["fragments"][1] = {"name": "structures/BAD", "code": "void f() { }\n"}
+        checker.process(code_info)
+        # Only the changed fragment was scanned again
+        self.assertEqual(checker.check_forbidden_functions.call_count, 3)
+
+    def test_testing_reports_leaking_fragments(self):
+        testing = IntelligentTestingSystem()
+        testing.coverage_tester.run_tests = lambda code: {
+            "branch_coverage": "90%" if "leak" in code else "100%",
+            "memory_leaks": "Detected" if "leak" in code else "None"
+        }
+        results = testing.process({"code": "", "fragments": [
+            {"name": "a", "code": "/* ok */"}, {"name": "b", "code": "/* leak */"}
+        ]})
+        self.assertEqual(results["failing_fragments"], ["b"])
+        self.assertEqual(results["coverage_results"]["branch_coverage"], "90%")
+        self.assertEqual(results["mutation_testing"]["mutation_score"], "98%")
+
+    def test_mutation_totals_do_not_grow_with_fragment_count(self):
+        testing = IntelligentTestingSystem()
+        one = testing.process({"code": "/* a */", "fragments": [{"name": "a", "code": "/* a */"}]})
+        many = testing.process({"code": "/* a *//* b *//* c */", "fragments": [
+            {"name": name, "code": f"/* {name} */"} for name in "abc"
+        ]})
+        self.assertEqual(many["mutation_testing"], one["mutation_testing"])
+
+    def test_refinement_regenerates_failing_fragment_only(self):
+        orchestrator = NexusOrchestrator()
+        implementer = orchestrator.synthesis_framework.implementer
+        implementer.render_fragment = MagicMock(wraps=implementer.render_fragment)
+        orchestrator.compliance_checker.process = MagicMock(side_effect=[
+            {"status": "FAILED", "violations": ["strcpy"],
+             "fragment_violations": {"structures/LOCK_FREE_QUEUE": ["strcpy"]}},
+            {"status": "PASSED"}
+        ])
+        orchestrator.run_pipeline("REQ: Must be fast and concurrent.", max_iterations=2)
+
+        rendered = [c.args[0] for c in implementer.render_fragment.call_args_list]
+        first_pass = len(rendered) - 1
+        self.assertIn("structures/LOCK_FREE_QUEUE", rendered[:first_pass])
+        self.assertEqual(rendered[first_pass:], ["structures/LOCK_FREE_QUEUE"])
+
+if __name__ == "__main__":
+    unittest.main()
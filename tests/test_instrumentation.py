@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+from nexus.orchestrator import NexusOrchestrator
+from nexus.compliance_checker import ComplianceChecker
+from nexus.instrumentation import PipelineProfiler, span, count, instrumented
+
+class Worker:
+    @instrumented
+    def process(self, n):
+        count("items", n)
+        return n
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_path_is_transparent(self):
+        self.assertEqual(Worker().process(3), 3)
+        count("ignored")
+        with span("nothing") as record:
+            self.assertIsNone(record)
+
+    def test_spans_nest_and_collect_counters(self):
+        profiler = PipelineProfiler(trace_memory=True)
+        with profiler.activate():
+            with span("outer", "stage"):
+                Worker().process(2)
+                Worker().process(5)
+        names = [s.name for s in profiler.spans]
+        self.assertEqual(names.count("Worker.process"), 2)
+        self.assertEqual(profiler.totals(), {"items": 7})
+        outer = profiler.to_dict()["spans"][0]
+        self.assertEqual(outer["name"], "outer")
+        self.assertIsNotNone(outer["tracemalloc_peak_kb"])
+
+    def test_regex_matches_counts_every_forbidden_call(self):
+        profiler = PipelineProfiler()
+        with profiler.activate(), span("compliance", "stage"):
+            violations = ComplianceChecker().check_forbidden_functions("gets(a); gets(b); strcpy(a, b);")
+        self.assertEqual(violations, ["gets", "strcpy"])
+        self.assertEqual(profiler.totals()["regex_matches"], 3)
+
+    def test_pipeline_profile_and_chrome_trace(self):
+        orchestrator = NexusOrchestrator(executor="thread", max_workers=2)
+        profiler = PipelineProfiler()
+        try:
+            with tempfile.TemporaryDirectory() as base_path:
+                results = orchestrator.run_pipeline("REQ: Must be fast and concurrent.",
+                                                    max_iterations=1, base_path=base_path, profiler=profiler)
+                trace_path = os.path.join(base_path, "trace.json")
+                profiler.write_chrome_trace(trace_path)
+                with open(trace_path) as f:
+                    trace = json.load(f)
+        finally:
+            orchestrator.shutdown()
+
+        profile = results["instrumentation"]
+        stages = {s["name"] for s in profile["spans"] if s["category"] == "stage"}
+        self.assertEqual(stages, {"analysis", "planning", "verification", "synthesis",
+                                  "testing", "build", "compliance", "output"})
+        components = {s["name"] for s in profile["spans"] if s["category"] == "component"}
+        self.assertIn("AdvancedDataStructureSynthesis.process", components)
+        self.assertGreater(profile["counters"]["templates_integrated"], 0)
+        self.assertGreater(profile["counters"]["files_walked"], 0)
+
+        events = trace["traceEvents"]
+        self.assertTrue(all(e["ph"] == "X" for e in events))
+        self.assertIn("pipeline", [e["name"] for e in events])
+
+if __name__ == "__main__":
+    unittest.main()
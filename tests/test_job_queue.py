@@ -0,0 +1,66 @@
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from nexus.job_queue import JobQueue, QueueFull
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def wait_for(self, queue, job_id, timeout=30):
+        deadline = time.time() + timeout
+        while not queue.get(job_id).done:
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+        return queue.get(job_id)
+
+    def test_job_lifecycle(self):
+        queue = JobQueue(workers=1, max_pending=2, mode="thread", max_iterations=1)
+        try:
+            job = queue.submit("REQ: Must be concurrent.", self.root, job_id="abc")
+            self.assertIn(job.status, ("queued", "running", "succeeded"))
+            job = self.wait_for(queue, "abc")
+            self.assertEqual(job.status, "succeeded")
+            self.assertIn("Lock-free Queue", queue.result("abc")["code"])
+            self.assertIsNone(queue.get("missing"))
+        finally:
+            queue.shutdown()
+
+    def test_backpressure_when_full(self):
+        queue = JobQueue(workers=1, max_pending=1, mode="thread", max_iterations=1)
+        release = threading.Event()
+        queue.pool._get_pool()
+        analysis = queue.pool._orchestrator.analysis_engine
+        original = analysis.process
+        analysis.process = lambda spec: release.wait(10) and original(spec)
+        try:
+            first = queue.submit("REQ: a", self.root)
+            second = queue.submit("REQ: b", self.root)
+            with self.assertRaises(QueueFull):
+                queue.submit("REQ: c", self.root)
+            release.set()
+            self.wait_for(queue, first.job_id)
+            self.wait_for(queue, second.job_id)
+            self.assertEqual(queue.stats()["in_flight"], 0)
+            queue.submit("REQ: d", self.root)
+        finally:
+            release.set()
+            queue.shutdown()
+
+    def test_failed_job_reports_error(self):
+        queue = JobQueue(workers=1, mode="thread", max_iterations=1)
+        try:
+            job = queue.submit(None, self.root)
+            job = self.wait_for(queue, job.job_id)
+            self.assertEqual(job.status, "failed")
+            self.assertIn("error", job.to_dict())
+        finally:
+            queue.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import io
+import json
+import logging
+import shutil
+import tempfile
+import unittest
+from nexus import log
+from nexus.orchestrator import NexusOrchestrator
+from nexus.multi_stage_analysis_engine import MultiStageAnalysisEngine
+
+class TestLog(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        log.reset()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def records(self):
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_library_is_silent_by_default(self):
+        self.assertFalse(log.get_logger("nexus.orchestrator").isEnabledFor(logging.INFO))
+
+    def test_json_records_carry_stage_and_iteration(self):
+        log.configure(level="info", json_output=True, stream=self.stream)
+        orchestrator = NexusOrchestrator(cache=False)
+        try:
+            orchestrator.run_pipeline("REQ: Must be concurrent.", max_iterations=1, base_path=self.root)
+        finally:
+            orchestrator.shutdown()
+        records = self.records()
+        parsing = next(r for r in records if r["message"].startswith("Parsing specification"))
+        self.assertEqual(parsing["stage"], "analysis")
+        self.assertEqual(parsing["iteration"], 1)
+        self.assertEqual(parsing["level"], "info")
+        self.assertEqual(parsing["logger"], "nexus.multi_stage_analysis_engine")
+        self.assertIsNone(records[0]["stage"])
+
+    def test_extra_fields_and_text_format(self):
+        log.configure(level="debug", json_output=True, stream=self.stream)
+        log.get_logger("test").debug("Integrating template: %s", "SHA256", extra={"template": "SHA256"})
+        self.assertEqual(self.records()[0]["template"], "SHA256")
+        self.assertEqual(self.records()[0]["message"], "Integrating template: SHA256")
+
+        self.stream = io.StringIO()
+        log.configure(level="info", stream=self.stream)
+        log.get_logger("test").warning("disk full")
+        self.assertEqual(self.stream.getvalue(), "WARNING: disk full\n")
+
+    def test_quiet_suppresses_progress(self):
+        log.configure(level="info", stream=self.stream)
+        with log.quiet():
+            MultiStageAnalysisEngine().process("REQ: a")
+        self.assertEqual(self.stream.getvalue(), "")
+        MultiStageAnalysisEngine().process("REQ: a")
+        self.assertIn("Starting Multi-Stage Analysis...", self.stream.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
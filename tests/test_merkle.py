@@ -0,0 +1,63 @@
+import hashlib
+import unittest
+from nexus.merkle import MerkleTree, MerkleProof, verify_proof
+
+def reference_root(blocks):
+    level = [hashlib.sha256(b"\x00" + block).digest() for block in blocks]
+    while len(level) > 1:
+        parents = [hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        level = parents
+    return level[0]
+
+BLOCKS = [f"block-{i}".encode() for i in range(13)]
+
+class TestMerkleTree(unittest.TestCase):
+    def test_root_matches_reference_for_every_size(self):
+        for n in range(1, len(BLOCKS) + 1):
+            self.assertEqual(MerkleTree(BLOCKS[:n]).root_digest, reference_root(BLOCKS[:n]))
+
+    def test_levels_are_compact(self):
+        tree = MerkleTree(BLOCKS)
+        self.assertIsInstance(tree.levels[0], bytearray)
+        self.assertEqual(len(tree.levels[0]), 13 * 32)
+        self.assertEqual([len(level) // 32 for level in tree.levels], [13, 7, 4, 2, 1])
+
+    def test_proofs(self):
+        tree = MerkleTree(BLOCKS)
+        for index, block in enumerate(BLOCKS):
+            proof = tree.proof(index)
+            self.assertTrue(tree.verify(block, proof))
+            self.assertTrue(verify_proof(block, proof, tree.root_digest))
+            self.assertFalse(tree.verify(block + b"!", proof))
+        proof = tree.proof(4)
+        self.assertFalse(tree.verify(BLOCKS[4], MerkleProof(5, proof.leaf_count, proof.siblings)))
+        self.assertFalse(tree.verify(BLOCKS[4], MerkleProof(4, proof.leaf_count, proof.siblings[:-1])))
+        with self.assertRaises(IndexError):
+            tree.proof(13)
+
+    def test_updates_and_appends_match_rebuild(self):
+        blocks = list(BLOCKS)
+        tree = MerkleTree(blocks[:1])
+        for block in blocks[1:]:
+            tree.append(block)
+        self.assertEqual(tree.root_digest, reference_root(blocks))
+        blocks[6] = b"changed"
+        tree.update(6, b"changed")
+        self.assertEqual(tree.root_digest, reference_root(blocks))
+        tree.extend([b"x", b"y"])
+        self.assertEqual(tree.root_digest, reference_root(blocks + [b"x", b"y"]))
+
+    def test_parallel_build_matches_sequential(self):
+        blocks = [str(i).encode() for i in range(300)]
+        parallel = MerkleTree(blocks, parallel_threshold=16, max_workers=3, executor="thread")
+        self.assertEqual(parallel.root, MerkleTree(blocks).root)
+
+    def test_other_hash_functions(self):
+        tree = MerkleTree(BLOCKS, hash_name="blake2s")
+        self.assertEqual(tree.digest_size, 32)
+        self.assertTrue(verify_proof(BLOCKS[3], tree.proof(3), tree.root_digest, "blake2s"))
+
+if __name__ == '__main__':
+    unittest.main()
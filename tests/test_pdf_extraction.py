@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+from nexus import pdf_extraction
+from nexus.pdf_extraction import PDFExtractor, iter_pdf_pages
+from nexus.multi_stage_analysis_engine import SpecificationParser
+
+class FakePage:
+    def __init__(self, text):
+        self.text = text
+
+    def get_text(self):
+        return self.text
+
+class FakeDocument:
+    def __init__(self, pages, log):
+        self.pages = pages
+        self.log = log
+        self.page_count = len(pages)
+
+    def load_page(self, number):
+        self.log.append(number)
+        return FakePage(self.pages[number])
+
+    def close(self):
+        pass
+
+class FakeFitz:
+    """
+    Stands in for PyMuPDF: every file is read as one page per line.
+    """
+    def __init__(self):
+        self.opened = 0
+        self.loaded = []
+
+    def open(self, path):
+        self.opened += 1
+        with open(path) as f:
+            return FakeDocument(f.read().splitlines(keepends=True), self.loaded)
+
+class TestPDFExtraction(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.fitz = FakeFitz()
+        self.saved = pdf_extraction._fitz
+        pdf_extraction._fitz = self.fitz
+
+    def tearDown(self):
+        pdf_extraction._fitz = self.saved
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write_pdf(self, pages, name="spec.pdf"):
+        path = os.path.join(self.root, name)
+        with open(path, "w") as f:
+            f.write("".join(f"{page}\n" for page in pages))
+        return path
+
+    def test_pages_are_streamed(self):
+        path = self.write_pdf(["REQ: a", "REQ: b", "REQ: c"])
+        pages = iter_pdf_pages(path)
+        self.assertEqual(next(pages), "REQ: a\n")
+        self.assertEqual(self.fitz.loaded, [0])
+        self.assertEqual(list(pages), ["REQ: b\n", "REQ: c\n"])
+
+    def test_large_documents_split_by_page_range(self):
+        pages = [f"page {i}" for i in range(100)]
+        path = self.write_pdf(pages)
+        extractor = PDFExtractor(parallel_threshold=10, min_pages_per_task=8, max_workers=4, executor="thread")
+        ranges = extractor.page_ranges(100, 4)
+        self.assertEqual(ranges[0], (0, 13))
+        self.assertEqual(ranges[-1][1], 100)
+        self.assertEqual(extractor.extract(path), "".join(f"{page}\n" for page in pages))
+        self.assertEqual(sorted(self.fitz.loaded), list(range(100)))
+
+    def test_extraction_is_cached_by_content(self):
+        extractor = PDFExtractor()
+        first = self.write_pdf(["REQ: a"], "a.pdf")
+        second = self.write_pdf(["REQ: a"], "b.pdf")
+        self.assertEqual(extractor.extract(first), extractor.extract(second))
+        opened = self.fitz.opened
+        extractor.extract(first)
+        self.assertEqual(self.fitz.opened, opened)
+
+    def test_parser_reads_pdf_specifications(self):
+        path = self.write_pdf(["REQ: Must be concurrent.", "REQ: Must be fast."])
+        self.assertEqual(SpecificationParser().parse(path), ["Must be concurrent.", "Must be fast."])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock
+from nexus.orchestrator import NexusOrchestrator
+from nexus.pipeline_dag import Stage, StageGraph, DAGScheduler, stable_hash
+
+class TestPipelineDAG(unittest.TestCase):
+    def make_graph(self, calls):
+        def record(name, func):
+            def run(*args):
+                calls.append(name)
+                return func(*args)
+            return run
+        return StageGraph([
+            Stage("double", record("double", lambda x: x * 2), inputs=["x"], outputs=["doubled"]),
+            Stage("square", record("square", lambda x: x * x), inputs=["x"], outputs=["squared"]),
+            Stage("total", record("total", lambda a, b, bias: a + b + bias),
+                  inputs=["doubled", "squared", "bias"], outputs=["total"]),
+        ])
+
+    def test_topological_order_and_cycles(self):
+        graph = self.make_graph([])
+        self.assertEqual(graph.topological_order(), ["double", "square", "total"])
+        with self.assertRaises(ValueError):
+            StageGraph([
+                Stage("a", len, inputs=["y"], outputs=["x"]),
+                Stage("b", len, inputs=["x"], outputs=["y"]),
+            ]).topological_order()
+
+    def test_skips_stages_with_unchanged_inputs(self):
+        calls = []
+        scheduler = DAGScheduler(self.make_graph(calls), executor="thread")
+        artifacts = scheduler.run({"x": 3, "bias": 0})
+        self.assertEqual(artifacts["total"], 15)
+
+        artifacts["bias"] = 1
+        scheduler.run(artifacts)
+        self.assertEqual(artifacts["total"], 16)
+        self.assertEqual(sorted(calls), ["double", "square", "total", "total"])
+        self.assertEqual(scheduler.report()["skipped"], {"double": 1, "square": 1})
+        scheduler.executor.shutdown()
+
+    def test_targets_limit_work(self):
+        calls = []
+        scheduler = DAGScheduler(self.make_graph(calls))
+        scheduler.run({"x": 2}, targets=["square"])
+        self.assertEqual(calls, ["square"])
+
+    def test_critical_path(self):
+        graph = self.make_graph([])
+        path = graph.critical_path({"double": 0.1, "square": 0.5, "total": 0.2})
+        self.assertEqual(path["stages"], ["square", "total"])
+        self.assertAlmostEqual(path["duration"], 0.7)
+
+    def test_stable_hash_ignores_key_order(self):
+        self.assertEqual(stable_hash({"a": 1, "b": [1, 2]}), stable_hash({"b": [1, 2], "a": 1}))
+
+    def test_refinement_only_reruns_affected_stages(self):
+        orchestrator = NexusOrchestrator()
+        orchestrator.analysis_engine.process = MagicMock(wraps=orchestrator.analysis_engine.process)
+        orchestrator.compliance_checker.process = MagicMock(return_value={
+            "status": "FAILED", "violations": ["gets"]
+        })
+        results = orchestrator.run_pipeline("REQ: Must be concurrent.", max_iterations=3)
+
+        report = results["pipeline"]
+        self.assertEqual(orchestrator.analysis_engine.process.call_count, 1)
+        self.assertEqual(report["runs"]["compliance"], 3)
+        self.assertEqual(report["runs"]["output"], 1)
+        self.assertEqual(report["critical_path"]["stages"][0], "analysis")
+        self.assertEqual(report["critical_path"]["stages"][-1], "output")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import shutil
+import tempfile
+import unittest
+from nexus.orchestrator import NexusOrchestrator
+from nexus.job_queue import JobQueue
+
+class TestPipelineEvents(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_callback_receives_ordered_events(self):
+        orchestrator = NexusOrchestrator(cache=False)
+        events = []
+        try:
+            orchestrator.run_pipeline("REQ: Must be concurrent.", max_iterations=1,
+                                      base_path=self.root, on_event=events.append)
+        finally:
+            orchestrator.shutdown()
+        kinds = [e["event"] for e in events]
+        self.assertEqual(kinds[0], "pipeline_started")
+        self.assertEqual(kinds[-1], "pipeline_completed")
+        self.assertIn("iteration_started", kinds)
+        started = [e["stage"] for e in events if e["event"] == "stage_started"]
+        self.assertLess(started.index("analysis"), started.index("synthesis"))
+        self.assertEqual(started[-1], "output")
+        artifacts = {e["name"]: e["value"] for e in events if e["event"] == "artifact"}
+        self.assertIn("Lock-free Queue", artifacts["code_info"]["code"])
+        # Partial artifacts arrive before the pipeline finishes
+        first_code = next(i for i, e in enumerate(events) if e.get("name") == "code_info")
+        self.assertLess(first_code, kinds.index("pipeline_completed"))
+
+    def test_iter_pipeline_ends_with_single_terminal_event(self):
+        orchestrator = NexusOrchestrator(cache=False)
+        try:
+            events = list(orchestrator.iter_pipeline(None, max_iterations=1, base_path=self.root))
+        finally:
+            orchestrator.shutdown()
+        kinds = [e["event"] for e in events]
+        self.assertEqual(kinds[-1], "pipeline_failed")
+        self.assertEqual(kinds.count("pipeline_failed"), 1)
+        self.assertIn("error", events[-1])
+
+    def test_job_queue_collects_events(self):
+        queue = JobQueue(workers=1, mode="thread", max_iterations=1)
+        try:
+            job = queue.submit("REQ: Must be concurrent.", self.root, job_id="evt")
+            events = [e for e in job.iter_events(timeout=30) if e is not None]
+        finally:
+            queue.shutdown()
+        self.assertEqual(events[0]["event"], "pipeline_started")
+        self.assertEqual(events[-1]["event"], "pipeline_completed")
+
+    def test_job_queue_closes_stream_on_failure(self):
+        queue = JobQueue(workers=1, mode="thread", max_iterations=1)
+        try:
+            job = queue.submit(None, self.root)
+            events = [e for e in job.iter_events(timeout=30) if e is not None]
+        finally:
+            queue.shutdown()
+        self.assertEqual(events[-1]["event"], "pipeline_failed")
+
+if __name__ == '__main__':
+    unittest.main()
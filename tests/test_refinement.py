@@ -41,6 +41,21 @@ class TestRefinementLoop(unittest.TestCase):
         self.assertEqual(orchestrator.compliance_checker.process.call_count, 2)
         # It still returns results but they will show failure status in compliance_results passed to output_guarantees
         self.assertEqual(results["status"], "Finalized")
+    def test_failed_final_iteration_is_not_resynthesized(self):
+        orchestrator = NexusOrchestrator()
+        orchestrator.compliance_checker.process = MagicMock(return_value={
+            "status": "FAILED", "violations": ["gets"]
+        })
+        orchestrator.testing_system.process = MagicMock(return_value={
+            "coverage_results": {"memory_leaks": "None"}
+        })
+
+        results = orchestrator.run_pipeline("REQ: Use gets function.", max_iterations=2)
+
+        runs = results["pipeline"]["runs"]
+        self.assertEqual(runs["synthesis"], 2)
+        for stage in ("testing", "build", "compliance"):
+            self.assertEqual(runs[stage], 2)
 
 if __name__ == "__main__":
     unittest.main()
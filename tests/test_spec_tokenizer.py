@@ -0,0 +1,47 @@
+import io
+import os
+import re
+import tempfile
+import unittest
+from nexus.spec_tokenizer import tokenize
+from nexus.multi_stage_analysis_engine import MultiStageAnalysisEngine
+
+SPEC = "Intro text. REQ: Must be fast. REQ:ignored REQ:  Assume a POSIX host.\nREQ: Build depends on libc. REQ: "
+
+def regex_parse(text):
+    return [r.strip() for r in re.findall(r'REQ: (.*?)(?=REQ:|$)', text, re.DOTALL)]
+
+class TestSpecTokenizer(unittest.TestCase):
+    def test_records_match_regex_parse_with_offsets(self):
+        records = list(tokenize(SPEC))
+        self.assertEqual([r.text for r in records], regex_parse(SPEC))
+        self.assertEqual([r.kind for r in records], ["REQ", "ASM", "DEP", "REQ"])
+        for record in records:
+            self.assertEqual(SPEC[record.start:record.end], record.text)
+
+    def test_streams_in_small_chunks(self):
+        for chunk_size in (1, 3, 7):
+            records = list(tokenize(io.StringIO(SPEC), chunk_size=chunk_size))
+            self.assertEqual([r.text for r in records], regex_parse(SPEC))
+
+    def test_binary_sources_use_byte_offsets(self):
+        data = "REQ: café is fast. REQ: second".encode()
+        records = list(tokenize(memoryview(data), chunk_size=4))
+        self.assertEqual([r.text for r in records], ["café is fast.", "second"])
+        self.assertEqual(data[records[1].start:records[1].end], b"second")
+        self.assertIn("fast", records[0].keywords)
+
+    def test_analysis_keeps_source_spans(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(SPEC)
+        try:
+            analysis = MultiStageAnalysisEngine().process(f.name)
+        finally:
+            os.remove(f.name)
+        self.assertEqual(analysis["asm"], ["Assume a POSIX host."])
+        start, end = analysis["spans"]["asm"][0]
+        self.assertEqual(SPEC[start:end], "Assume a POSIX host.")
+        self.assertEqual(analysis["constraints"], ["Must be fast."])
+
+if __name__ == '__main__':
+    unittest.main()
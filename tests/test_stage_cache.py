@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from nexus.orchestrator import NexusOrchestrator
+from nexus.stage_cache import StageCache, MISSING
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_memory_lru_eviction(self):
+        cache = StageCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIs(cache.get("b"), MISSING)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_values_are_isolated_copies(self):
+        cache = StageCache()
+        value = {"req": ["x"]}
+        cache.put("k", value)
+        value["req"].append("y")
+        self.assertEqual(cache.get("k"), {"req": ["x"]})
+
+    def test_disk_store_survives_restart(self):
+        StageCache(directory=self.directory).put("k", {"plans": [1, 2]})
+        restarted = StageCache(directory=self.directory)
+        self.assertEqual(restarted.get("k"), {"plans": [1, 2]})
+        self.assertEqual(restarted.stats()["hits"], 1)
+
+    def test_disk_store_is_size_bounded(self):
+        cache = StageCache(directory=self.directory, max_disk_bytes=3000)
+        for i in range(10):
+            cache.put(f"k{i}", "x" * 1000)
+        files = [f for f in os.listdir(self.directory) if f.endswith(".pkl")]
+        self.assertLessEqual(sum(os.path.getsize(os.path.join(self.directory, f)) for f in files), 3000)
+        self.assertIn("k9.pkl", files)
+
+    def test_repeated_spec_reuses_cached_stages(self):
+        cache = StageCache(directory=self.directory)
+        spec = "REQ: Must be fast and concurrent."
+        NexusOrchestrator(cache=cache).run_pipeline(spec, max_iterations=1, base_path=self.directory)
+
+        orchestrator = NexusOrchestrator(cache=StageCache(directory=self.directory))
+        orchestrator.analysis_engine.process = MagicMock()
+        orchestrator.verification_core.process = MagicMock()
+        results = orchestrator.run_pipeline(spec, max_iterations=1, base_path=self.directory)
+
+        orchestrator.analysis_engine.process.assert_not_called()
+        orchestrator.verification_core.process.assert_not_called()
+        self.assertEqual(results["pipeline"]["cache_hits"], {"analysis": 1, "planning": 1, "verification": 1})
+        self.assertIn("Lock-free Queue", results["code"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import threading
+import time
+import unittest
+from nexus.orchestrator import NexusOrchestrator
+from nexus.stage_executor import get_executor, SequentialExecutor, ThreadPoolStageExecutor
+
+class TestStageExecutor(unittest.TestCase):
+    def test_results_follow_submission_order(self):
+        executor = get_executor("thread", max_workers=4)
+        try:
+            calls = [(f"k{i}", pow, (i, 2)) for i in range(8)]
+            results = executor.run_all(calls)
+            self.assertEqual(list(results), [f"k{i}" for i in range(8)])
+            self.assertEqual(results["k3"], 9)
+        finally:
+            executor.shutdown()
+
+    def test_concurrent_first_submits_share_one_pool(self):
+        executor = ThreadPoolStageExecutor(max_workers=2)
+        created = []
+        create_pool = executor._create_pool
+        def counting_create_pool():
+            time.sleep(0.01)  # widen the window between the check and the assignment
+            created.append(create_pool())
+            return created[-1]
+        executor._create_pool = counting_create_pool
+        barrier = threading.Barrier(8)
+        def submit():
+            barrier.wait()
+            executor.submit(pow, 2, 3).result()
+        threads = [threading.Thread(target=submit) for _ in range(8)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(created), 1)
+        finally:
+            executor.shutdown()
+
+    def test_executor_resolution(self):
+        self.assertIsInstance(get_executor(None), SequentialExecutor)
+        self.assertIsInstance(get_executor("thread"), ThreadPoolStageExecutor)
+        with self.assertRaises(ValueError):
+            get_executor("gpu")
+
+    def test_sequential_reraises_stage_error(self):
+        executor = SequentialExecutor()
+        with self.assertRaises(ZeroDivisionError):
+            executor.run_all([("bad", divmod, (1, 0))])
+
+    def test_parallel_plans_match_sequential(self):
+        spec = "REQ: Must be fast and concurrent. REQ: Must use TCP socket and verification."
+        sequential = NexusOrchestrator()
+        analysis = sequential.analysis_engine.process(spec)
+        expected = sequential.plan_domains(analysis)
+
+        for name in ("thread", "process"):
+            orchestrator = NexusOrchestrator(executor=name, max_workers=2)
+            try:
+                plans = orchestrator.plan_domains(analysis)
+            finally:
+                orchestrator.shutdown()
+            self.assertEqual(list(plans), [key for key, _ in NexusOrchestrator.PLANNERS])
+            self.assertEqual(plans, expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous cold-start budget for importing the orchestrator; the point is to
+# catch regressions such as an eager PyMuPDF or subsystem import.
+IMPORT_BUDGET_US = 250_000
+
+HEAVY_MODULES = {
+    "fitz",
+    "nexus.course_roadmap",
+    "nexus.synthesis.templates",
+    "nexus.multi_stage_analysis_engine",
+    "nexus.code_synthesis_framework",
+    "concurrent.futures.process",
+}
+
+
+def import_times(*args):
+    """
+    Runs Python with -X importtime and returns {module: cumulative_us}.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+class TestStartup(unittest.TestCase):
+    def test_orchestrator_import_is_lazy_and_within_budget(self):
+        times = import_times("-c", "import nexus.orchestrator")
+        self.assertFalse(HEAVY_MODULES & set(times), HEAVY_MODULES & set(times))
+        self.assertLess(times["nexus.orchestrator"], IMPORT_BUDGET_US)
+
+    def test_roadmap_cli_skips_pipeline(self):
+        times = import_times(os.path.join(ROOT, "main.py"), "--roadmap")
+        self.assertIn("nexus.course_roadmap", times)
+        self.assertNotIn("nexus.orchestrator", times)
+
+    def test_components_load_on_first_use(self):
+        code = ("import sys; from nexus import NexusOrchestrator; o = NexusOrchestrator(); "
+                "assert 'nexus.compliance_checker' not in sys.modules; "
+                "o.compliance_checker; assert 'nexus.compliance_checker' in sys.modules")
+        import_times("-c", code)
+
+    def test_warm_builds_every_component(self):
+        from nexus.orchestrator import LazyComponent, NexusOrchestrator
+        names = [name for name, attr in vars(NexusOrchestrator).items() if isinstance(attr, LazyComponent)]
+        self.assertFalse(set(names) & set(vars(NexusOrchestrator())))
+        orchestrator = NexusOrchestrator()
+        self.assertIs(orchestrator.warm(), orchestrator)
+        self.assertLessEqual(set(names), set(vars(orchestrator)))
+
+if __name__ == "__main__":
+    unittest.main()
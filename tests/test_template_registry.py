@@ -0,0 +1,79 @@
+import unittest
+from nexus.synthesis.registry import TemplateRegistry, default_registry, defined_symbols
+from nexus.synthesis.templates import TemplateLibrary
+from nexus.code_synthesis_framework import ImplementationAgent
+
+HELPER = "#include <stdio.h>\nstatic int helper(void) { return 1; }\n"
+USER = "#include <stdio.h>\n#include <stdlib.h>\nint use_helper(void) {\n    return helper();\n}\n"
+
+class TestTemplateRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = TemplateRegistry()
+        self.registry.register("HELPER", HELPER)
+        self.registry.register("USER", USER, requires=("helper",))
+
+    def test_templates_declare_headers_and_symbols(self):
+        template = self.registry.get("USER")
+        self.assertEqual(template.headers, ("<stdio.h>", "<stdlib.h>"))
+        self.assertEqual(template.provides, ("use_helper",))
+        self.assertNotIn("#include", template.body)
+        self.assertEqual(self.registry.provider("helper"), "HELPER")
+        with self.assertRaisesRegex(ValueError, "already provided"):
+            self.registry.register("OTHER", "int helper(void) {\n}\n")
+
+    def test_requirements_are_pulled_in_and_ordered_first(self):
+        assembly = self.registry.assemble([("plan/USER", "USER", USER)])
+        self.assertEqual([name for name, _ in assembly.fragments], ["requires/HELPER", "plan/USER"])
+        self.assertEqual(assembly.headers, ("<stdio.h>", "<stdlib.h>"))
+
+        selection = [("a/USER", "USER", USER), ("b/HELPER", "HELPER", HELPER), ("c/USER", "USER", USER)]
+        assembly = self.registry.assemble(selection)
+        self.assertEqual([name for name, _ in assembly.fragments], ["b/HELPER", "a/USER"])
+
+    def test_duplicate_definitions_are_dropped(self):
+        copy = "int use_helper(void) {\n    return helper();\n}\n"
+        assembly = self.registry.assemble([("a/USER", "USER", USER), ("b/COPY", "COPY", copy)])
+        self.assertEqual([name for name, _ in assembly.fragments], ["requires/HELPER", "a/USER"])
+
+    def test_unknown_requirements_and_cycles_are_errors(self):
+        self.registry.register("LOOP_A", "void a(void) {\n}\n", requires=("b",))
+        self.registry.register("LOOP_B", "void b(void) {\n}\n", requires=("a",))
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            self.registry.assemble([("x/LOOP_A", "LOOP_A", self.registry.get("LOOP_A").source)])
+        bad = self.registry.register("BAD", "int f(void) {\n}\n", requires=("missing",))
+        with self.assertRaisesRegex(ValueError, "unknown symbol"):
+            self.registry.assemble([("x/BAD", "BAD", bad.source)])
+
+    def test_assemblies_are_cached_by_selection(self):
+        selection = [("plan/USER", "USER", USER)]
+        first = self.registry.assemble(selection)
+        self.assertIs(self.registry.assemble(list(selection)), first)
+        self.registry.register("NEW", "int fresh(void) {\n}\n")
+        self.assertIsNot(self.registry.assemble(selection), first)
+
+    def test_symbol_scan_covers_types_macros_and_globals(self):
+        body = "typedef struct {\n    int x;\n} point_t;\n#define LIMIT 4\nvolatile int flag = 1;\nvoid run(point_t *p) {\n}\n"
+        self.assertEqual(set(defined_symbols(body)), {"point_t", "LIMIT", "flag", "run"})
+
+class TestBuiltinTemplates(unittest.TestCase):
+    def test_library_lookup_uses_registry_names(self):
+        self.assertIn("Lock-free Queue", TemplateLibrary.get_template("lock_free_queue"))
+        self.assertIsNone(TemplateLibrary.get_template("missing"))
+        self.assertIn("THREAD_POOL", default_registry())
+
+    def test_shared_digest_helper_is_emitted_once(self):
+        from nexus.algorithm_library import AlgorithmLibrary
+        plans = {"algorithms": {"templates": {
+            "SHA256": AlgorithmLibrary.SHA256_C_TEMPLATE,
+            "SHA256_STREAM": AlgorithmLibrary.SHA256_STREAM_C_TEMPLATE,
+        }}}
+        result = ImplementationAgent().process({}, plans)
+        self.assertEqual([f["name"] for f in result["fragments"]],
+                         ["prelude", "requires/DIGEST_HEX", "algorithms/SHA256", "algorithms/SHA256_STREAM", "main"])
+        code = result["code"]
+        self.assertEqual(code.count("static void digest_to_hex"), 1)
+        self.assertEqual(code.count("#include <openssl/evp.h>"), 1)
+        self.assertLess(code.index("digest_to_hex(const"), code.index("compute_sha256"))
+
+if __name__ == '__main__':
+    unittest.main()
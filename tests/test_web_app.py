@@ -0,0 +1,54 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from nexus.job_queue import QueueFull
+
+try:
+    import flask
+except ImportError:
+    flask = None
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web", "app.py")
+
+@unittest.skipUnless(flask, "Flask is not installed")
+class TestSolveEndpoint(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        spec = importlib.util.spec_from_file_location("nexus_web_app", APP_PATH)
+        cls.web = importlib.util.module_from_spec(spec)
+        # The app creates its upload folder relative to the working directory
+        cwd, cls.root = os.getcwd(), tempfile.mkdtemp()
+        os.chdir(cls.root)
+        try:
+            spec.loader.exec_module(cls.web)
+        finally:
+            os.chdir(cwd)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.web.job_queue.shutdown()
+        shutil.rmtree(cls.root, ignore_errors=True)
+
+    def setUp(self):
+        self.uploads = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.uploads, ignore_errors=True)
+        self.web.app.config["UPLOAD_FOLDER"] = self.uploads
+        self.client = self.web.app.test_client()
+
+    def test_rejected_job_leaves_no_session_directory(self):
+        with patch.object(self.web.job_queue, "submit", side_effect=QueueFull("busy")):
+            response = self.client.post("/solve", data={"spec": "REQ: Must use TCP socket."})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "5")
+        self.assertEqual(os.listdir(self.uploads), [])
+
+    def test_missing_specification_leaves_no_session_directory(self):
+        response = self.client.post("/solve", data={})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(os.listdir(self.uploads), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,31 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, url_for, stream_with_context
+import json
 import os
+import shutil
 import sys
 import uuid
 
 # Add parent directory to path to import nexus
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from nexus.orchestrator import NexusOrchestrator
+from nexus import log
+from nexus.job_queue import JobQueue, QueueFull
+
+# Per-stage progress is debug noise under load; the SSE stream carries it instead
+log.configure(level=os.environ.get("NEXUS_LOG_LEVEL", "warning"),
+              json_output=os.environ.get("NEXUS_LOG_JSON") == "1")
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Long-lived worker processes, each with a warmed orchestrator. Jobs beyond
+# NEXUS_WORKERS + NEXUS_MAX_PENDING are rejected with 429.
+job_queue = JobQueue(
+    workers=int(os.environ.get("NEXUS_WORKERS", os.cpu_count() or 1)),
+    max_pending=int(os.environ.get("NEXUS_MAX_PENDING", 32)),
+    cache_dir=os.environ.get("NEXUS_CACHE_DIR"),
+)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -28,7 +43,7 @@ def solve():
     if 'file' in request.files:
         file = request.files['file']
         if file.filename != '':
-            path = os.path.join(session_dir, file.filename)
+            path = os.path.join(session_dir, os.path.basename(file.filename))
             file.save(path)
             specification = path
 
@@ -37,27 +52,68 @@ def solve():
         specification = request.form['spec']
 
     if not specification:
+        shutil.rmtree(session_dir, ignore_errors=True)
         return jsonify({"error": "No specification provided"}), 400
 
-    # Change current working directory or pass it to orchestrator
-    # For simplicity, we'll tell the orchestrator where to work
-    orchestrator = NexusOrchestrator()
+    # Enqueue the pipeline run; the client polls /jobs/<id> for the result.
+    # A rejected job leaves nothing behind in the upload folder.
     try:
-        # Run the pipeline, passing the unique session directory
-        result = orchestrator.run_pipeline(specification, base_path=session_dir)
+        job_queue.submit(specification, session_dir, job_id=session_id)
+    except QueueFull as e:
+        shutil.rmtree(session_dir, ignore_errors=True)
+        response = jsonify({"status": "busy", "message": str(e)})
+        response.headers["Retry-After"] = "5"
+        return response, 429
+
+    return jsonify({
+        "status": "queued",
+        "job_id": session_id,
+        "session_id": session_id,
+        "status_url": url_for('job_status', job_id=session_id),
+        "events_url": url_for('job_events', job_id=session_id)
+    }), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
 
+    payload = job.to_dict()
+    result = job_queue.result(job_id)
+    if result is not None:
         # Structure results for frontend
-        return jsonify({
-            "status": "success",
-            "session_id": session_id,
+        payload.update({
+            "session_id": job_id,
             "certification": result.get("certification"),
             "code": result.get("code"),
             "documentation": result.get("documentation"),
             "build_info": result.get("build_info")
         })
-    except Exception as e:
-        print(f"Server Error: {e}")
-        return jsonify({"status": "error", "message": str(e)}), 500
+    return jsonify(payload)
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Server-Sent Events stream of a job's progress: stage transitions,
+    iteration boundaries and partial artifacts, ending with a terminal event.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+
+    def generate():
+        for event in job.iter_events(timeout=15):
+            if event is None:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    response = Response(stream_with_context(generate()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)